@@ -0,0 +1,137 @@
+"""Benchmark the indexed camp snapshot against the vw_camps join.
+
+Builds a synthetic csm database in SQLite (--sessions camp_details rows over
+institutes and programs in the proportions of the real data), defines vw_camps
+over it as in create_vw_camps.sql, and runs the /api/camps, /featured and
+/filter query shapes both ways. Reports the median latency per query for the
+snapshot's index lookup alone (match), and for a JSON response body from the
+SQL view (fetch + encode, as res.json does) and from the snapshot (query_json),
+and checks that both return the same sessions.
+
+Usage:
+    python bench_camp_snapshot.py [--sessions 100000] [--repeat 20]
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sources.load_camps import SCHEMA, connect_sqlite, _insert_rows
+from sources.camp_snapshot import CampSnapshot, VIEW_SQL
+
+CATEGORIES = ["Adventure", "Technology", "Sports", "Arts", "Science", "Music", "Nature", "Leadership"]
+
+QUERIES = [
+    ("all camps", {}),
+    ("featured", {'featured': True}),
+    ("price <= 300", {'max_price': 300}),
+    ("ages 6-9, price <= 400", {'min_age': 6, 'max_age': 9, 'max_price': 400}),
+    ("Arts+Technology, ages 10-12", {'interests': ["Arts", "Technology"], 'min_age': 10, 'max_age': 12}),
+    ("Science, weeks of June", {'interests': ["Science"], 'week_from': "2025-06-01", 'week_to': "2025-06-30"}),
+    ("all filters, featured", {'interests': ["Sports"], 'min_age': 8, 'max_age': 10, 'max_price': 350,
+                               'week_from': "2025-07-01", 'week_to': "2025-07-31", 'featured': True}),
+]
+
+def build_database(sessions, rng):
+    conn = connect_sqlite(":memory:")
+    institute_count = max(1, sessions // 200)
+    program_count = max(1, sessions // 10)
+    institutes = [{'institute_id': f"I{number:05d}", 'institute_nm': f"Institute {number}",
+                   'institute_info': f"Institute {number}", 'address': f"{number} Main St, Plano, TX 75074"}
+                  for number in range(1, institute_count + 1)]
+    programs = []
+    for number in range(1, program_count + 1):
+        min_age = rng.randint(3, 14)
+        programs.append({
+            'program_id': f"C{number:05d}", 'institute_id': rng.choice(institutes)['institute_id'],
+            'program_nm': f"Program {number}", 'program_info': "Synthetic program " * 8,
+            'min_age': min_age, 'max_age': min_age + rng.randint(1, 6), 'category': rng.choice(CATEGORIES),
+            'rating': round(rng.uniform(3, 5), 1), 'featured': int(rng.random() < 0.1),
+        })
+    weeks = [(datetime.date(2025, 5, 26) + datetime.timedelta(weeks=week)).isoformat() for week in range(12)]
+    details = {}
+    while len(details) < sessions:
+        program = rng.choice(programs)
+        week = rng.choice(weeks)
+        details[(program['program_id'], week)] = {'program_id': program['program_id'], 'week_of': week,
+                                                  'price': float(rng.randrange(99, 800))}
+    _insert_rows(conn, 'institutes', institutes)
+    _insert_rows(conn, 'programs', programs)
+    _insert_rows(conn, 'camp_details', list(details.values()))
+    conn.execute(f"CREATE VIEW {SCHEMA}.vw_camps AS " + VIEW_SQL.format(schema=SCHEMA).replace(f"{SCHEMA}.", ""))
+    conn.commit()
+    return conn
+
+def sql_query(conn, filters):
+    """The WHERE clause server.js would build for these filters."""
+    sql, params = f"SELECT * FROM {SCHEMA}.vw_camps WHERE 1=1", []
+    if 'max_price' in filters:
+        sql += " AND price <= ?"
+        params.append(filters['max_price'])
+    if 'max_age' in filters:
+        sql += " AND min_age <= ?"
+        params.append(filters['max_age'])
+    if 'min_age' in filters:
+        sql += " AND max_age >= ?"
+        params.append(filters['min_age'])
+    if 'interests' in filters:
+        sql += f" AND category IN ({', '.join('?' * len(filters['interests']))})"
+        params.extend(filters['interests'])
+    if 'week_from' in filters:
+        sql += " AND week_of BETWEEN ? AND ?"
+        params.extend([filters['week_from'], filters['week_to']])
+    if 'featured' in filters:
+        sql += " AND featured = ?"
+        params.append(int(filters['featured']))
+    cursor = conn.execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, values)) for values in cursor.fetchall()]
+
+def median_microseconds(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    conn = build_database(args.sessions, random.Random(0))
+    started = time.perf_counter()
+    snapshot = CampSnapshot.from_connection(conn)
+    build_seconds = time.perf_counter() - started
+    path = os.path.join("/tmp", "camps_snapshot_bench.arrow")
+    snapshot.save(path)
+    started = time.perf_counter()
+    snapshot = CampSnapshot.load(path)
+    print(f"{args.sessions:,} sessions: build {build_seconds:.2f}s, load {time.perf_counter() - started:.3f}s, "
+          f"file {os.path.getsize(path) / 1e6:.1f} MB, {len(snapshot.indexes)} indexes\n")
+
+    snapshot.query_json(limit=0)  # encode the rows once, as a server would at startup
+    print(f"{'query':<30} {'rows':>7} {'snapshot match':>15} {'SQL view JSON':>14} {'snapshot JSON':>14} "
+          f"{'speedup':>8}")
+    for label, filters in QUERIES:
+        sql_us, sql_rows = median_microseconds(lambda: json.dumps(sql_query(conn, filters)), args.repeat)
+        match_us, _ = median_microseconds(lambda: snapshot.match(**filters), args.repeat)
+        json_us, body = median_microseconds(lambda: snapshot.query_json(**filters), args.repeat)
+        rows = json.loads(body)
+        if {(row['program_id'], row['week_of']) for row in json.loads(sql_rows)} != \
+                {(row['program_id'], row['week_of']) for row in rows}:
+            raise AssertionError(f"Snapshot and SQL disagree for {label}")
+        print(f"{label:<30} {len(rows):>7,} {match_us:>13,.1f}us {sql_us:>12,.0f}us {json_us:>12,.0f}us "
+              f"{sql_us / json_us:>7,.1f}x")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark blocking + MinHash deduplication as the corpus grows.
+
+Builds corpora of 1x..--max-scale x the camp_data_1.1 records plus the manual
+programs. Copy k of a record belongs to organization "<org> k", so blocks grow
+in number, not size. 20% of copied names get a one-character typo that the
+fuzzy matching has to absorb. For each scale, reports the time, the candidate
+comparisons against the all-pairs count, and whether the programs found stay
+at (base programs x copies).
+
+Usage:
+    python bench_dedupe.py [--max-scale 100] [--typo-rate 0.2]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import logging
+import numpy as np
+import pandas as pd
+from sources.normalize import read_sources, normalize_camps
+from sources.dedupe import DATA_DIR, manual_records, dedupe_camps
+
+SCALES = [1, 3, 10, 30, 100, 300, 1000]
+
+def add_typo(name, rng):
+    """Deletes, doubles or swaps one character of the name."""
+    if len(name) < 6:
+        return name
+    position = rng.randint(1, len(name) - 2)
+    operation = rng.randint(3)
+    if operation == 0:
+        return name[:position] + name[position + 1:]
+    if operation == 1:
+        return name[:position] + name[position] + name[position:]
+    return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+
+def scaled_corpus(base, scale, typo_rate, rng):
+    copies = [base]
+    for copy in range(1, scale):
+        frame = base.copy()
+        frame['organization'] = frame['organization'].astype(str) + f" {copy}"
+        names = frame['camp_name'].astype(str)
+        typos = rng.random_sample(len(frame)) < typo_rate
+        frame['camp_name'] = [add_typo(name, rng) if typo else name for name, typo in zip(names, typos)]
+        copies.append(frame)
+    return pd.concat(copies, ignore_index=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-scale", type=int, default=100)
+    parser.add_argument("--typo-rate", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    base = pd.concat([normalize_camps(read_sources(DATA_DIR)), manual_records()], ignore_index=True)
+    for column in ('source', 'organization', 'camp_name', 'location'):
+        base[column] = base[column].astype(str)
+    _, base_programs, _, _ = dedupe_camps(base)
+    rng = np.random.RandomState(0)
+
+    print(f"{'scale':>5} {'records':>9} {'names':>7} {'comparisons':>11} {'all pairs':>14} {'programs':>9} "
+          f"{'expected':>9} {'seconds':>8} {'records/s':>10}")
+    for scale in [scale for scale in SCALES if scale <= args.max_scale]:
+        corpus = scaled_corpus(base, scale, args.typo_rate, rng)
+        _, programs, _, stats = dedupe_camps(corpus)
+        all_pairs = stats['distinct_names'] * (stats['distinct_names'] - 1) // 2
+        print(f"{scale:>5} {stats['records']:>9,} {stats['distinct_names']:>7,} {stats['comparisons']:>11,} "
+              f"{all_pairs:>14,} {len(programs):>9,} {len(base_programs) * scale:>9,} {stats['seconds']:>8.2f} "
+              f"{stats['records'] / stats['seconds']:>10,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark the geocoding stage and the session spatial index against corpus size.
+
+Scatters --max-points synthetic sessions (in sizes 1k, 10k, ...) uniformly over
+the Dallas-Fort Worth area and, for each size, reports the k-d tree build time
+and the median latency of a 10-mile radius query and a 10-nearest query from
+random origins, next to a brute-force haversine scan over every session. Both
+must return the same sessions. Also times address normalization and a cold and
+warm Geocoder pass over the real camp Location strings, against a gazetteer of
+synthetic centroids for every ZIP and city they mention.
+
+Usage:
+    python bench_geocode.py [--max-points 1000000] [--queries 50] [--miles 10] [--k 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import logging
+import numpy as np
+from sources.geocode import (EARTH_RADIUS_MILES, DATA_DIR, GeocodeCache, Geocoder, PlaceGazetteer, SpatialIndex,
+                             ZipGazetteer, normalize_address)
+
+# Rough Dallas-Fort Worth bounding box
+LAT_RANGE = (32.55, 33.35)
+LON_RANGE = (-97.55, -96.45)
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+def haversine_miles(lats, lons, lat, lon):
+    lats, lons, lat, lon = np.radians(lats), np.radians(lons), np.radians(lat), np.radians(lon)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lats) * np.cos(lat) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+def median_microseconds(func, origins):
+    timings, results = [], []
+    for lat, lon in origins:
+        started = time.perf_counter()
+        results.append(func(lat, lon))
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6, results
+
+def bench_index(args, rng):
+    origins = list(zip(rng.uniform(*LAT_RANGE, args.queries), rng.uniform(*LON_RANGE, args.queries)))
+    print(f"{'sessions':>10} {'build':>8} {'hits':>7} {'radius':>10} {'scan':>10} {'speedup':>8} "
+          f"{'k-nearest':>10} {'scan':>10} {'speedup':>8}")
+    for size in [size for size in SIZES if size <= args.max_points]:
+        lats, lons = rng.uniform(*LAT_RANGE, size), rng.uniform(*LON_RANGE, size)
+        started = time.perf_counter()
+        index = SpatialIndex(lats, lons)
+        build_seconds = time.perf_counter() - started
+
+        def scan_within(lat, lon):
+            distances = haversine_miles(lats, lons, lat, lon)
+            return np.flatnonzero(distances <= args.miles)
+
+        def scan_nearest(lat, lon):
+            distances = haversine_miles(lats, lons, lat, lon)
+            return np.argpartition(distances, args.k)[:args.k]
+
+        radius_us, radius_results = median_microseconds(lambda lat, lon: index.within(lat, lon, args.miles)[0], origins)
+        scan_radius_us, scan_radius_results = median_microseconds(scan_within, origins)
+        nearest_us, nearest_results = median_microseconds(lambda lat, lon: index.nearest(lat, lon, args.k)[0], origins)
+        scan_nearest_us, scan_nearest_results = median_microseconds(scan_nearest, origins)
+        for (lat, lon), ours, theirs in zip(origins, radius_results, scan_radius_results):
+            # Points on the boundary may fall either way in floating point
+            different = set(ours.tolist()) ^ set(theirs.tolist())
+            if any(abs(haversine_miles(lats[i], lons[i], lat, lon) - args.miles) > 1e-6 for i in different):
+                raise AssertionError(f"Radius results differ from the scan at {size} sessions")
+        for (lat, lon), ours, theirs in zip(origins, nearest_results, scan_nearest_results):
+            if not np.allclose(np.sort(haversine_miles(lats[ours], lons[ours], lat, lon)),
+                               np.sort(haversine_miles(lats[theirs], lons[theirs], lat, lon))):
+                raise AssertionError(f"Nearest results differ from the scan at {size} sessions")
+        hits = statistics.median(len(result) for result in radius_results)
+        print(f"{size:>10,} {build_seconds:>7.2f}s {hits:>7,.0f} {radius_us:>8,.0f}us {scan_radius_us:>8,.0f}us "
+              f"{scan_radius_us / radius_us:>7,.1f}x {nearest_us:>8,.0f}us {scan_nearest_us:>8,.0f}us "
+              f"{scan_nearest_us / nearest_us:>7,.1f}x")
+
+def bench_geocoder(rng):
+    from sources.normalize import read_sources, normalize_camps
+    locations = normalize_camps(read_sources(DATA_DIR))['location'].astype(object).fillna("").astype(str).tolist()
+    distinct = sorted(set(locations))
+    started = time.perf_counter()
+    for _ in range(100):
+        parsed = [normalize_address(location) for location in distinct]
+    normalize_us = (time.perf_counter() - started) / (100 * len(distinct)) * 1e6
+
+    # Invented coordinates, only so that every ZIP and city present resolves to something
+    zips = {info['zip'] for info in parsed if info['zip']}
+    cities = {info['city'] for info in parsed if info['city']} | {"PLANO", "FRISCO", "DALLAS", "ALLEN", "MCKINNEY"}
+    point = lambda: (float(rng.uniform(*LAT_RANGE)), float(rng.uniform(*LON_RANGE)))
+    gazetteers = [ZipGazetteer({zip_code: point() for zip_code in zips}),
+                  PlaceGazetteer({city: point() for city in cities})]
+    geocoder = Geocoder(gazetteers, GeocodeCache(":memory:"))
+    started = time.perf_counter()
+    points = geocoder.geocode_many(locations)
+    cold_ms = (time.perf_counter() - started) * 1e3
+    started = time.perf_counter()
+    geocoder.geocode_many(locations)
+    warm_ms = (time.perf_counter() - started) * 1e3
+    resolved = sum(points[location] is not None for location in locations)
+    print(f"\n{len(locations):,} sessions, {len(distinct)} distinct locations: normalize {normalize_us:.1f}us/address, "
+          f"geocode cold {cold_ms:.1f}ms, warm (cache) {warm_ms:.1f}ms, {resolved:,} sessions resolved")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-points", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--miles", type=float, default=10.0)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.RandomState(0)
+    bench_index(args, rng)
+    bench_geocoder(rng)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the flyer image preprocessing stage.
+
+Treats every image under backend/manual_data/img and camp_data_code/sources as a
+flyer (a directory of images is one multi-page flyer), plus --synthetic tall
+screenshot-style flyers with a repeated page, and reports bytes and pixels saved
+per flyer and the time for a cold and a warm (cached) pass.
+
+Usage:
+    python bench_image_prep.py [--synthetic 3] [--cache-dir /tmp/image_prep_bench]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PIL import Image, ImageDraw, ImageFont
+from sources.image_prep import ImagePreprocessor
+from sources.info_extract import IMAGE_EXTENSIONS
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+IMAGE_DIRS = [os.path.join(ROOT, "backend", "manual_data", "img"), os.path.join(ROOT, "camp_data_code", "sources")]
+
+def find_flyers():
+    flyers = []
+    for image_dir in IMAGE_DIRS:
+        for directory, _, files in os.walk(image_dir):
+            images = sorted(os.path.join(directory, name) for name in files if name.lower().endswith(IMAGE_EXTENSIONS))
+            if directory == image_dir:
+                flyers.extend((os.path.basename(path), [path]) for path in images)
+            elif images:
+                flyers.append((os.path.relpath(directory, image_dir), images))
+    return flyers
+
+def make_synthetic_flyer(directory, number, rng):
+    """A 1440px wide, 6000px tall screenshot: white margins, a photo banner, lines of text, and a repeat page."""
+    page = Image.new('RGB', (1440, 6000), (255, 255, 255))
+    banner = Image.effect_noise((1040, 360), 60).convert('RGB')
+    page.paste(Image.blend(banner, Image.new('RGB', banner.size, (20, 90, 160)), 0.6), (200, 150))
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=22)
+    words = ["Summer", "camp", "week", "ages", "6-12", "9:00am", "3:00pm", "$325", "coding", "robotics", "art"]
+    for y in range(600, 5800, 34):
+        draw.text((200, y), " ".join(rng.choice(words) for _ in range(12)), fill=(30, 30, 30), font=font)
+    paths = [os.path.join(directory, f"synthetic{number}_page1.png"), os.path.join(directory, f"synthetic{number}_page2.png")]
+    page.save(paths[0])
+    page.save(paths[1])
+    return (f"synthetic{number}", paths)
+
+def run_pass(preprocessor, flyers):
+    started = time.perf_counter()
+    reports = [(name, preprocessor.prepare(paths)[1]) for name, paths in flyers]
+    return reports, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=3, help="Synthetic tall flyers to add")
+    parser.add_argument("--cache-dir", default=None, help="Preprocessing cache (a fresh temp dir by default)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="image_prep_bench_")
+    cache_dir = args.cache_dir or os.path.join(work_dir, "cache")
+    rng = random.Random(0)
+    flyers = find_flyers() + [make_synthetic_flyer(work_dir, number, rng) for number in range(args.synthetic)]
+    preprocessor = ImagePreprocessor(cache_dir)
+
+    reports, cold_seconds = run_pass(preprocessor, flyers)
+    _, warm_seconds = run_pass(preprocessor, flyers)
+
+    print(f"{'flyer':<44} {'images':>6} {'tiles':>5} {'dups':>4} {'bytes in':>11} {'bytes out':>11} "
+          f"{'saved':>6} {'pixels saved':>13}")
+    totals = {'source_bytes': 0, 'prepared_bytes': 0, 'source_pixels': 0, 'prepared_pixels': 0}
+    for name, report in reports:
+        for key in totals:
+            totals[key] += report[key]
+        saved = report['bytes_saved'] / report['source_bytes'] if report['source_bytes'] else 0
+        print(f"{name[:44]:<44} {report['images']:>6} {report['tiles']:>5} {report['duplicates_dropped']:>4} "
+              f"{report['source_bytes']:>11,} {report['prepared_bytes']:>11,} {saved:>6.0%} {report['pixels_saved']:>13,}")
+    if totals['source_bytes']:
+        print(f"\ntotal bytes  {totals['source_bytes']:,} -> {totals['prepared_bytes']:,} "
+              f"({1 - totals['prepared_bytes'] / totals['source_bytes']:.0%} saved)")
+        print(f"total pixels {totals['source_pixels']:,} -> {totals['prepared_pixels']:,} "
+              f"({1 - totals['prepared_pixels'] / totals['source_pixels']:.0%} saved)")
+    print(f"cold pass {cold_seconds:.3f}s, warm (cached) pass {warm_seconds:.3f}s for {len(flyers)} flyers")
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the vectorized normalization stage.
+
+Runs normalize_camps over the camp_data_1.1 corpus, then over two synthetic
+corpora of --rows rows (1,000,000 by default) built by resampling it:
+
+- resampled: the rows as they are, so the distinct strings stay those of the
+  real corpus and the parsers run once per distinct value (mostly measures
+  factorize/take)
+- perturbed: prices, dates, ages and camp names get random numbers, so the
+  number of distinct strings grows with the row count (measures the parsers)
+
+and reports rows/second for each step, the distinct strings the parsers see,
+plus the size and reload time of the columnar file.
+
+Usage:
+    python bench_normalize.py [--rows 1000000] [--out /tmp/camps_bench.arrow]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd
+from sources.normalize import read_sources, normalize_camps, write_columnar, load_normalized
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "camp_data_1.1")
+# Columns normalize_camps parses (once per distinct value)
+PARSED_COLUMNS = ['Week', 'Start Date', 'End Date', 'Price', 'Age Range', 'Grade Range', 'Days', 'Start Time', 'End Time']
+
+def timed(label, func, *args, rows=None):
+    started = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - started
+    rate = f" ({rows / seconds:,.0f} rows/s)" if rows else ""
+    print(f"{label:<38} {seconds:8.3f}s{rate}")
+    return result
+
+def perturb(raw, seed=0):
+    """Randomizes the numbers in prices, dates and ages, and tags every camp name, row by row."""
+    rng = random.Random(seed)
+    day = lambda match: f"{match.group(1)}{rng.randint(1, 28):0{len(match.group(2))}d}"
+    price = lambda match: f"{rng.randint(100, 600)}" + (".00" if "." in match.group(0) else "")
+    age = lambda match: str(rng.randint(3, 17))
+    perturbed = raw.copy()
+    for column in ['Week', 'Start Date', 'End Date']:
+        # ISO dates ("2025-06-23 00:00:00") and month names ("June 30 - July 3") get a random day
+        perturbed[column] = (perturbed[column].str.replace(r"(\d{4}-\d{2}-)(\d{2})", day, regex=True)
+                             .str.replace(r"([A-Z][a-z]+\.? )(\d{1,2})\b", day, regex=True))
+    perturbed['Price'] = perturbed['Price'].str.replace(r"\d+(?:\.\d+)?", price, regex=True)
+    perturbed['Age Range'] = perturbed['Age Range'].str.replace(r"\d{1,2}", age, regex=True)
+    perturbed['Camp Name'] = perturbed['Camp Name'] + [f" #{rng.randint(1, 1_000_000)}" for _ in range(len(perturbed))]
+    return perturbed
+
+def distinct_strings(raw):
+    return sum(raw[column].nunique() for column in PARSED_COLUMNS)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic corpus")
+    parser.add_argument("--out", default=os.path.join("/tmp", "camps_bench.arrow"))
+    args = parser.parse_args()
+
+    raw = timed("read corpus", read_sources, DATA_DIR)
+    timed(f"normalize corpus ({len(raw):,} rows)", normalize_camps, raw, rows=len(raw))
+
+    resampled = raw.sample(n=args.rows, replace=True, random_state=0).reset_index(drop=True)
+    perturbed = timed("build perturbed corpus", perturb, resampled)
+    print(f"{'distinct parsed strings':<38} {distinct_strings(raw):>8,} corpus, {distinct_strings(resampled):,} resampled, "
+          f"{distinct_strings(perturbed):,} perturbed")
+    timed(f"normalize resampled ({args.rows:,} rows)", normalize_camps, resampled, rows=args.rows)
+    normalized = timed(f"normalize perturbed ({args.rows:,} rows)", normalize_camps, perturbed, rows=args.rows)
+    timed("write columnar file", write_columnar, normalized, args.out, rows=args.rows)
+    print(f"{'columnar file size':<38} {os.path.getsize(args.out) / 1e6:8.1f} MB")
+    table = timed("memory-map columnar file", load_normalized, args.out, rows=args.rows)
+    timed("sum price_per_week from mapped file", lambda: pd.Series(table['price_per_week'].to_numpy(zero_copy_only=False)).sum())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark the Lifetime scraper offline against a replayed camps page.
+
+Saves a synthetic club camps page with --cards cards (or a page you saved from
+the site with --page, e.g. one written by `camp-data fixtures record`) as a
+fixture, serves it from a local FixtureServer, and scrapes it with:
+
+- browser: scrape_lifetime_camps in headless Chrome; the synthetic page opens
+  and closes its modals with the same markup as the site (needs Chrome; pass
+  --chromedriver to avoid downloading a driver)
+- static:  the registry's Lifetime spec (source_registry.py) on the page HTML
+
+Reports cards/second and the per-phase breakdown from ScrapeMetrics for each
+mode, and exits non-zero if a mode falls below --min-rate cards/second. With
+--min-rate set, a mode that raises (no Chrome, a broken fixture) fails too;
+without it, it is reported as skipped.
+
+Usage:
+    python bench_scrape_lifetime.py [--cards 40] [--modes browser,static] [--chromedriver PATH]
+        [--page saved_camps.html] [--metrics-out metrics.prom] [--min-rate 0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import logging
+from sources.fixture_server import FixtureServer, save_fixture
+from sources.scrape_metrics import ScrapeMetrics
+
+CLUB_PATH = "/clubs/tx/plano/camps.html"
+CATEGORIES = ["Sports", "Art", "STEM", "Adventure", "Dance"]
+
+# Opens the shared modal with the card's details and closes it again, like the site's dialog
+PAGE_SCRIPT = """
+document.addEventListener('click', function (event) {
+    var button = event.target.closest("[data-testid='moreDetailsBtn']");
+    var modal = document.getElementById('campModal');
+    if (button) {
+        var source = document.querySelector("[data-modal-index='" + button.getAttribute('data-index') + "']");
+        setTimeout(function () {
+            modal.querySelector('.modal-body').innerHTML = source.innerHTML;
+            modal.style.display = 'block';
+            document.getElementById('backdrop').className = 'modal-backdrop fade in';
+        }, 20);
+    } else if (event.target.closest('.modal-header .close')) {
+        modal.style.display = 'none';
+        document.getElementById('backdrop').className = '';
+    }
+});
+"""
+
+def synthetic_camps(count):
+    camps = []
+    for index in range(count):
+        week = index % 10
+        camps.append({
+            'name': f"Synthetic Camp {index}", 'category': CATEGORIES[index % len(CATEGORIES)],
+            'ages': f"Ages {4 + index % 5}-{10 + index % 4}", 'start': f"Jun {2 + week}", 'end': f"Jun {6 + week}",
+            'price': 57 + index % 3, 'meets': "Mon - Fri", 'start_time': "9:00 AM", 'end_time': "3:00 PM",
+            'description': f"A day camp with games, crafts and swimming. Session {index}.",
+        })
+    return camps
+
+def camps_page(camps):
+    cards, details = [], []
+    for index, camp in enumerate(camps):
+        cards.append(
+            f'<div data-testid="campCard"><p class="h6">{camp["category"]}</p><p class="h4">{camp["name"]}</p>'
+            f'<p class="small font-weight-bold">{camp["ages"]}</p>'
+            f'<p class="small"><time class="time-start">{camp["start"]}</time> - <time class="time-end">{camp["end"]}</time></p>'
+            f'<p id="campLocation-{index}">Frisco</p><span class="display-number-value">{camp["price"]}</span>'
+            f'<button data-testid="moreDetailsBtn" data-index="{index}">More Details</button></div>')
+        details.append(
+            f'<div data-modal-index="{index}" hidden><div class="time-and-location"><p class="small">{camp["start"]}</p>'
+            f'<p class="small">Meets: {camp["meets"]}</p><p class="small"><time class="time-start">{camp["start_time"]}</time>'
+            f' - <time class="time-end">{camp["end_time"]}</time></p></div>'
+            f'<div class="description"><p>{camp["description"]}</p></div></div>')
+    return ("<html><head><title>Camps</title></head><body>" + "".join(cards) +
+            '<div id="campModal" class="modal" style="display:none"><div class="modal-header">'
+            '<button class="close">x</button></div><div class="modal-body"></div></div><div id="backdrop"></div>' +
+            "".join(details) + f"<script>{PAGE_SCRIPT}</script></body></html>")
+
+def run_browser(server, metrics, output_dir, args):
+    from sources.driver_pool import DriverPool
+    from sources.web_scrape import scrape_lifetime_camps
+    with DriverPool(size=1, headless=True, driver_path=args.chromedriver) as pool:
+        pool.release(pool.acquire())  # Start the browser outside the timed run
+        return scrape_lifetime_camps(server.base_url + CLUB_PATH, location_name="Bench", max_retries=0,
+                                     driver_pool=pool, incremental=False, resumable=False,
+                                     metrics=metrics, output_dir=output_dir)
+
+def run_static(server, metrics, output_dir, args):
+    from sources.host_scheduler import HostScheduler
+    from sources.source_registry import PageFetcher, lifetime_spec, scrape_source
+    spec = lifetime_spec("Bench", "https://my.lifetime.life" + CLUB_PATH)
+    fetcher = PageFetcher(HostScheduler(min_interval=0), base_url=server.base_url)
+    started = time.perf_counter()
+    rows = scrape_source(spec, fetcher)
+    metrics.observe("run", time.perf_counter() - started)
+    return len(rows)
+
+# Each runner returns the number of cards scraped
+MODES = {'browser': run_browser, 'static': run_static}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=40)
+    parser.add_argument("--modes", default="browser,static")
+    parser.add_argument("--page", help="Replay this saved camps page instead of the synthetic one (browser/static)")
+    parser.add_argument("--chromedriver", help="chromedriver binary for browser mode")
+    parser.add_argument("--metrics-out", help="Also write all metrics here (.json or Prometheus text)")
+    parser.add_argument("--min-rate", type=float, default=0.0, help="Fail if any mode scrapes fewer cards/second")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(unknown)}")
+    if args.page:
+        with open(args.page, encoding='utf-8') as f:
+            page_html = f.read()
+    else:
+        page_html = camps_page(synthetic_camps(args.cards))
+
+    fixtures_dir = tempfile.mkdtemp(prefix="bench_lifetime_fixtures_")
+    output_dir = tempfile.mkdtemp(prefix="bench_lifetime_output_")
+    save_fixture(fixtures_dir, CLUB_PATH, page_html.encode('utf-8'), content_type="text/html; charset=utf-8")
+    all_metrics = ScrapeMetrics()
+    slow, failed = [], []
+    with FixtureServer(fixtures_dir) as server:
+        for mode in modes:
+            metrics = all_metrics.bind(mode=mode)
+            try:
+                rows = MODES[mode](server, metrics, output_dir, args)
+            except Exception as e:
+                # A gate that a crashing mode passes silently would not gate anything
+                if args.min_rate:
+                    failed.append(mode)
+                status = "failed" if args.min_rate else "skipped"
+                print(f"{mode:<8} {status}: {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}\n")
+                continue
+            seconds = metrics.histogram("run")['sum']
+            rate = rows / seconds if seconds else 0.0
+            if rate < args.min_rate:
+                slow.append(mode)
+            timeouts = metrics.counter("timeouts")
+            fallbacks = metrics.counter("fallbacks")
+            print(f"{mode:<8} {rows:>5} cards in {seconds:7.2f}s = {rate:8.1f} cards/s "
+                  f"({timeouts:g} timeouts, {fallbacks:g} fallbacks)")
+            for line in metrics.summary_lines():
+                print(f"    {line}")
+            print()
+
+    if args.metrics_out:
+        all_metrics.write(args.metrics_out)
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    if slow:
+        print(f"Below {args.min_rate} cards/s: {', '.join(slow)}")
+    if failed or slow:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
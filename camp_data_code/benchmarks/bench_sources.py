@@ -0,0 +1,89 @@
+"""Benchmark a full-catalog refresh: sources one after another vs. run_sources.
+
+Saves --sites synthetic camp sites as HTML fixtures (site k has k listing pages
+of 10 cards, each with a detail page), serves them from a FixtureServer, and
+scrapes every site under the same politeness limits (--per-host requests at a
+time, --min-interval seconds apart per host). Reports the wall time of a
+sequential refresh, of the concurrent one, and of the slowest site alone.
+
+Usage:
+    python bench_sources.py [--sites 8] [--per-host 2] [--min-interval 0.05]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import logging
+from sources.fixture_server import FixtureServer, save_fixture
+from sources.host_scheduler import HostScheduler
+from sources.source_registry import SourceSpec, PageFetcher, run_sources, scrape_source
+
+CARDS_PER_PAGE = 10
+
+def build_site(fixtures_dir, number):
+    """Saves site `number` (number listing pages) and returns its spec."""
+    host = f"https://camps{number}.example"
+    for page in range(1, number + 1):
+        items = "".join(
+            f'<li class="camp"><a class="name" href="/camps/{page}-{item}">Camp {page}-{item}</a>'
+            f'<span class="age">Ages 6-10</span><span class="where">Plano</span></li>'
+            for item in range(CARDS_PER_PAGE))
+        next_link = f'<a rel="next" href="/camps?page={page + 1}">Next</a>' if page < number else ""
+        save_fixture(fixtures_dir, f"{host}/camps?page={page}",
+                     f"<html><body><ul>{items}</ul>{next_link}</body></html>".encode('utf-8'), content_type="text/html")
+        for item in range(CARDS_PER_PAGE):
+            save_fixture(fixtures_dir, f"{host}/camps/{page}-{item}",
+                         f'<html><body><div class="when">June 2-6</div><div class="price">$250</div>'
+                         f'<div class="desc">Camp {page}-{item} of site {number}</div></body></html>'.encode('utf-8'),
+                         content_type="text/html")
+    return SourceSpec(
+        name=f"site_{number}", organization=f"Site {number}", start_urls=[f"{host}/camps?page=1"],
+        list_selector="li.camp", fields={'Camp Name': "a.name", 'Age Range': ".age", 'Location': ".where"},
+        detail={'strategy': "page", 'link': "a.name@href",
+                'fields': {'Week': ".when", 'Price': ".price", 'Description': ".desc"}},
+        pagination={'next': "a[rel='next']@href"}, max_pages=number)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--min-interval", type=float, default=0.05)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    fixtures_dir = tempfile.mkdtemp(prefix="bench_sources_")
+    specs = [build_site(fixtures_dir, number) for number in range(1, args.sites + 1)]
+    pages = sum(number * (CARDS_PER_PAGE + 1) for number in range(1, args.sites + 1))
+
+    def fetcher(base_url):
+        return PageFetcher(HostScheduler(args.max_concurrency, args.per_host, args.min_interval), base_url=base_url)
+
+    with FixtureServer(fixtures_dir) as server:
+        started = time.perf_counter()
+        sequential_fetcher = fetcher(server.base_url)
+        rows = sum(len(scrape_source(spec, sequential_fetcher)) for spec in specs)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        summary = run_sources(specs, fetcher(server.base_url), output_dir=None)
+        concurrent = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scrape_source(specs[-1], fetcher(server.base_url))
+        slowest = time.perf_counter() - started
+
+    if sum(entry['rows'] for entry in summary) != rows:
+        raise AssertionError("Concurrent run returned a different number of rows")
+    print(f"{args.sites} sites, {pages:,} pages, {rows:,} rows; per host: {args.per_host} at a time, "
+          f"{args.min_interval}s apart; global cap {args.max_concurrency}")
+    print(f"sequential {sequential:6.2f}s")
+    print(f"concurrent {concurrent:6.2f}s  ({sequential / concurrent:.1f}x)")
+    print(f"slowest    {slowest:6.2f}s  (site_{args.sites} alone)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the startup cost of the camp-data CLI.
+
+Runs `python -X importtime -m sources <command> --help` for the top-level help
+and each light subcommand in a fresh interpreter, --repeat times, and reports
+the median wall time and the import time spent in our own modules and their
+dependencies (everything imported beyond a bare `python -c pass`). Fails
+(exit 1) if any command goes over --budget-ms of imports, or if its help loads
+a heavy dependency (pandas, Selenium, webdriver_manager, the Gemini client)
+that only the real work needs.
+
+Usage:
+    python bench_startup.py [--repeat 5] [--budget-ms 150] [--commands ,scrape,sources,extract,fixtures]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PACKAGE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY_MODULES = ("pandas", "selenium", "webdriver_manager", "google.genai", "PIL")
+# "import time: <self us> | <cumulative us> | <indented module name>"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+def import_times(stderr):
+    """Cumulative microseconds per top-level import (nested imports are counted in their parent)."""
+    times = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and not match.group(3):
+            times[match.group(4)] = times.get(match.group(4), 0) + int(match.group(2))
+    return times
+
+def run(arguments):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime"] + arguments, cwd=PACKAGE_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(arguments)} exited with {result.returncode}")
+    return wall, import_times(result.stderr), result.stderr
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Import time allowed per command")
+    parser.add_argument("--commands", default=",scrape,sources,extract,fixtures",
+                        help="Comma-separated subcommands; an empty entry is `camp-data --help`")
+    args = parser.parse_args()
+
+    baseline = set(run(["-c", "pass"])[1])
+    baseline_wall = statistics.median(run(["-c", "pass"])[0] for _ in range(args.repeat))
+    print(f"{'command':<20} {'wall':>8} {'imports':>9}  heaviest imports")
+    print(f"{'(python -c pass)':<20} {baseline_wall * 1e3:>6.0f}ms")
+    failures = []
+    for command in args.commands.split(","):
+        arguments = ["-m", "sources"] + ([command] if command else []) + ["--help"]
+        walls, totals = [], []
+        for _ in range(args.repeat):
+            wall, times, stderr = run(arguments)
+            ours = {name: micros for name, micros in times.items() if name not in baseline}
+            walls.append(wall)
+            totals.append(sum(ours.values()))
+        label = f"{command or 'camp-data'} --help"
+        imports_ms = statistics.median(totals) / 1e3
+        heaviest = sorted(ours.items(), key=lambda item: -item[1])[:3]
+        print(f"{label:<20} {statistics.median(walls) * 1e3:>6.0f}ms {imports_ms:>7.1f}ms  "
+              + ", ".join(f"{name} {micros / 1e3:.1f}ms" for name, micros in heaviest))
+        loaded = set(re.findall(r"\| \s*(\S+)$", stderr, re.M))
+        heavy = [name for name in HEAVY_MODULES if name in loaded]
+        if heavy:
+            failures.append(f"{label} imports {', '.join(heavy)}")
+        if imports_ms > args.budget_ms:
+            failures.append(f"{label} spends {imports_ms:.1f}ms importing (budget {args.budget_ms:g}ms)")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Camp data tools: scrapers, flyer extraction, normalization and loading for the csm tables.
+
+Nothing is imported here, so importing one module (e.g. sources.normalize) only loads what
+that module needs. The command line entry point is sources.cli (``camp-data`` or ``python -m sources``).
+"""
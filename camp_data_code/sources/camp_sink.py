@@ -0,0 +1,149 @@
+import csv
+import json
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Define required columns for the final output
+REQUIRED_COLUMNS = [
+    'Organization', 'Camp Name', 'Week', 'Days',
+    'Start Time', 'End Time', 'Location', 'Age Range',
+    'Grade Range', 'Price', 'Description', 'Email', 'Contact'
+]
+
+# File extension -> output format
+OUTPUT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+def _create_temp_file(directory, name):
+    """Opens a new, uniquely named temp file next to `name`.
+
+    Unlike tempfile.mkstemp (always 0600), the file gets the mode a plain open()
+    would give it (0644 under the usual umask 022), which os.replace then carries
+    over to the output file.
+    """
+    while True:
+        path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), path
+        except FileExistsError:
+            continue
+
+class CampRowSink:
+    """Streams camp rows to disk as they are scraped.
+
+    Rows go to a temp file in the destination directory, which is renamed over the
+    destination only when the sink is closed successfully; a crash or exception
+    leaves any previous file untouched. Memory stays flat: CSV and JSON Lines rows
+    are written immediately, Parquet rows in zstd-compressed row groups of `batch_size`.
+
+    Usage:
+        with CampRowSink("lifetime_camps_plano.csv") as sink:
+            for row in rows:
+                sink.write(row)
+    """
+
+    def __init__(self, path, output_format=None, columns=REQUIRED_COLUMNS, batch_size=1000):
+        self.path = path
+        self.output_format = output_format or OUTPUT_FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.output_format not in OUTPUT_FORMATS.values():
+            raise ValueError(f"Unsupported output format for {path}: {self.output_format}")
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._batch = []
+        self._parquet_writer = None
+        self.closed = False
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = _create_temp_file(directory, os.path.basename(path))
+        if self.output_format == 'parquet':
+            os.close(fd)
+            self._file = None
+        else:
+            self._file = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+            if self.output_format == 'csv':
+                self._csv_writer = csv.DictWriter(self._file, fieldnames=self.columns, restval="",
+                                                  extrasaction='ignore', lineterminator='\n')
+                self._csv_writer.writeheader()
+
+    def write(self, row):
+        """Adds one row (a dict keyed by column name; missing columns are left empty)."""
+        if self.output_format == 'csv':
+            self._csv_writer.writerow(row)
+        elif self.output_format == 'jsonl':
+            record = {column: row.get(column, "") for column in self.columns}
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._batch.append(row)
+            if len(self._batch) >= self.batch_size:
+                self._flush_parquet()
+        self.rows_written += 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def _flush_parquet(self):
+        if not self._batch:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({
+            column: pa.array([row.get(column, "") for row in self._batch], type=pa.string())
+            for column in self.columns
+        })
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self._tmp_path, table.schema, compression='zstd')
+        self._parquet_writer.write_table(table)
+        self._batch = []
+
+    def close(self):
+        """Finishes the file and atomically moves it into place."""
+        if self.output_format == 'parquet':
+            self._flush_parquet()
+            if self._parquet_writer is None:
+                # No rows: still produce a valid file with the schema
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                schema = pa.schema([(column, pa.string()) for column in self.columns])
+                self._parquet_writer = pq.ParquetWriter(self._tmp_path, schema, compression='zstd')
+            self._parquet_writer.close()
+        else:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        os.replace(self._tmp_path, self.path)
+        self.closed = True
+        logger.info(f"Successfully saved {self.rows_written} records to {self.path}")
+
+    def abort(self):
+        """Discards everything written so far (a no-op once the sink is closed)."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+            if self._file is not None:
+                self._file.close()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def save_rows(rows, path, output_format=None):
+    """Writes an iterable of camp rows through a CampRowSink. Returns the number of rows written."""
+    with CampRowSink(path, output_format=output_format) as sink:
+        sink.write_rows(rows)
+    return sink.rows_written
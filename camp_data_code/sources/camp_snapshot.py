@@ -0,0 +1,245 @@
+import argparse
+import bisect
+import datetime
+import json
+import logging
+import os
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "camp_data_1.1", "normalized", "camps_snapshot.arrow")
+
+# Same join as backend/manual_data/create_vw_camps.sql, plus programs.featured for /api/camps/featured
+VIEW_COLUMNS = [
+    'program_id', 'week_of', 'price', 'institute_id', 'institute_nm', 'institute_info', 'institute_url',
+    'address', 'enroll_link', 'program_nm', 'program_info', 'program_url', 'min_age', 'max_age',
+    'category', 'rating', 'image_url', 'featured',
+]
+VIEW_SQL = """
+    SELECT c.program_id, c.week_of, c.price, i.institute_id, i.institute_nm, i.institute_info, i.institute_url,
+           i.address, i.enroll_link, p.program_nm, p.program_info, p.program_url, p.min_age, p.max_age,
+           p.category, p.rating, p.image_url, p.featured
+    FROM {schema}.camp_details c
+    LEFT JOIN {schema}.programs p ON c.program_id = p.program_id
+    LEFT JOIN {schema}.institutes i ON p.institute_id = i.institute_id
+"""
+
+INDEX_METADATA_PREFIX = b"index:"
+
+def _bitmap(mask):
+    """Python int with bit i set where mask[i] is true."""
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+def _bitmap_ids(bits, size):
+    """Row indices of the set bits, in ascending order."""
+    packed = np.frombuffer(bits.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed, bitorder='little')[:size])
+
+def _week_text(value):
+    if value is None:
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+class CampSnapshot:
+    """vw_camps materialized once per data load, with bitmap indexes for the API filters.
+
+    Rows are stored sorted by price (missing prices last), so "price <= x" is the
+    low-bit prefix found by bisecting the sorted prices. Every other index is a
+    Python-int bitset over the same row order, and a query is a few big-int ANDs:
+
+    - ages: for each age a, bitsets of rows with min_age <= a and with max_age >= a
+      (an interval index over the small age domain; overlap is one AND of the two)
+    - weeks: distinct week_of values in sorted order with cumulative bitsets, so a
+      date range is two bisects and one AND-NOT
+    - category and featured: one bitset per value (a missing featured flag is in neither)
+
+    Missing values never match a filter on that column, as NULL does in the SQL view.
+
+    Usage:
+        snapshot = CampSnapshot.from_connection(conn)
+        rows = snapshot.query(min_age=6, max_age=9, max_price=400, interests=["Arts", "Technology"])
+    """
+
+    def __init__(self, table, indexes=None):
+        self.table = table
+        self.size = table.num_rows
+        self.prices = [price for price in table.column('price').to_pylist() if price is not None]
+        self._json_rows = None
+        if indexes is None:
+            indexes = self._build_indexes()
+        self._load_indexes(indexes)
+
+    # --- Building ---
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a snapshot from vw_camps rows (dicts keyed by VIEW_COLUMNS)."""
+        columns = {column: [row.get(column) for row in rows] for column in VIEW_COLUMNS}
+        columns['week_of'] = [_week_text(value) for value in columns['week_of']]
+        for column in ('price', 'rating'):
+            columns[column] = [None if value is None else float(value) for value in columns[column]]
+        for column in ('min_age', 'max_age', 'featured'):
+            columns[column] = [None if value in (None, "") else int(value) for value in columns[column]]
+        # Cheapest first, missing prices last
+        order = sorted(range(len(rows)), key=lambda index: (
+            columns['price'][index] is None, columns['price'][index] or 0.0,
+            str(columns['program_id'][index]), columns['week_of'][index] or ""))
+        return cls(pa.table({column: [columns[column][index] for index in order] for column in VIEW_COLUMNS}))
+
+    @classmethod
+    def from_connection(cls, conn, schema="csm"):
+        """Runs the vw_camps join once against a load_camps connection (SQLite stand-in or MySQL)."""
+        cursor = conn.cursor()
+        cursor.execute(VIEW_SQL.format(schema=schema))
+        rows = [dict(zip(VIEW_COLUMNS, values)) for values in cursor.fetchall()]
+        return cls.from_rows(rows)
+
+    def _build_indexes(self):
+        def column(name, fill):
+            values = self.table.column(name).to_numpy(zero_copy_only=False)
+            return np.array([fill if value is None or value != value else value for value in values])
+
+        indexes = {}
+        min_age = column('min_age', -1).astype(np.int16)
+        max_age = column('max_age', -1).astype(np.int16)
+        has_ages = (min_age >= 0) & (max_age >= 0)
+        top_age = int(max(min_age.max(initial=0), max_age.max(initial=0)))
+        for age in range(top_age + 1):
+            indexes[f"min_age_le:{age}"] = _bitmap(has_ages & (min_age <= age))
+            indexes[f"max_age_ge:{age}"] = _bitmap(has_ages & (max_age >= age))
+
+        weeks = column('week_of', "")
+        cumulative = np.zeros(self.size, dtype=bool)
+        for week in sorted(set(weeks) - {""}):
+            cumulative |= weeks == week
+            indexes[f"week_le:{week}"] = _bitmap(cumulative)
+
+        categories = column('category', "")
+        for category in sorted(set(categories) - {""}):
+            indexes[f"category:{category}"] = _bitmap(categories == category)
+        featured = column('featured', -1)
+        indexes["featured"] = _bitmap(featured == 1)
+        indexes["not_featured"] = _bitmap(featured == 0)
+        return indexes
+
+    def _load_indexes(self, indexes):
+        self.indexes = indexes
+        self.all_rows = (1 << self.size) - 1
+        self.top_age = max((int(name.split(":")[1]) for name in indexes if name.startswith("min_age_le:")), default=-1)
+        self.weeks = sorted(name.split(":", 1)[1] for name in indexes if name.startswith("week_le:"))
+
+    # --- Persistence ---
+    def save(self, path=SNAPSHOT_PATH):
+        """Writes the rows and the index bitsets to one Arrow IPC file (bitsets in the schema metadata)."""
+        metadata = {INDEX_METADATA_PREFIX + name.encode('utf-8'): bits.to_bytes((self.size + 7) // 8, 'little')
+                    for name, bits in self.indexes.items()}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        feather.write_feather(self.table.replace_schema_metadata(metadata), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+        logger.info(f"Saved snapshot of {self.size} rows and {len(self.indexes)} indexes to {path}")
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_PATH):
+        table = feather.read_table(path, memory_map=True)
+        indexes = {name[len(INDEX_METADATA_PREFIX):].decode('utf-8'): int.from_bytes(bits, 'little')
+                   for name, bits in (table.schema.metadata or {}).items() if name.startswith(INDEX_METADATA_PREFIX)}
+        return cls(table.replace_schema_metadata(None), indexes)
+
+    # --- Queries ---
+    def match(self, min_age=None, max_age=None, max_price=None, interests=None, week_from=None, week_to=None,
+              featured=None):
+        """Bitset of the rows matching every given filter.
+
+        Args:
+            min_age, max_age (int): Camps whose age range overlaps [min_age, max_age].
+            max_price (float): price <= max_price.
+            interests (list): Categories; a camp matches any of them.
+            week_from, week_to (str): Inclusive YYYY-MM-DD bounds on week_of.
+            featured (bool): Only featured (or only non-featured) camps.
+        """
+        bits = self.all_rows
+        if max_price is not None:
+            bits &= (1 << bisect.bisect_right(self.prices, float(max_price))) - 1
+        if max_age is not None:
+            # A camp overlaps the range if it starts at or before max_age ...
+            bits &= self.indexes.get(f"min_age_le:{min(int(max_age), self.top_age)}", 0)
+        if min_age is not None:
+            # ... and ends at or after min_age
+            bits &= self.indexes.get(f"max_age_ge:{max(int(min_age), 0)}", 0)
+        if week_from is not None or week_to is not None:
+            bits &= self._week_range(week_from, week_to)
+        if interests:
+            category_bits = 0
+            for category in interests:
+                category_bits |= self.indexes.get(f"category:{category}", 0)
+            bits &= category_bits
+        if featured is not None:
+            bits &= self.indexes["featured" if featured else "not_featured"]
+        return bits
+
+    def _week_range(self, week_from, week_to):
+        upper = bisect.bisect_right(self.weeks, week_to) if week_to is not None else len(self.weeks)
+        lower = bisect.bisect_left(self.weeks, week_from) if week_from is not None else 0
+        if upper <= lower:
+            return 0
+        bits = self.indexes[f"week_le:{self.weeks[upper - 1]}"]
+        if lower > 0:
+            bits &= ~self.indexes[f"week_le:{self.weeks[lower - 1]}"]
+        return bits
+
+    def count(self, **filters):
+        return bin(self.match(**filters)).count("1")
+
+    def query(self, limit=None, **filters):
+        """Matching rows as dicts (cheapest first), like SELECT * FROM vw_camps WHERE ...; see match()."""
+        ids = _bitmap_ids(self.match(**filters), self.size)
+        if limit is not None:
+            ids = ids[:limit]
+        return self.table.take(ids).to_pylist()
+
+    def query_json(self, limit=None, **filters):
+        """Matching rows as a JSON array string, ready to send as the API response; see match().
+
+        Each row is encoded once, on the first call, and reused by every later query.
+        """
+        if self._json_rows is None:
+            self._json_rows = [json.dumps(row, ensure_ascii=False) for row in self.table.to_pylist()]
+        ids = _bitmap_ids(self.match(**filters), self.size)
+        if limit is not None:
+            ids = ids[:limit]
+        return "[" + ",".join([self._json_rows[index] for index in ids.tolist()]) + "]"
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Materialize csm.vw_camps into an indexed snapshot file.")
+    parser.add_argument("--sqlite", help="Read from this SQLite file written by load_camps.py instead of MySQL")
+    parser.add_argument("--manual", action="store_true", help="Read backend/manual_data CSVs instead of a database")
+    parser.add_argument("--out", default=SNAPSHOT_PATH)
+    args = parser.parse_args(argv)
+
+    from .load_camps import connect_sqlite, connect_mysql, seed_from_manual_csvs
+    if args.manual:
+        conn = connect_sqlite(":memory:")
+        seed_from_manual_csvs(conn)
+    elif args.sqlite:
+        conn = connect_sqlite(args.sqlite)
+    else:
+        conn = connect_mysql()
+    try:
+        started = time.perf_counter()
+        snapshot = CampSnapshot.from_connection(conn)
+        logger.info(f"Built snapshot of {snapshot.size} rows in {time.perf_counter() - started:.2f}s")
+        snapshot.save(args.out)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
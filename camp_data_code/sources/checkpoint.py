@@ -0,0 +1,76 @@
+import glob
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+class ScrapeCheckpoint:
+    """Append-only, fsynced log of processed cards for one source and run.
+
+    Each line holds a card key (its fingerprint and occurrence on the page), the
+    finished row and the modal details it used. Retries within a run, and a
+    restarted process that explicitly resumes the run, skip every card already in
+    the log. Entries are looked up by key, so cards that are no longer on the page
+    are simply never asked for. finish() deletes the log once a run completes.
+    """
+
+    def __init__(self, source, checkpoint_dir, run_id=None):
+        self.source = source
+        # A fresh run per invocation; pass an earlier run_id (see latest_run) to resume it
+        self.run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.path = os.path.join(checkpoint_dir, f"{source}-{self.run_id}.jsonl")
+        self._entries = {}
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        if os.path.exists(self.path):
+            self._load()
+            logger.info(f"Resuming {source} run {self.run_id}: {len(self._entries)} cards already checkpointed")
+
+    @staticmethod
+    def latest_run(source, checkpoint_dir):
+        """run_id of the newest unfinished run of `source`, or None."""
+        paths = glob.glob(os.path.join(glob.escape(checkpoint_dir), f"{glob.escape(source)}-*.jsonl"))
+        if not paths:
+            return None
+        newest = max(paths, key=os.path.getmtime)
+        return os.path.basename(newest)[len(source) + 1:-len(".jsonl")]
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # A crash mid-write leaves a truncated last line; cut it so the next append starts a fresh line
+            logger.warning(f"Dropping a truncated last line from {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+        for line_number, line in enumerate(data[:complete].decode('utf-8', errors='replace').splitlines(), 1):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable checkpoint line {line_number} in {self.path}")
+                continue
+            self._entries[entry['key']] = entry
+
+    def get(self, key):
+        """The checkpointed entry for a card key, or None if it still has to be processed."""
+        return self._entries.get(key)
+
+    def append(self, key, record, details=None):
+        """Durably commits one processed card."""
+        entry = {'key': key, 'record': record, 'details': details}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._entries[key] = entry
+
+    def finish(self):
+        """Closes a completed run: its log is deleted so nothing can resume from it."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        logger.info(f"Finished {self.source} run {self.run_id}; removed its checkpoint")
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,43 @@
+"""Command line entry point for the camp data tools.
+
+Each subcommand hands the rest of the command line to the main() of one module,
+which is only imported once that subcommand is chosen, so `camp-data --help`
+never loads pandas, Selenium or the Gemini client. Run `camp-data <command> -h`
+for the options of a command.
+"""
+import argparse
+import importlib
+import sys
+
+# Subcommand -> (module, help); the module's main(argv) parses everything after the subcommand
+COMMANDS = {
+    'scrape': ('web_scrape', "Scrape Lifetime Fitness camps for the DFW clubs"),
+    'sources': ('source_registry', "Scrape registered sources concurrently with per-host limits"),
+    'extract': ('info_extract', "Extract camp rows from flyer images with Gemini"),
+    'normalize': ('normalize', "Normalize every scraped source into one Arrow file"),
+    'dedupe': ('dedupe', "Group camp sessions into canonical programs and sessions"),
+    'load': ('load_camps', "Load normalized camp sessions into the csm tables"),
+    'snapshot': ('camp_snapshot', "Materialize csm.vw_camps into an indexed snapshot file"),
+    'geocode': ('geocode', "Geocode camp locations offline and search them by distance"),
+    'fixtures': ('fixture_server', "Record or replay Lifetime camps page fixtures"),
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="camp-data", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS:
+        # Prints the help, or the usage error for a missing or unknown command
+        build_parser().parse_args(argv)
+        return
+    command, rest = argv[0], argv[1:]
+    module = importlib.import_module(f"{__package__}.{COMMANDS[command][0]}")
+    # Usage lines of the subcommand read "camp-data <command> ..."
+    sys.argv[0] = f"camp-data {command}"
+    return module.main(rest)
@@ -0,0 +1,326 @@
+import argparse
+import csv
+import difflib
+import hashlib
+import logging
+import os
+import re
+import time
+import zlib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(BASE_DIR, "camp_data_1.1")
+MANUAL_DATA_DIR = os.path.join(BASE_DIR, "backend", "manual_data")
+
+# --- MinHash / LSH settings ---
+NUM_PERM = 64                 # MinHash signature length
+BANDS = 32                    # LSH bands of NUM_PERM // BANDS rows; pairs above ~0.5 Jaccard almost always share one
+SIMILARITY_THRESHOLD = 0.5    # Estimated Jaccard of name shingles a candidate pair needs before the edit check
+EDIT_SIMILARITY = 0.9         # difflib ratio needed to merge two names: a typo or two, not a different word
+SHINGLE_SIZE = 3
+MAX_BUCKET_PAIRS = 64         # Larger LSH buckets are only compared against their first member
+_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(20250526)
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+# City names are dropped from organization and camp names, so "iCode Plano" and "iCode mckinney" are one
+# organization and "Exploring Theatre - Ages 7-11 - Frisco" and "... - Plano" one program
+LOCATION_TOKENS = {
+    'addison', 'allen', 'arlington', 'carrollton', 'colleyville', 'coppell', 'dallas', 'denton', 'fairview',
+    'flower', 'mound', 'fort', 'worth', 'frisco', 'garland', 'grapevine', 'irving', 'keller', 'lewisville',
+    'mckinney', 'mesquite', 'plano', 'prosper', 'richardson', 'rockwall', 'southlake', 'tx',
+}
+
+# Tokens that make two otherwise near-identical names different programs ("Half Day AM" vs "PM", "Ages 5-8" vs "9-12")
+MARKER_PATTERN = re.compile(r"\d+|\b(?:am|pm|i{1,3}|iv|jr|sr|junior|senior|beginner|intermediate|advanced|half|full)\b")
+
+def _tokens(text):
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+def organization_key(organization):
+    """Lowercased organization name without punctuation or city names."""
+    tokens = [token for token in _tokens(organization) if token not in LOCATION_TOKENS]
+    return " ".join(tokens) or " ".join(_tokens(organization))
+
+def name_key(camp_name):
+    """Lowercased camp name without markup debris ("$ \\n ..."), punctuation or city names."""
+    tokens = [token for token in _tokens(camp_name) if token not in LOCATION_TOKENS]
+    return " ".join(tokens) or " ".join(_tokens(camp_name))
+
+def display_name(camp_name):
+    """Camp name with collapsed whitespace and leading debris removed."""
+    return re.sub(r"^[^\w(]+", "", " ".join(str(camp_name).split()))
+
+def location_key(location):
+    return " ".join(_tokens(location))
+
+def name_markers(key):
+    return " ".join(sorted(set(MARKER_PATTERN.findall(key))))
+
+def minhash_signatures(keys, num_perm=NUM_PERM, chunk_size=200_000):
+    """MinHash signatures (len(keys) x num_perm, uint64) over character shingles of each key."""
+    shingle_hashes = []
+    owners = []
+    for owner, key in enumerate(keys):
+        padded = f" {key} "
+        shingles = {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+        shingle_hashes.extend(zlib.crc32(shingle.encode('utf-8')) for shingle in shingles)
+        owners.extend([owner] * len(shingles))
+    hashes = np.array(shingle_hashes, dtype=np.uint64)
+    owners = np.array(owners, dtype=np.int64)
+    signatures = np.full((len(keys), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    # Owners are contiguous, so each chunk reduces with one reduceat per permutation batch
+    for start in range(0, len(hashes), chunk_size):
+        chunk = hashes[start:start + chunk_size]
+        chunk_owners = owners[start:start + chunk_size]
+        # (a * h + b) mod p, with the uint64 product wrapping as in the usual MinHash implementations
+        values = (chunk[:, None] * _PERM_A[:num_perm] + _PERM_B[:num_perm]) % _PRIME
+        boundaries = np.flatnonzero(np.r_[True, chunk_owners[1:] != chunk_owners[:-1]])
+        reduced = np.minimum.reduceat(values, boundaries, axis=0)
+        rows = chunk_owners[boundaries]
+        signatures[rows] = np.minimum(signatures[rows], reduced)
+    return signatures
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+    def roots(self):
+        return np.array([self.find(item) for item in range(len(self.parent))])
+
+def candidate_pairs(org_codes, signatures, bands=BANDS):
+    """Index pairs (first < second) that share an organization and at least one LSH band."""
+    rows = signatures.shape[1] // bands
+    pairs = []
+    for band in range(bands):
+        # One 64-bit bucket key per (organization, band) instead of a multi-column group-by
+        bucket_keys = org_codes.astype(np.uint64)
+        for row in range(band * rows, (band + 1) * rows):
+            bucket_keys = bucket_keys * np.uint64(0x9E3779B97F4A7C15) + signatures[:, row]
+        bucket_codes, _ = pd.factorize(bucket_keys)
+        shared = np.flatnonzero(np.bincount(bucket_codes)[bucket_codes] > 1)
+        if not len(shared):
+            continue
+        shared = shared[np.argsort(bucket_codes[shared], kind='stable')]
+        boundaries = np.flatnonzero(np.diff(bucket_codes[shared])) + 1
+        for members in np.split(shared, boundaries):
+            anchors = members if len(members) * (len(members) - 1) // 2 <= MAX_BUCKET_PAIRS else members[:1]
+            for position, first in enumerate(anchors.tolist()):
+                pairs.extend((first, second) for second in members[position + 1:].tolist())
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.array(pairs, dtype=np.int64), axis=1)
+    return np.unique(pairs, axis=0)
+
+def cluster_names(org_keys, name_keys, threshold=SIMILARITY_THRESHOLD, bands=BANDS, edit_similarity=EDIT_SIMILARITY):
+    """Clusters distinct (organization, name) pairs into programs.
+
+    Blocking: names are only compared within the same organization key and only when
+    their MinHash signatures share an LSH band, so the work grows with the number of
+    near-duplicate candidates rather than all pairs. Candidates are merged when their
+    estimated Jaccard similarity reaches `threshold`, their marker tokens agree and
+    their edit similarity reaches `edit_similarity`.
+
+    Returns:
+        tuple: (cluster root index per pair, number of candidate pairs).
+    """
+    signatures = minhash_signatures(name_keys)
+    org_codes, _ = pd.factorize(pd.Series(org_keys, dtype=object))
+    pairs = candidate_pairs(org_codes, signatures, bands)
+    union_find = _UnionFind(len(name_keys))
+    comparisons = len(pairs)
+    if len(pairs):
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= threshold]
+    markers = [name_markers(key) for key in name_keys]
+    for first, second in pairs.tolist():
+        if markers[first] != markers[second]:
+            continue
+        if difflib.SequenceMatcher(None, name_keys[first], name_keys[second]).ratio() >= edit_similarity:
+            union_find.union(first, second)
+    return union_find.roots(), comparisons
+
+def _stable_id(prefix, *parts):
+    return prefix + hashlib.sha1("|".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:10]
+
+def _map_distinct(series, function):
+    """Applies a string function once per distinct value, as an object column."""
+    codes, uniques = pd.factorize(series.astype(str))
+    mapped = np.array([function(value) for value in uniques], dtype=object)
+    return pd.Series(mapped[codes], index=series.index)
+
+def _most_common(frame, key, column):
+    """Most frequent value of `column` per `key` (ties go to the alphabetically first)."""
+    counts = frame.groupby([key, column], observed=True).size().rename('count').reset_index()
+    counts = counts.sort_values(['count', column], ascending=[False, True]).drop_duplicates(key)
+    return counts.set_index(key)[column]
+
+def _join_values(frame, key, column, unique=True):
+    """Values of `column` per `key` (sorted and distinct when `unique`), joined with "; ".
+
+    Most keys have a single value; only the rest go through the per-group string join.
+    """
+    values = frame[[key, column]]
+    values = values.drop_duplicates().sort_values([key, column]) if unique else values
+    counts = values.groupby(key, sort=True).size()
+    joined = values.groupby(key, sort=True)[column].first()
+    multiple = values[values[key].isin(counts.index[counts > 1])]
+    if len(multiple):
+        joined.update(multiple.groupby(key, sort=True)[column].agg("; ".join))
+    return joined
+
+def manual_records(manual_dir=MANUAL_DATA_DIR):
+    """One record per hand-maintained program week, in the same shape as normalize_camps output."""
+    def read(table):
+        with open(os.path.join(manual_dir, f"{table}.csv"), encoding='utf-8', errors='replace', newline='') as f:
+            return pd.DataFrame(list(csv.DictReader(f)))
+    institutes, programs, weeks = read('institutes'), read('programs'), read('camp_details')
+    merged = weeks.merge(programs, on='program_id', how='right').merge(institutes, on='institute_id', how='left')
+    start_date = pd.to_datetime(merged['week_of'], format="%m/%d/%Y", errors='coerce')
+    return pd.DataFrame({
+        'source': 'manual_data',
+        'organization': merged['institute_nm'].fillna(""),
+        'camp_name': merged['program_nm'].fillna(""),
+        'location': merged['address'].fillna(""),
+        'start_date': start_date,
+        'end_date': start_date + pd.Timedelta(days=4),
+        'start_minutes': pd.array([pd.NA] * len(merged), dtype='Int16'),
+        'min_age': pd.to_numeric(merged['min_age'], errors='coerce').astype('Int8'),
+        'max_age': pd.to_numeric(merged['max_age'], errors='coerce').astype('Int8'),
+    })
+
+def dedupe_camps(records, threshold=SIMILARITY_THRESHOLD, bands=BANDS, edit_similarity=EDIT_SIMILARITY):
+    """Assigns canonical program and session IDs to camp-session records.
+
+    A program is an organization plus a cluster of near-identical camp names (the same
+    program at several clubs or in several source files). A session is one program at
+    one location in one week for one age band and start time; records that agree on all
+    of those are the same session seen twice.
+
+    Args:
+        records (DataFrame): normalize_camps output (optionally with manual_records appended).
+
+    Returns:
+        tuple: (records with record_id, program_id and session_id columns,
+        programs frame, sessions frame with merge provenance, stats dict).
+    """
+    started = time.perf_counter()
+    records = records.reset_index(drop=True).copy()
+    records['record_id'] = records['source'].astype(str) + ":" + \
+        records.groupby('source', observed=True).cumcount().astype(str)
+    org_keys = _map_distinct(records['organization'], organization_key)
+    name_keys = _map_distinct(records['camp_name'], name_key)
+    valid = (org_keys != "") & (name_keys != "")
+
+    # Cluster distinct names only: copies of a name cost nothing
+    pairs = pd.DataFrame({'org': org_keys[valid], 'name': name_keys[valid]})
+    codes, distinct = pd.factorize(pd.MultiIndex.from_frame(pairs))
+    distinct_orgs = distinct.get_level_values(0).tolist()
+    distinct_names = distinct.get_level_values(1).tolist()
+    roots, comparisons = cluster_names(distinct_orgs, distinct_names, threshold, bands, edit_similarity)
+    # Canonical name of a cluster: its alphabetically first member, so IDs do not depend on row order
+    names = np.array(distinct_names, dtype=object)
+    order = np.argsort(names, kind='stable')
+    first_in_cluster = pd.Series(order).groupby(roots[order]).first()
+    canonical = names[first_in_cluster.loc[roots].to_numpy()]
+    program_ids = [_stable_id("P", org, name) for org, name in zip(distinct_orgs, canonical)]
+    records['program_id'] = None
+    records.loc[valid, 'program_id'] = np.array(program_ids, dtype=object)[codes]
+
+    session_keys = pd.DataFrame({
+        'program_id': records['program_id'],
+        'location': _map_distinct(records['location'], location_key),
+        'start_date': pd.to_datetime(records['start_date']).dt.strftime("%Y-%m-%d").fillna(""),
+        'min_age': records['min_age'].astype(str),
+        'max_age': records['max_age'].astype(str),
+        'start_minutes': records['start_minutes'].astype(str),
+    })
+    session_codes, session_uniques = pd.factorize(pd.MultiIndex.from_frame(session_keys.astype(str)))
+    session_ids = np.array([_stable_id("S", *key) for key in session_uniques], dtype=object)
+    records['session_id'] = np.where(valid, session_ids[session_codes], None)
+
+    # Plain object columns: per-group string joins are much slower on Arrow-backed strings
+    merged = records[valid].assign(
+        organization=records['organization'].astype(str).astype(object),
+        program_name=_map_distinct(records['camp_name'], display_name),
+        name_key=name_keys,
+        source=records['source'].astype(str).astype(object),
+        record_id=records['record_id'].astype(object),
+    )
+    programs = merged.groupby('program_id', sort=True).agg(
+        name_variants=('name_key', 'nunique'),
+        records=('record_id', 'size'),
+        sessions=('session_id', 'nunique'),
+    )
+    programs.insert(0, 'organization', _most_common(merged, 'program_id', 'organization'))
+    programs.insert(1, 'program_name', _most_common(merged, 'program_id', 'program_name'))
+    programs['sources'] = _join_values(merged, 'program_id', 'source')
+    sessions = merged.groupby('session_id', sort=True).agg(
+        program_id=('program_id', 'first'),
+        location=('location', 'first'),
+        start_date=('start_date', 'first'),
+        end_date=('end_date', 'first'),
+        min_age=('min_age', 'first'),
+        max_age=('max_age', 'first'),
+        records=('record_id', 'size'),
+    )
+    sessions['sources'] = _join_values(merged, 'session_id', 'source')
+    sessions['merged_from'] = _join_values(merged, 'session_id', 'record_id', unique=False)
+    programs, sessions = programs.reset_index(), sessions.reset_index()
+
+    stats = {
+        'records': len(records), 'distinct_names': len(distinct_names), 'comparisons': comparisons,
+        'programs': len(programs), 'sessions': len(sessions),
+        'duplicate_records': int(valid.sum()) - len(sessions), 'seconds': time.perf_counter() - started,
+    }
+    logger.info(f"Deduplicated {stats['records']} records ({stats['distinct_names']} distinct names, "
+                f"{stats['comparisons']} comparisons) into {stats['programs']} programs and "
+                f"{stats['sessions']} sessions in {stats['seconds']:.2f}s")
+    return records, programs, sessions, stats
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Group camp-session records into canonical programs and sessions.")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory of scraped CSV/XLSX sources")
+    parser.add_argument("--normalized", help="Use an Arrow file written by normalize.py instead of --data-dir")
+    parser.add_argument("--no-manual", action="store_true", help="Leave out backend/manual_data")
+    parser.add_argument("--out-dir", default=os.path.join(DATA_DIR, "normalized"))
+    args = parser.parse_args(argv)
+
+    from .normalize import read_sources, normalize_camps, load_normalized
+    if args.normalized:
+        normalized = load_normalized(args.normalized).to_pandas()
+    else:
+        normalized = normalize_camps(read_sources(args.data_dir))
+    if not args.no_manual:
+        normalized = pd.concat([normalized, manual_records()], ignore_index=True)
+
+    records, programs, sessions, stats = dedupe_camps(normalized)
+    os.makedirs(args.out_dir, exist_ok=True)
+    records[['record_id', 'program_id', 'session_id']].to_csv(os.path.join(args.out_dir, "record_ids.csv"), index=False)
+    programs.to_csv(os.path.join(args.out_dir, "programs.csv"), index=False)
+    sessions.to_csv(os.path.join(args.out_dir, "sessions.csv"), index=False)
+    logger.info(f"Wrote canonical programs and sessions to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import collections
+import logging
+import queue
+import threading
+import time
+# selenium and webdriver_manager are imported when the first browser is configured
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+def build_chrome_options(headless=False, network_log=False):
+    """Chrome options shared by every scraper browser.
+
+    network_log turns on Chrome's performance log, whose Network.* events list every
+    request the page makes (see fixture_server.record_page_traffic).
+    """
+    from selenium.webdriver.chrome.options import Options
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
+    else:
+        chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    if network_log:
+        chrome_options.set_capability("goog:loggingPrefs", {'performance': 'ALL'})
+    return chrome_options
+
+def create_chrome_driver(driver_path=None, headless=False, network_log=False):
+    """Starts one Chrome browser, resolving the chromedriver binary if no path is given."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    if driver_path is None:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+    return webdriver.Chrome(service=Service(driver_path), options=build_chrome_options(headless, network_log))
+
+class DriverPool:
+    """A fixed-size pool of reusable Chrome browsers.
+
+    The chromedriver binary is resolved once for the whole pool. Browsers are started
+    lazily up to `size`, health-checked before they are handed out, and replaced after
+    `max_pages_per_driver` uses or as soon as a caller reports them broken.
+
+    Usage:
+        with DriverPool(size=3) as pool:
+            driver = pool.acquire()
+            try:
+                driver.get(url)
+            finally:
+                pool.release(driver)
+    """
+
+    def __init__(self, size=2, max_pages_per_driver=20, headless=True, acquire_timeout=600, driver_path=None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.headless = headless
+        self.acquire_timeout = acquire_timeout
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+        # Signalled whenever a browser is released or discarded, so a waiter can take it or start a replacement
+        self._available = threading.Condition(self._lock)
+        self._driver_path = driver_path  # Resolved with webdriver_manager on first use if not given
+        self._pages = {}  # id(driver) -> pages served by that browser
+        self._started = 0
+        self._closed = False
+        self.stats = {'started': 0, 'recycled': 0, 'crashed': 0}
+
+    def _resolve_driver_path(self):
+        with self._lock:
+            if self._driver_path is None:
+                logger.info("Resolving chromedriver binary for the pool...")
+                from webdriver_manager.chrome import ChromeDriverManager
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def _start_driver(self):
+        driver = create_chrome_driver(self._resolve_driver_path(), headless=self.headless)
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.stats['started'] += 1
+        logger.info(f"Started pooled Chrome driver ({self.stats['started']} started so far)")
+        return driver
+
+    def _discard(self, driver):
+        with self._available:
+            self._pages.pop(id(driver), None)
+            self._started -= 1
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting pooled driver: {e}")
+
+    @staticmethod
+    def is_healthy(driver):
+        """Returns True if the browser still answers a trivial script call."""
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """Hands out a healthy browser, starting one if the pool is below its size.
+
+        Raises:
+            RuntimeError: If the pool is closed.
+            queue.Empty: If no browser frees up within `acquire_timeout` seconds.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            driver = None
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        driver = self._idle.popleft()
+                        break
+                    # Below size again after a discard: start a replacement instead of waiting
+                    if self._started < self.size:
+                        self._started += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty(f"No pooled driver freed up within {self.acquire_timeout}s")
+                    self._available.wait(remaining)
+
+            if driver is None:
+                try:
+                    return self._start_driver()
+                except Exception:
+                    with self._available:
+                        self._started -= 1
+                        self._available.notify()
+                    raise
+
+            if self.is_healthy(driver):
+                return driver
+            logger.warning("Pooled driver failed its health check; replacing it.")
+            with self._lock:
+                self.stats['crashed'] += 1
+            self._discard(driver)
+
+    def release(self, driver, broken=False):
+        """Returns a browser to the pool after one page of work.
+
+        Args:
+            driver: A driver obtained from `acquire`.
+            broken (bool): True if the caller saw the browser crash; it is replaced.
+        """
+        with self._available:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+            if broken:
+                self.stats['crashed'] += 1
+            elif self._closed or pages >= self.max_pages_per_driver:
+                if not self._closed:
+                    self.stats['recycled'] += 1
+            else:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+
+        if not broken and not self._closed:
+            logger.info(f"Recycling pooled driver after {pages} pages")
+        self._discard(driver)
+
+    def close(self):
+        """Quits every idle browser; browsers still checked out are quit on release."""
+        with self._available:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            # Waiters wake up and see the pool is closed
+            self._available.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
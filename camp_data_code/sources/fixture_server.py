@@ -0,0 +1,237 @@
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+TRAFFIC_FILENAME = "traffic.json"
+
+def request_key(url):
+    """Fixture key for a URL: its path and query, so recordings replay under any host."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+def _load_index(fixtures_dir):
+    index_path = os.path.join(fixtures_dir, INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_fixture(fixtures_dir, url, body, status=200, content_type="application/json"):
+    """Stores one response body under fixtures_dir and records it in index.json."""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    key = request_key(url)
+    filename = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + ".body"
+    with open(os.path.join(fixtures_dir, filename), 'wb') as f:
+        f.write(body)
+
+    index = _load_index(fixtures_dir)
+    index[key] = {'file': filename, 'status': status, 'content_type': content_type}
+    with open(os.path.join(fixtures_dir, INDEX_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    return key
+
+class RecordingSession:
+    """Wraps a requests session and saves every GET response as a fixture.
+
+    Pass it as `session=` to source_registry.PageFetcher to capture a full run of static sources.
+    """
+
+    def __init__(self, session, fixtures_dir):
+        self.session = session
+        self.fixtures_dir = fixtures_dir
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        response = self.session.get(url, **kwargs)
+        content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        with self._lock:
+            save_fixture(self.fixtures_dir, url, response.content, response.status_code, content_type)
+        logger.info(f"Recorded {response.status_code} {url}")
+        return response
+
+    def close(self):
+        self.session.close()
+
+class FixtureServer:
+    """Serves recorded fixtures from a local HTTP server on a background thread.
+
+    Requests are matched on path and query; anything not recorded gets a 404.
+
+    Usage:
+        with FixtureServer("fixtures/lifetime_plano") as server:
+            scrape_lifetime_camps(server.base_url + "/clubs/tx/plano/camps.html")
+    """
+
+    def __init__(self, fixtures_dir, host="127.0.0.1", port=0):
+        self.fixtures_dir = fixtures_dir
+        self.index = _load_index(fixtures_dir)
+        self.requests_served = 0
+        fixture_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real site
+            disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+            def do_GET(self):
+                entry = fixture_server.index.get(self.path)
+                if entry is None:
+                    self.send_error(404, "No fixture recorded for this request")
+                    return
+                with open(os.path.join(fixture_server.fixtures_dir, entry['file']), 'rb') as f:
+                    body = f.read()
+                fixture_server.requests_served += 1
+                self.send_response(entry.get('status', 200))
+                self.send_header('Content-Type', entry.get('content_type', 'application/octet-stream'))
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Fixture server: {format % args}")
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Serving {len(self.index)} fixtures from {self.fixtures_dir} at {self.base_url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+# --- Recording a page's own traffic ---
+def xhr_responses(log_entries):
+    """The XHR/fetch responses in a Chrome performance log, in the order they arrived."""
+    methods = {}
+    responses = []
+    for entry in log_entries:
+        message = json.loads(entry['message'])['message']
+        params = message.get('params', {})
+        if message.get('method') == "Network.requestWillBeSent":
+            methods[params['requestId']] = params['request']['method']
+        elif message.get('method') == "Network.responseReceived" and params.get('type') in ("XHR", "Fetch"):
+            response = params['response']
+            responses.append({
+                'request_id': params['requestId'],
+                'method': methods.get(params['requestId'], "GET"),
+                'url': response['url'],
+                'status': response['status'],
+                'content_type': response.get('mimeType') or "application/octet-stream",
+            })
+    return responses
+
+def record_page_traffic(url, fixtures_dir, driver_path=None, headless=True, open_details=True):
+    """Loads a Lifetime club camps page in Chrome and records the data the page itself fetches.
+
+    The rendered page and every GET XHR/fetch response it makes (while loading, and
+    while each card's "More Details" dialog is open) are saved as fixtures, and
+    traffic.json lists every request with its method and full URL. Those recordings,
+    not guesses, are what an HTTP client for the camps data has to be built from.
+
+    Returns:
+        list: The recorded requests, as written to traffic.json.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from .driver_pool import create_chrome_driver
+    from .web_scrape import (LIFETIME_LIST_SELECTOR, CARD_SNAPSHOT_JS, CARD_SNAPSHOT_ARGS, open_details_modal,
+                             close_details_modal)
+
+    recorded = []
+    driver = create_chrome_driver(driver_path, headless=headless, network_log=True)
+
+    def save_new_responses():
+        # Bodies are read right away: Chrome only keeps them buffered for a while
+        for response in xhr_responses(driver.get_log('performance')):
+            request_id = response.pop('request_id')
+            response['fixture'] = None
+            if response['method'] == "GET":
+                try:
+                    body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                    data = base64.b64decode(body['body']) if body.get('base64Encoded') else body['body'].encode('utf-8')
+                    response['fixture'] = save_fixture(fixtures_dir, response['url'], data, response['status'],
+                                                       response['content_type'])
+                    logger.info(f"Recorded {response['status']} {response['url']}")
+                except Exception as e:
+                    logger.warning(f"Could not read the body of {response['url']}: {e}")
+            recorded.append(response)
+
+    try:
+        driver.get(url)
+        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.CSS_SELECTOR, LIFETIME_LIST_SELECTOR)))
+        save_fixture(fixtures_dir, url, driver.page_source.encode('utf-8'), content_type="text/html; charset=utf-8")
+        save_new_responses()
+        cards = driver.execute_script(CARD_SNAPSHOT_JS, *CARD_SNAPSHOT_ARGS) if open_details else []
+        for index, card in enumerate(cards):
+            name = card.get('name') or f"card {index + 1}"
+            try:
+                open_details_modal(driver, None, index, "snapshot")
+                close_details_modal(driver, name)
+            except Exception as e:
+                logger.warning(f"Could not open the details of {name}: {e}")
+            save_new_responses()
+    finally:
+        driver.quit()
+        os.makedirs(fixtures_dir, exist_ok=True)
+        with open(os.path.join(fixtures_dir, TRAFFIC_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(recorded, f, indent=2)
+    return recorded
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Record or replay Lifetime camps page fixtures.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser(
+        "record", help="Load a club camps page in Chrome and save it with every XHR/fetch response it makes")
+    record_parser.add_argument("url", help="Club camps page URL")
+    record_parser.add_argument("fixtures_dir")
+    record_parser.add_argument("--chromedriver", help="chromedriver binary (default: resolved with webdriver_manager)")
+    record_parser.add_argument("--no-details", action="store_true", help="Do not open each card's details dialog")
+    record_parser.add_argument("--show", action="store_true", help="Run Chrome with a visible window")
+    serve_parser = subparsers.add_parser("serve", help="Replay saved fixtures on a local port")
+    serve_parser.add_argument("fixtures_dir")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        recorded = record_page_traffic(args.url, args.fixtures_dir, driver_path=args.chromedriver,
+                                       headless=not args.show, open_details=not args.no_details)
+        logger.info(f"Recorded the page and {len(recorded)} XHR/fetch requests into {args.fixtures_dir} "
+                    f"(see {TRAFFIC_FILENAME})")
+    else:
+        server = FixtureServer(args.fixtures_dir, port=args.port).start()
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+import argparse
+import csv
+import hashlib
+import heapq
+import logging
+import math
+import os
+import re
+import sqlite3
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(BASE_DIR, "camp_data_1.1")
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".scrape_state", "geocode_cache.sqlite")
+
+EARTH_RADIUS_MILES = 3958.8
+DEFAULT_STATE = "TX"
+# (min lat, min lon, max lat, max lon) around the DFW metroplex the catalog serves; place names
+# outside it ("Austin", "West", "Center") are never candidates
+SERVICE_AREA_BOUNDS = (32.0, -98.0, 34.0, -96.0)
+
+# USPS street suffix and directional abbreviations, so "5008 Roberts Road" and "5008 ROBERTS RD" share a cache entry
+STREET_ABBREVIATIONS = {
+    'AVENUE': 'AVE', 'BOULEVARD': 'BLVD', 'CIRCLE': 'CIR', 'COURT': 'CT', 'DRIVE': 'DR', 'EXPRESSWAY': 'EXPY',
+    'FREEWAY': 'FWY', 'HIGHWAY': 'HWY', 'LANE': 'LN', 'PARKWAY': 'PKWY', 'PLACE': 'PL', 'ROAD': 'RD',
+    'SQUARE': 'SQ', 'STREET': 'ST', 'SUITE': 'STE', 'TERRACE': 'TER', 'TRAIL': 'TRL', 'TOLLWAY': 'TOLLWAY',
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+}
+STATE_ZIP_PATTERN = re.compile(r"\b([A-Z]{2})\s+(\d{5})(?:-\d{4})?\s*$")
+ZIP_PATTERN = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+# --- Address normalization ---
+def normalize_address(address):
+    """Canonical form of a free-text address plus the parts the gazetteers use.
+
+    Returns:
+        dict: normalized (cache key), zip, state, city (the comma-separated part before
+        "ST 12345", or None) for e.g. "NTPA - Dallas, 12300 Inwood Rd. 112, Dallas, TX 75244".
+    """
+    text = str(address or "").upper()
+    text = re.sub(r"\([^)]*\)", " ", text)           # "Dallas (ESD)" -> "Dallas"
+    text = re.sub(r"[^\w\s,#-]", " ", text)           # drop periods, @, etc.
+    parts = []
+    for part in text.split(","):
+        words = [STREET_ABBREVIATIONS.get(word, word) for word in part.split()]
+        if words:
+            parts.append(" ".join(words))
+    normalized = ", ".join(parts)
+
+    state = zip_code = city = None
+    match = STATE_ZIP_PATTERN.search(normalized)
+    if match:
+        state, zip_code = match.group(1), match.group(2)
+        before = normalized[:match.start()].rstrip(", ")
+        city = before.rsplit(",", 1)[-1].strip() or None
+        if city and city[0].isdigit():
+            # "6500 PRESTON RD 101 FRISCO TX 75034": no comma between street and city
+            city = city.split()[-1]
+    else:
+        zip_match = ZIP_PATTERN.search(normalized)
+        zip_code = zip_match.group(1) if zip_match else None
+    return {'normalized': normalized, 'zip': zip_code, 'state': state, 'city': city}
+
+# --- Gazetteers ---
+def _read_gazetteer(path):
+    """Rows of a Census Gazetteer file (tab-separated, header padded with spaces)."""
+    with open(path, encoding='utf-8', errors='replace', newline='') as f:
+        reader = csv.reader(f, delimiter='\t')
+        header = [name.strip() for name in next(reader)]
+        for values in reader:
+            yield dict(zip(header, (value.strip() for value in values)))
+
+def _centroids_digest(label, centroids):
+    """Short content hash of a gazetteer, so cached results can tell gazetteer sets apart."""
+    digest = hashlib.sha256(label.encode('utf-8'))
+    for name, (lat, lon) in sorted(centroids.items()):
+        digest.update(f"\n{name}\t{lat:.6f}\t{lon:.6f}".encode('utf-8'))
+    return f"{label}:{digest.hexdigest()[:12]}"
+
+class ZipGazetteer:
+    """ZIP code -> centroid, from the Census ZCTA Gazetteer file (e.g. 2024_Gaz_zcta_national.txt).
+
+    ZCTAs approximate ZIP codes; the internal point is used as the centroid.
+    """
+
+    precision = 'zip'
+
+    def __init__(self, centroids):
+        self.centroids = centroids
+
+    @classmethod
+    def from_file(cls, path):
+        centroids = {row['GEOID']: (float(row['INTPTLAT']), float(row['INTPTLONG'])) for row in _read_gazetteer(path)}
+        logger.info(f"Loaded {len(centroids)} ZIP centroids from {path}")
+        return cls(centroids)
+
+    def signature(self):
+        return _centroids_digest(self.precision, self.centroids)
+
+    def locate(self, parsed):
+        return self.centroids.get(parsed['zip']) if parsed['zip'] else None
+
+class PlaceGazetteer:
+    """City name -> centroid for one state, from the Census Places Gazetteer (e.g. 2024_Gaz_place_48.txt).
+
+    Used for locations without a ZIP, and only where the city is explicit: the last
+    comma-separated part ("Lifetime Fitness, Frisco"), the part before the state
+    ("Frisco, TX"), or a location that is just a city name ("Plano"). Place names in
+    free text are never guessed at: "Austin Elementary" is a school, not the city of Austin.
+    Only places inside `bounds` (the service area) are candidates.
+    """
+
+    precision = 'city'
+    SUFFIXES = re.compile(r"\s+(CITY|TOWN|VILLAGE|CDP|BOROUGH)$")
+
+    def __init__(self, centroids, state=DEFAULT_STATE, bounds=SERVICE_AREA_BOUNDS):
+        min_lat, min_lon, max_lat, max_lon = bounds
+        self.centroids = {name: (lat, lon) for name, (lat, lon) in centroids.items()
+                          if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon}
+        self.state = state
+        self.max_words = max((len(name.split()) for name in self.centroids), default=0)
+
+    @classmethod
+    def from_file(cls, path, state=DEFAULT_STATE, bounds=SERVICE_AREA_BOUNDS):
+        centroids = {}
+        for row in _read_gazetteer(path):
+            if row.get('USPS') == state:
+                name = cls.SUFFIXES.sub("", row['NAME'].upper())
+                centroids[name] = (float(row['INTPTLAT']), float(row['INTPTLONG']))
+        gazetteer = cls(centroids, state, bounds)
+        logger.info(f"Loaded {len(gazetteer.centroids)} {state} place centroids in the service area from {path}")
+        return gazetteer
+
+    def signature(self):
+        return _centroids_digest(f"{self.precision}-{self.state}", self.centroids)
+
+    def locate(self, parsed):
+        if parsed['state'] not in (None, self.state):
+            return None
+        city = parsed['city']
+        if city is None:
+            parts = [part.strip() for part in parsed['normalized'].split(",")]
+            if len(parts) > 1 and re.fullmatch(r"[A-Z]{2}", parts[-1]):
+                if parts[-1] != self.state:
+                    return None
+                parts = parts[:-1]
+            city = parts[-1]
+        if city in self.centroids:
+            return self.centroids[city]
+        if city and city[0].isdigit():
+            # "6500 PRESTON RD FRISCO, TX": a street address runs into the city; try its trailing words
+            words = city.split()
+            for size in range(min(self.max_words, len(words) - 1), 0, -1):
+                name = " ".join(words[-size:])
+                if name in self.centroids:
+                    return self.centroids[name]
+        return None
+
+# --- Cache ---
+class GeocodeCache:
+    """Persistent (gazetteer set, normalized address) -> (lat, lon, precision) map in SQLite.
+
+    Misses are cached too, but only for the gazetteer set that missed: adding a
+    gazetteer (e.g. --places) or loading a newer file resolves them afresh.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS geocodes_by_gazetteer (gazetteers TEXT, address TEXT, "
+                          "lat REAL, lon REAL, precision TEXT, resolved_at REAL, PRIMARY KEY (gazetteers, address))")
+
+    def get_many(self, addresses, gazetteers=""):
+        found = {}
+        addresses = list(addresses)
+        for start in range(0, len(addresses), 500):
+            batch = addresses[start:start + 500]
+            cursor = self.conn.execute(
+                "SELECT address, lat, lon, precision FROM geocodes_by_gazetteer "
+                f"WHERE gazetteers = ? AND address IN ({', '.join('?' * len(batch))})", [gazetteers] + batch)
+            for address, lat, lon, precision in cursor:
+                found[address] = None if lat is None else (lat, lon, precision)
+        return found
+
+    def put_many(self, results, gazetteers=""):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO geocodes_by_gazetteer VALUES (?, ?, ?, ?, ?, ?)",
+            [(gazetteers, address, *(result or (None, None, None)), now) for address, result in results.items()])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+class Geocoder:
+    """Resolves addresses offline through a chain of gazetteers, each distinct address once.
+
+    Usage:
+        geocoder = Geocoder([ZipGazetteer.from_file(zcta_path), PlaceGazetteer.from_file(place_path)])
+        points = geocoder.geocode_many(["NTPA - Dallas, 12300 Inwood Rd. 112, Dallas, TX 75244", "iCode, Plano"])
+    """
+
+    def __init__(self, gazetteers, cache=None):
+        self.gazetteers = gazetteers
+        self.cache = cache if cache is not None else GeocodeCache(":memory:")
+        # Cached results (and misses) are only reused by the same chain of gazetteers
+        self.signature = "|".join(gazetteer.signature() for gazetteer in gazetteers)
+
+    def geocode_many(self, addresses):
+        """Maps each address to (lat, lon, precision), or None if no gazetteer knows it."""
+        parsed = {address: normalize_address(address) for address in set(addresses)}
+        keys = {info['normalized'] for info in parsed.values()}
+        cached = self.cache.get_many(keys, self.signature)
+        resolved = {}
+        for info in parsed.values():
+            key = info['normalized']
+            if key in cached or key in resolved:
+                continue
+            resolved[key] = None
+            for gazetteer in self.gazetteers:
+                point = gazetteer.locate(info)
+                if point is not None:
+                    resolved[key] = (point[0], point[1], gazetteer.precision)
+                    break
+        if resolved:
+            self.cache.put_many(resolved, self.signature)
+        cached.update(resolved)
+        logger.info(f"Geocoded {len(parsed)} distinct addresses: {len(keys) - len(resolved)} from cache, "
+                    f"{sum(result is not None for result in resolved.values())} of {len(resolved)} new ones resolved")
+        return {address: cached[info['normalized']] for address, info in parsed.items()}
+
+    def geocode(self, address):
+        return self.geocode_many([address])[address]
+
+# --- Spatial index ---
+def _unit_vectors(lats, lons):
+    lat, lon = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lons, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+def _chord_for_miles(miles):
+    return 2 * math.sin(min(miles / EARTH_RADIUS_MILES, math.pi) / 2)
+
+def _miles_for_chord(chord):
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(chord / 2, 1.0))
+
+class SpatialIndex:
+    """Static k-d tree over points on the sphere.
+
+    Points are stored as 3-D unit vectors, where straight-line (chord) distance is
+    monotonic in great-circle distance, so the tree needs no special cases at the
+    antimeridian or the poles. Leaves hold up to `leaf_size` points and are scanned
+    with NumPy.
+
+    Usage:
+        index = SpatialIndex(lats, lons)
+        ids, miles = index.within(33.07, -96.82, 10)
+        ids, miles = index.nearest(33.07, -96.82, k=5)
+    """
+
+    def __init__(self, lats, lons, leaf_size=32):
+        points = _unit_vectors(lats, lons)
+        self.size = len(points)
+        self.leaf_size = leaf_size
+        self.order = np.arange(self.size)
+        # Node arrays: [start, end) into self.order, children (-1 for leaves) and bounding boxes
+        self.starts, self.ends, self.lefts, self.rights, self.lows, self.highs = [], [], [], [], [], []
+        if self.size:
+            self._build(points, 0, self.size)
+        self.points = points[self.order]
+
+    def _build(self, points, start, end):
+        node = len(self.starts)
+        members = self.order[start:end]
+        box = points[members]
+        low, high = box.min(axis=0), box.max(axis=0)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lefts.append(-1)
+        self.rights.append(-1)
+        self.lows.append(tuple(low.tolist()))
+        self.highs.append(tuple(high.tolist()))
+        if end - start > self.leaf_size:
+            axis = int(np.argmax(high - low))
+            middle = (end - start) // 2
+            split = np.argpartition(box[:, axis], middle)
+            self.order[start:end] = members[split]
+            self.lefts[node] = self._build(points, start, start + middle)
+            self.rights[node] = self._build(points, start + middle, end)
+        return node
+
+    def _box_distances(self, node, target):
+        """Squared chord distances from target to the nearest and farthest corner of a node's box."""
+        near = far = 0.0
+        for low, high, value in zip(self.lows[node], self.highs[node], target):
+            near += max(low - value, value - high, 0.0) ** 2
+            far += max(value - low, high - value) ** 2
+        return near, far
+
+    def within(self, lat, lon, miles):
+        """Indices of the points within `miles` of (lat, lon) and their distances, nearest first."""
+        if not self.size:
+            return np.empty(0, dtype=int), np.empty(0)
+        target = _unit_vectors([lat], [lon])[0]
+        radius = _chord_for_miles(miles)
+        limit = radius * radius
+        target_tuple = tuple(target.tolist())
+        # Collect [start, end) ranges of self.points: whole subtrees inside the radius, leaves that cross it
+        inside, crossing = [], []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            near, far = self._box_distances(node, target_tuple)
+            if near > limit:
+                continue
+            if far <= limit:
+                inside.append((self.starts[node], self.ends[node]))
+            elif self.lefts[node] < 0:
+                crossing.append((self.starts[node], self.ends[node]))
+            else:
+                stack.extend((self.lefts[node], self.rights[node]))
+        positions = [np.arange(start, end) for start, end in inside + crossing]
+        if not positions:
+            return np.empty(0, dtype=int), np.empty(0)
+        positions = np.concatenate(positions)
+        chords = np.linalg.norm(self.points[positions] - target, axis=1)
+        hits = chords <= radius
+        positions, chords = positions[hits], chords[hits]
+        order = np.argsort(chords, kind='stable')
+        return self.order[positions[order]], _miles_for_chord(chords[order])
+
+    def nearest(self, lat, lon, k=10):
+        """The k points nearest to (lat, lon) and their distances, nearest first (best-first search)."""
+        if not self.size or k <= 0:
+            return np.empty(0, dtype=int), np.empty(0)
+        target = _unit_vectors([lat], [lon])[0]
+        target_tuple = tuple(target.tolist())
+        best = []  # max-heap of (-chord, id)
+        queue = [(0.0, 0)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if len(best) == k and distance > -best[0][0]:
+                break
+            if self.lefts[node] < 0:
+                start, end = self.starts[node], self.ends[node]
+                chords = np.linalg.norm(self.points[start:end] - target, axis=1)
+                for chord, point_id in zip(chords.tolist(), self.order[start:end].tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-chord, point_id))
+                    elif chord < -best[0][0]:
+                        heapq.heapreplace(best, (-chord, point_id))
+            else:
+                for child in (self.lefts[node], self.rights[node]):
+                    heapq.heappush(queue, (math.sqrt(self._box_distances(child, target_tuple)[0]), child))
+        best.sort(reverse=True)
+        ids = np.array([point_id for _, point_id in best], dtype=int)
+        return ids, _miles_for_chord(np.array([-chord for chord, _ in best]))
+
+class SessionLocator:
+    """Radius and nearest-neighbour search over camp sessions by their Location text.
+
+    Sessions whose address cannot be resolved are left out of the index and counted
+    in `unresolved`.
+    """
+
+    def __init__(self, locations, geocoder):
+        points = geocoder.geocode_many(locations)
+        self.session_ids = np.array([index for index, location in enumerate(locations) if points[location]])
+        resolved = [points[locations[index]] for index in self.session_ids]
+        self.precisions = [point[2] for point in resolved]
+        self.unresolved = len(locations) - len(self.session_ids)
+        self.index = SpatialIndex([point[0] for point in resolved], [point[1] for point in resolved])
+
+    def within(self, lat, lon, miles):
+        ids, distances = self.index.within(lat, lon, miles)
+        return self.session_ids[ids] if len(ids) else ids, distances
+
+    def nearest(self, lat, lon, k=10):
+        ids, distances = self.index.nearest(lat, lon, k)
+        return self.session_ids[ids] if len(ids) else ids, distances
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Geocode camp locations offline and search them by distance.")
+    parser.add_argument("--zcta", required=True, help="Census ZCTA Gazetteer file (2024_Gaz_zcta_national.txt)")
+    parser.add_argument("--places", help="Census Places Gazetteer file for city-level fallback")
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--near", help="Address or ZIP to search from")
+    parser.add_argument("--miles", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    from .normalize import read_sources, normalize_camps
+    camps = normalize_camps(read_sources(DATA_DIR))
+    gazetteers = [ZipGazetteer.from_file(args.zcta)]
+    if args.places:
+        gazetteers.append(PlaceGazetteer.from_file(args.places))
+    cache = GeocodeCache(args.cache)
+    geocoder = Geocoder(gazetteers, cache)
+    locations = camps['location'].astype(object).fillna("").astype(str).tolist()
+    locator = SessionLocator(locations, geocoder)
+    logger.info(f"Indexed {len(locator.session_ids)} sessions; {locator.unresolved} have no resolvable location")
+
+    if args.near:
+        origin = geocoder.geocode(args.near)
+        if origin is None:
+            logger.error(f"Could not locate {args.near}")
+        else:
+            ids, distances = locator.within(origin[0], origin[1], args.miles)
+            for session, distance in zip(ids, distances):
+                row = camps.iloc[session]
+                label = " ".join(f"{row['organization']} - {row['camp_name']} ({row['location']})".split())
+                print(f"{distance:5.1f} mi  {label}")
+    cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PER_HOST = 2
+DEFAULT_MIN_INTERVAL = 1.0
+
+class _HostState:
+    def __init__(self, limit):
+        self.slots = threading.BoundedSemaphore(limit)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.requests = 0
+        self.waited = 0.0
+
+class HostScheduler:
+    """Politeness limits for every request made by the source scrapers.
+
+    A request holds one of `max_concurrency` global slots and one of its host's
+    `per_host` slots, and starts at least `min_interval` seconds after the previous
+    request to the same host started. Per-host overrides take a dict with any of
+    'per_host' and 'min_interval'. Slots are taken in that order (host, then
+    global), so a request queued behind a slow host never holds a global slot that
+    another host could use.
+
+    Usage:
+        scheduler = HostScheduler(max_concurrency=8, per_host=2, min_interval=1.0)
+        with scheduler.slot("https://my.lifetime.life/clubs/tx/plano/camps.html"):
+            response = session.get(url)
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, per_host=DEFAULT_PER_HOST,
+                 min_interval=DEFAULT_MIN_INTERVAL, host_overrides=None):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.host_overrides = host_overrides or {}
+        self._global = threading.BoundedSemaphore(max_concurrency)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                limit = self.host_overrides.get(host, {}).get('per_host', self.per_host)
+                state = self._hosts[host] = _HostState(limit)
+            return state
+
+    def _interval(self, host):
+        return self.host_overrides.get(host, {}).get('min_interval', self.min_interval)
+
+    @contextmanager
+    def slot(self, url):
+        """Blocks until a request to url may start, and holds its slots until the block exits."""
+        host = urlsplit(url).netloc.lower()
+        state = self._host_state(host)
+        queued = time.monotonic()
+        state.slots.acquire()
+        try:
+            # Reserve the next start time for this host, then sleep outside the lock
+            with state.lock:
+                start_at = max(time.monotonic(), state.next_start)
+                state.next_start = start_at + self._interval(host)
+            delay = start_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._global:
+                with state.lock:
+                    state.requests += 1
+                    state.waited += time.monotonic() - queued
+                yield
+        finally:
+            state.slots.release()
+
+    def stats(self):
+        """Requests made and total seconds spent waiting for a slot, per host."""
+        with self._lock:
+            return {host: {'requests': state.requests, 'waited': round(state.waited, 2)}
+                    for host, state in sorted(self._hosts.items())}
@@ -0,0 +1,19 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .driver_pool import USER_AGENT
+
+def create_http_session(pool_size=10, max_retries=3, backoff_factor=0.5):
+    """A keep-alive requests session with a connection pool sized for concurrent page fetches."""
+    session = requests.Session()
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'application/json'})
+    return session
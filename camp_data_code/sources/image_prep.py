@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from PIL import Image, ImageChops, ImageStat
+
+logger = logging.getLogger(__name__)
+
+# --- Defaults ---
+LONG_EDGE = 1600             # Longest side sent to the model, after tiling
+MAX_ASPECT = 2.0             # Pages taller than MAX_ASPECT * width are split into tiles
+TILE_OVERLAP = 48            # Pixels shared by neighbouring tiles so no text line is cut in half
+CROP_TOLERANCE = 16          # Max per-channel difference from the background colour that still counts as margin
+CROP_MARGIN = 8              # Pixels of background kept around the content
+GRAYSCALE_TOLERANCE = 4.0    # Max mean chroma for a page to be sent as grayscale
+PALETTE_TOLERANCE = 3.0      # Max RMS error of the 256-colour version for it to replace RGB
+HASH_SIZE = 16               # dHash grid; 256-bit hashes tell apart pages that merely share a layout
+DUPLICATE_DISTANCE = 12      # Max Hamming distance between dHashes of near-duplicate tiles
+
+def flatten(image, background=(255, 255, 255)):
+    """Drops transparency by compositing onto a white page, so the model sees what a viewer would."""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        page = Image.new('RGB', rgba.size, background)
+        page.paste(rgba, mask=rgba.getchannel('A'))
+        return page
+    return image
+
+def autocrop(image, tolerance=CROP_TOLERANCE, margin=CROP_MARGIN):
+    """Crops the uniform margin around the content. The top-left pixel is taken as the background colour.
+
+    Returns None for an image that is blank.
+    """
+    rgb = image.convert('RGB')
+    background = Image.new('RGB', rgb.size, rgb.getpixel((0, 0)))
+    mask = ImageChops.difference(rgb, background).convert('L').point(lambda value: 255 if value > tolerance else 0)
+    box = mask.getbbox()
+    if box is None:
+        return None
+    left, top, right, bottom = box
+    box = (max(0, left - margin), max(0, top - margin),
+           min(image.width, right + margin), min(image.height, bottom + margin))
+    return image if box == (0, 0, image.width, image.height) else image.crop(box)
+
+def split_tiles(image, max_aspect=MAX_ASPECT, overlap=TILE_OVERLAP):
+    """Splits a tall page into overlapping tiles no taller than max_aspect * width."""
+    tile_height = int(image.width * max_aspect)
+    if image.height <= tile_height:
+        return [image]
+    tiles = []
+    top = 0
+    while True:
+        bottom = min(image.height, top + tile_height)
+        tiles.append(image.crop((0, top, image.width, bottom)))
+        if bottom == image.height:
+            return tiles
+        top = bottom - overlap
+
+def downscale(image, long_edge=LONG_EDGE):
+    """Shrinks an image so its longest side is at most long_edge (never enlarges)."""
+    scale = long_edge / max(image.size)
+    if scale >= 1:
+        return image
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+def reduce_colors(image, grayscale_tolerance=GRAYSCALE_TOLERANCE, palette_tolerance=PALETTE_TOLERANCE):
+    """Returns the cheapest mode that is visually lossless: 'L' for near-gray pages, 'P' for flat colour, else RGB."""
+    rgb = image.convert('RGB')
+    red, green, blue = rgb.split()
+    chroma = ImageChops.lighter(ImageChops.difference(red, green), ImageChops.difference(green, blue))
+    if ImageStat.Stat(chroma).mean[0] <= grayscale_tolerance:
+        return rgb.convert('L')
+    palette = rgb.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+    error = ImageStat.Stat(ImageChops.difference(rgb, palette.convert('RGB'))).rms
+    if max(error) <= palette_tolerance:
+        return palette
+    return rgb
+
+def dhash(image, hash_size=HASH_SIZE):
+    """Difference hash: one bit per horizontally adjacent pixel pair of a small grayscale thumbnail."""
+    pixels = image.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR).tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for column in range(hash_size):
+            value = (value << 1) | (pixels[offset + column] > pixels[offset + column + 1])
+    return value
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ImagePreprocessor:
+    """Shrinks flyer images before they are sent to the model.
+
+    Each source image is auto-cropped, split into tiles if it is a very tall page,
+    downscaled to `long_edge`, and stored as grayscale or palette PNG when that is
+    close enough to lossless. Results are cached on disk by the source file's hash
+    (plus the settings), so a flyer is only processed once. Within one request,
+    tiles that are near-duplicates (by dHash) of a tile from an earlier image are
+    dropped; tiles of the same page are always kept, however alike they look.
+
+    Usage:
+        preprocessor = ImagePreprocessor(".image_cache")
+        prepared_paths, report = preprocessor.prepare(["Sky lark/info1.png", "Sky lark/info2.png"])
+    """
+
+    def __init__(self, cache_dir, long_edge=LONG_EDGE, max_aspect=MAX_ASPECT, dedupe=True,
+                 duplicate_distance=DUPLICATE_DISTANCE):
+        self.cache_dir = cache_dir
+        self.long_edge = long_edge
+        self.max_aspect = max_aspect
+        self.dedupe = dedupe
+        self.duplicate_distance = duplicate_distance
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _settings(self):
+        return f"v1:{self.long_edge}:{self.max_aspect}:{CROP_TOLERANCE}:{GRAYSCALE_TOLERANCE}:{PALETTE_TOLERANCE}"
+
+    def _entry_dir(self, path):
+        key = hashlib.sha256(f"{file_sha256(path)}:{self._settings()}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _prepare_image(self, path, entry_dir):
+        """Returns the cache manifest for one source image, building it on a miss."""
+        manifest_path = os.path.join(entry_dir, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                return json.load(f), True
+
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".prep-")
+        tiles = []
+        with Image.open(path) as source:
+            source.load()
+            cropped = autocrop(flatten(source))
+            pieces = [] if cropped is None else split_tiles(cropped, self.max_aspect)
+            unchanged = len(pieces) == 1 and pieces[0] is source and max(source.size) <= self.long_edge
+            for number, piece in enumerate(pieces):
+                tile = reduce_colors(downscale(piece, self.long_edge))
+                tile_name = f"tile{number}.png"
+                tile.save(os.path.join(tmp_dir, tile_name), optimize=True)
+                tiles.append({'file': tile_name, 'width': tile.width, 'height': tile.height,
+                              'mode': tile.mode, 'dhash': format(dhash(tile), 'x')})
+            # Nothing to crop, scale or tile: keep the original if re-encoding made it bigger
+            if unchanged and os.path.getsize(os.path.join(tmp_dir, tiles[0]['file'])) >= os.path.getsize(path):
+                tile_name = "tile0" + os.path.splitext(path)[1].lower()
+                os.remove(os.path.join(tmp_dir, tiles[0]['file']))
+                shutil.copyfile(path, os.path.join(tmp_dir, tile_name))
+                tiles[0].update(file=tile_name, mode=source.mode)
+            manifest = {'source_bytes': os.path.getsize(path), 'source_pixels': source.width * source.height,
+                        'tiles': tiles}
+
+        with open(os.path.join(tmp_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another worker prepared the same image first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return manifest, False
+
+    def prepare(self, image_paths):
+        """Preprocesses the images of one flyer request.
+
+        Args:
+            image_paths (list): Source image files, in page order.
+
+        Returns:
+            tuple: (prepared image paths, report dict with source/prepared bytes and
+            pixels, tile, duplicate and blank page counts, and cache hits).
+
+        Raises:
+            ValueError: If every image is blank, so there is nothing to send.
+        """
+        prepared_paths = []
+        kept_hashes = []  # (source image index, dHash) of every tile kept so far
+        report = {'images': len(image_paths), 'source_bytes': 0, 'prepared_bytes': 0, 'source_pixels': 0,
+                  'prepared_pixels': 0, 'tiles': 0, 'duplicates_dropped': 0, 'blank_pages': 0, 'cache_hits': 0}
+        for source_index, path in enumerate(image_paths):
+            entry_dir = self._entry_dir(path)
+            manifest, cached = self._prepare_image(path, entry_dir)
+            report['cache_hits'] += cached
+            report['source_bytes'] += manifest['source_bytes']
+            report['source_pixels'] += manifest['source_pixels']
+            # A blank page crops away entirely and contributes no tiles
+            report['blank_pages'] += not manifest['tiles']
+            for tile in manifest['tiles']:
+                tile_hash = int(tile['dhash'], 16)
+                # Repeating layouts (a weekly schedule, identical session blocks) make a tall page's
+                # tiles hash alike, so only a tile from another image counts as a duplicate
+                if self.dedupe and any(kept_index != source_index
+                                       and bin(tile_hash ^ kept).count("1") <= self.duplicate_distance
+                                       for kept_index, kept in kept_hashes):
+                    report['duplicates_dropped'] += 1
+                    continue
+                kept_hashes.append((source_index, tile_hash))
+                tile_path = os.path.join(entry_dir, tile['file'])
+                prepared_paths.append(tile_path)
+                report['tiles'] += 1
+                report['prepared_bytes'] += os.path.getsize(tile_path)
+                report['prepared_pixels'] += tile['width'] * tile['height']
+
+        if not prepared_paths:
+            raise ValueError(f"Nothing to send: all {len(image_paths)} images are blank")
+        report['bytes_saved'] = report['source_bytes'] - report['prepared_bytes']
+        report['pixels_saved'] = report['source_pixels'] - report['prepared_pixels']
+        logger.info(f"Prepared {len(image_paths)} images into {report['tiles']} tiles "
+                    f"({report['duplicates_dropped']} duplicates, {report['blank_pages']} blank pages dropped): "
+                    f"{report['bytes_saved']:,} bytes and {report['pixels_saved']:,} pixels saved")
+        return prepared_paths, report
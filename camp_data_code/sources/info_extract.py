@@ -1,65 +1,311 @@
-from PIL import Image
-from google import genai
+import argparse
+import csv
+import hashlib
 import json
+import logging
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import StringIO
 
-# Initialize the Gemini client
-client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+logger = logging.getLogger(__name__)
 
-# Load the image of the tennis camp flyer
-#image = Image.open("sources/lakes_tennis_camps_2025.png") 
-image1= Image.open("sources/Sky lark/info1.png")
-image2= Image.open("sources/Sky lark/info2.png")
-image3= Image.open("sources/Sky lark/info3.png")
+DEFAULT_MODEL = "gemini-2.5-pro-exp-03-25"  # Using experimental version with free tier
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif')
+SOURCES_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Create the prompt to extract structured data
-extraction_prompt = """
-Please scan and read the tennis camp flyer in this image, and extract the information in CSV format with columns: 
-Organization, Camp Name, Start Date, End Date, Days, Start Time, End Time, Location, Age Range, Grade Range, 
+EXTRACTION_PROMPT = """
+Please scan and read the tennis camp flyer in this image, and extract the information in CSV format with columns:
+Organization, Camp Name, Start Date, End Date, Days, Start Time, End Time, Location, Age Range, Grade Range,
 Price, Description, Email, Contact Information.
 
 Note that each row should contain only one camp. Format your response as a valid CSV string that can be directly parsed.
 """
 
-# Send the request to Gemini
-response = client.models.generate_content(
-    model="gemini-2.5-pro-exp-03-25",  # Using experimental version with free tier
-    contents=[
-        image1,  # The flyer image
-        image2,  # The flyer image
-        image3,  # The flyer image
-        extraction_prompt  # Our detailed extraction request
-    ]
-)
-
-# Get the response text (CSV data)
-csv_data = response.text
-
-# Remove the ```csv line if it exists
-if csv_data.startswith("```csv"):
-    csv_data = csv_data.replace("```csv\n", "", 1)
-elif csv_data.startswith("```"):
-    csv_data = csv_data.replace("```\n", "", 1)
-
-# Save the CSV data to a file
-with open("lakes_tennis_camps_2025.csv", "w") as f:
-    f.write(csv_data)
-
-print("CSV data extracted and saved to lakes_tennis_camps_2025.csv")
-
-# Optional: Parse the CSV into a more workable format
-# This could be useful if you want to process the data further
-import csv
-from io import StringIO
+class RateLimitError(Exception):
+    """Raised by a backend when the model API asks us to slow down."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class GeminiBackend:
+    """Sends flyer images to Gemini. The client is only created on first use."""
+
+    def __init__(self, api_key=None, model=DEFAULT_MODEL):
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                from google import genai
+                from dotenv import load_dotenv
+                # Load environment variables from .env file
+                load_dotenv()
+                self._client = genai.Client(api_key=self.api_key or os.getenv("GOOGLE_API_KEY"))
+            return self._client
+
+    def generate(self, image_paths, prompt):
+        from PIL import Image
+        images = [Image.open(path) for path in image_paths]
+        try:
+            response = self._get_client().models.generate_content(model=self.model, contents=images + [prompt])
+        except Exception as e:
+            if _is_rate_limit(e):
+                raise RateLimitError(str(e), retry_after=_retry_after_seconds(str(e))) from e
+            raise
+        finally:
+            for image in images:
+                image.close()
+        return response.text
+
+class StubBackend:
+    """Offline stand-in for GeminiBackend.
+
+    Returns `response` (a string, or a callable taking the image paths) and can fail
+    the first `rate_limit_failures` calls with RateLimitError to exercise backoff.
+    """
+
+    def __init__(self, response="Organization,Camp Name\nStub Org,Stub Camp\n", model="stub",
+                 rate_limit_failures=0, latency=0.0):
+        self.response = response
+        self.model = model
+        self.rate_limit_failures = rate_limit_failures
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, image_paths, prompt):
+        with self._lock:
+            self.calls += 1
+            fail = self.rate_limit_failures > 0
+            if fail:
+                self.rate_limit_failures -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise RateLimitError("stub rate limit", retry_after=0.01)
+        return self.response(image_paths) if callable(self.response) else self.response
+
+def _is_rate_limit(error):
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    return code == 429 or "RESOURCE_EXHAUSTED" in str(error) or "429" in str(error)[:20]
+
+def _retry_after_seconds(message):
+    """Reads the server's suggested delay ("retryDelay": "31s" or "retry in 31.2s") if present."""
+    match = re.search(r"retry(?:Delay['\"]?:\s*['\"]|\s+in\s+)(\d+(?:\.\d+)?)s", message, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+def clean_csv_response(csv_data):
+    """Removes the ```csv fence the model likes to wrap its answer in."""
+    csv_data = csv_data.strip()
+    if csv_data.startswith("```csv"):
+        csv_data = csv_data.replace("```csv\n", "", 1)
+    elif csv_data.startswith("```"):
+        csv_data = csv_data.replace("```\n", "", 1)
+    if csv_data.endswith("```"):
+        csv_data = csv_data[:-3]
+    return csv_data.strip() + "\n"
+
+class ResponseCache:
+    """Content-addressed on-disk cache of model responses.
+
+    The key is a SHA-256 over every image's bytes, the prompt and the model name, so
+    renamed files still hit and any change to an image, the prompt or the model misses.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(image_paths, prompt, model):
+        digest = hashlib.sha256()
+        for path in image_paths:
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        digest.update(prompt.encode('utf-8'))
+        digest.update(b"\0" + model.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, text):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+class _RateLimitGate:
+    """Shared pause: when any worker is rate limited, every worker waits out the cooldown."""
+
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+def find_flyer_jobs(inputs):
+    """Builds (name, [image paths]) jobs from directories and manifests.
+
+    - A directory: each image directly inside is one flyer, and each subdirectory
+      holding images is one multi-page flyer (e.g. "Sky lark/info1.png".."info3.png").
+    - A .json manifest: [{"name": "...", "images": ["a.png", ...]}, ...], with image
+      paths relative to the manifest.
+    """
+    jobs = []
+    for source in inputs:
+        if os.path.isdir(source):
+            for entry in sorted(os.listdir(source)):
+                path = os.path.join(source, entry)
+                if os.path.isfile(path) and entry.lower().endswith(IMAGE_EXTENSIONS):
+                    jobs.append((os.path.splitext(entry)[0], [path]))
+                elif os.path.isdir(path):
+                    pages = sorted(os.path.join(path, name) for name in os.listdir(path)
+                                   if name.lower().endswith(IMAGE_EXTENSIONS))
+                    if pages:
+                        jobs.append((entry, pages))
+        else:
+            with open(source, encoding='utf-8') as f:
+                manifest = json.load(f)
+            base = os.path.dirname(os.path.abspath(source))
+            for item in manifest:
+                jobs.append((item['name'], [os.path.join(base, path) for path in item['images']]))
+    return jobs
+
+def extract_flyers(jobs, backend, cache=None, prompt=EXTRACTION_PROMPT, max_workers=4,
+                   max_retries=5, base_delay=2.0, max_delay=60.0, preprocessor=None):
+    """Runs flyer extractions concurrently and yields results as they complete.
+
+    Args:
+        jobs (list): (name, [image paths]) pairs, e.g. from find_flyer_jobs.
+        backend: GeminiBackend, StubBackend or anything with `model` and `generate(image_paths, prompt)`.
+        cache (ResponseCache): Serve unchanged flyers from disk without calling the backend.
+        max_workers (int): Requests in flight at once.
+        max_retries (int): Retries per flyer after a rate limit or transient error.
+        base_delay (float): First backoff delay in seconds; doubles per retry, with jitter.
+        preprocessor (ImagePreprocessor): Crop, shrink and tile images before they are sent.
+
+    Yields:
+        dict: name, images, csv (cleaned text or None), cached (bool), error (str or None),
+        prep (preprocessing report, or None).
+    """
+    gate = _RateLimitGate()
+
+    def run(job):
+        name, image_paths = job
+        prep = None
+
+        def result(csv_data, cached=False, error=None):
+            return {'name': name, 'images': job[1], 'csv': csv_data, 'cached': cached, 'error': error, 'prep': prep}
+
+        try:
+            if preprocessor is not None:
+                # The response cache is keyed on what is actually sent to the model
+                image_paths, prep = preprocessor.prepare(image_paths)
+            key = ResponseCache.key(image_paths, prompt, backend.model) if cache is not None else None
+            cached = cache.get(key) if cache is not None else None
+        except Exception as e:
+            # A missing or unreadable image fails this flyer only, not the whole batch
+            logger.error(f"Could not read the images of {name}: {e}")
+            return result(None, error=str(e))
+        if cached is not None:
+            return result(cached, cached=True)
+
+        for attempt in range(max_retries + 1):
+            gate.wait()
+            try:
+                text = clean_csv_response(backend.generate(image_paths, prompt))
+                if cache is not None:
+                    cache.put(key, text)
+                return result(text)
+            except Exception as e:
+                if attempt == max_retries:
+                    logger.error(f"Giving up on {name} after {attempt + 1} attempts: {e}")
+                    return result(None, error=str(e))
+                delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+                if isinstance(e, RateLimitError):
+                    delay = max(delay, e.retry_after or 0)
+                    gate.pause(delay)
+                    logger.warning(f"Rate limited on {name}; all workers pausing {delay:.1f}s")
+                else:
+                    logger.warning(f"Attempt {attempt + 1} for {name} failed ({e}); retrying in {delay:.1f}s")
+                    time.sleep(delay)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+def parse_csv_rows(csv_data):
+    """Parses an extraction result into a list of dicts."""
+    return list(csv.DictReader(StringIO(csv_data)))
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Extract camp rows from flyer images with Gemini.")
+    parser.add_argument("inputs", nargs="*", default=[os.path.join(SOURCES_DIR, "Sky lark")],
+                        help="Flyer directories and/or JSON manifests")
+    parser.add_argument("--output-dir", default=".", help="Where each flyer's CSV is written")
+    parser.add_argument("--cache-dir", default=os.path.join(SOURCES_DIR, ".extract_cache"))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub backend")
+    parser.add_argument("--no-preprocess", action="store_true", help="Send the original images unchanged")
+    args = parser.parse_args(argv)
 
-csv_reader = csv.DictReader(StringIO(csv_data))
-camps_data = list(csv_reader)
+    backend = StubBackend() if args.stub else GeminiBackend(model=args.model)
+    preprocessor = None
+    if not args.no_preprocess:
+        from .image_prep import ImagePreprocessor
+        preprocessor = ImagePreprocessor(os.path.join(args.cache_dir, "images"))
+    jobs = find_flyer_jobs(args.inputs)
+    logger.info(f"Extracting {len(jobs)} flyers with {args.workers} workers")
+    os.makedirs(args.output_dir, exist_ok=True)
+    failed = 0
+    for result in extract_flyers(jobs, backend, ResponseCache(args.cache_dir),
+                                 max_workers=args.workers, preprocessor=preprocessor):
+        if result['error']:
+            failed += 1
+            continue
+        # Save the CSV data to a file
+        output_path = os.path.join(args.output_dir, f"{result['name'].lower().replace(' ', '_')}.csv")
+        with open(output_path, "w", encoding='utf-8') as f:
+            f.write(result['csv'])
+        rows = parse_csv_rows(result['csv'])
+        print(f"{result['name']}: {len(rows)} camps {'(cached) ' if result['cached'] else ''}-> {output_path}")
+    if failed:
+        logger.error(f"{failed} of {len(jobs)} flyers failed")
+    return 1 if failed else 0
 
-# Example: Print the first camp entry as JSON
-if camps_data:
-    print("\nFirst camp entry:")
-    print(json.dumps(camps_data[0], indent=2))
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+import argparse
+import csv
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import time
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(BASE_DIR, "camp_data_1.1")
+MANUAL_DATA_DIR = os.path.join(BASE_DIR, "backend", "manual_data")
+ENV_FILE = os.path.join(BASE_DIR, "backend", ".env")
+
+SCHEMA = "csm"
+BATCH_SIZE = 500
+# Institutes and programs the loader creates are numbered above this (I50001, C50001, ...);
+# it only ever updates or deletes rows in that range, so hand-entered rows stay untouched
+LOADER_ID_START = 50000
+
+# Table -> (primary key columns, all columns), matching backend/manual_data/*.csv
+TABLES = {
+    'institutes': (('institute_id',), (
+        'institute_id', 'institute_nm', 'institute_info', 'institute_url', 'address', 'enroll_link')),
+    'programs': (('program_id',), (
+        'program_id', 'institute_id', 'program_nm', 'program_info', 'program_url',
+        'min_age', 'max_age', 'category', 'rating', 'image_url', 'featured')),
+    'camp_details': (('program_id', 'week_of'), ('program_id', 'week_of', 'price')),
+}
+
+# Columns the loader owns; everything else (URLs, ratings, images, featured) is curated by hand
+MANAGED_COLUMNS = {
+    'institutes': ('institute_nm', 'institute_info', 'address'),
+    'programs': ('institute_id', 'program_nm', 'program_info', 'min_age', 'max_age', 'category'),
+    'camp_details': ('price',),
+}
+
+# First match wins; the categories are the ones in the interests table
+CATEGORY_KEYWORDS = [
+    ('Technology', r"cod(e|ing)|robot|tech|minecraft|roblox|game design|python|scratch|computer|animation|blender|3d|stem"),
+    ('Science', r"scien|chem|physics|space|galactic|engineer|lab\b|experiment|vet|zoo|animal|dino"),
+    ('Music', r"music|band|sing|piano|guitar|choir|rock"),
+    ('Arts', r"\bart|drama|theat|paint|draw|dance|pottery|craft|act(ing)?\b|perform|film|clay|lego|doll"),
+    ('Sports', r"sport|tennis|swim|ninja|soccer|basketball|gym|athlet|fitness|pickleball"),
+    ('Nature', r"nature|outdoor|garden|wild|explor"),
+    ('Leadership', r"leader|counselor|entrepreneur|debate"),
+]
+
+SQLITE_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {SCHEMA}.institutes (institute_id TEXT PRIMARY KEY, institute_nm TEXT, "
+    "institute_info TEXT, institute_url TEXT, address TEXT, enroll_link TEXT)",
+    f"CREATE TABLE IF NOT EXISTS {SCHEMA}.programs (program_id TEXT PRIMARY KEY, institute_id TEXT, program_nm TEXT, "
+    "program_info TEXT, program_url TEXT, min_age INTEGER, max_age INTEGER, category TEXT, rating REAL, "
+    "image_url TEXT, featured INTEGER DEFAULT 0)",
+    f"CREATE TABLE IF NOT EXISTS {SCHEMA}.camp_details (program_id TEXT, week_of TEXT, price REAL, "
+    "PRIMARY KEY (program_id, week_of))",
+]
+
+def connect_sqlite(path=":memory:"):
+    """Local stand-in for the MySQL database: `path` is attached as the csm schema."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"ATTACH DATABASE ? AS {SCHEMA}", (path,))
+    for statement in SQLITE_DDL:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+def connect_mysql(env_file=ENV_FILE):
+    """Connects to the production database with the same settings as backend/db.js."""
+    import pymysql
+    from dotenv import load_dotenv
+    load_dotenv(env_file)
+    return pymysql.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_NAME"),
+        port=int(os.getenv("DB_PORT") or 3306),
+        charset="utf8mb4",
+        autocommit=False,
+    )
+
+def _placeholder(conn):
+    return "?" if isinstance(conn, sqlite3.Connection) else "%s"
+
+def _key(row, key_columns):
+    return tuple(row[column] for column in key_columns)
+
+def _db_value(value):
+    """Dates as the ISO text build_desired_state uses (pymysql returns DATE columns as datetime.date)."""
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value.isoformat() if isinstance(value, datetime.date) else value
+
+def fetch_table(conn, table):
+    """Current rows of a table, keyed by primary key."""
+    key_columns, columns = TABLES[table]
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {SCHEMA}.{table}")
+    rows = [dict(zip(columns, map(_db_value, values))) for values in cursor.fetchall()]
+    return {_key(row, key_columns): row for row in rows}
+
+def seed_from_manual_csvs(conn, manual_dir=MANUAL_DATA_DIR):
+    """Fills an empty stand-in database from the hand-maintained CSVs."""
+    for table, (_, columns) in TABLES.items():
+        with open(os.path.join(manual_dir, f"{table}.csv"), encoding='utf-8', errors='replace', newline='') as f:
+            rows = [{column: (row.get(column) or None) for column in columns} for row in csv.DictReader(f)]
+        for row in rows:
+            if table == 'camp_details' and row['week_of']:
+                month, day, year = row['week_of'].split('/')
+                row['week_of'] = f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+        _insert_rows(conn, table, rows)
+    conn.commit()
+
+def _id_number(row_id, prefix):
+    match = re.fullmatch(rf"{prefix}(\d+)", row_id or "")
+    return int(match.group(1)) if match else None
+
+def is_loader_owned(row_id, prefix):
+    """True for institute ("I") or program ("C") IDs in the loader's range."""
+    number = _id_number(row_id, prefix)
+    return number is not None and number > LOADER_ID_START
+
+def _next_id_factory(existing_ids, prefix):
+    numbers = [number for number in (_id_number(i, prefix) for i in existing_ids)
+               if number is not None and number > LOADER_ID_START]
+    counter = [max(numbers, default=LOADER_ID_START)]
+    def next_id():
+        counter[0] += 1
+        return f"{prefix}{counter[0]:05d}"
+    return next_id
+
+def categorize(text):
+    lowered = text.lower()
+    for category, pattern in CATEGORY_KEYWORDS:
+        if re.search(pattern, lowered):
+            return category
+    return None
+
+def _clean(value):
+    """None for pandas/NumPy missing values, plain Python types otherwise."""
+    if value is None or pd.isna(value):
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    return value.strip() if isinstance(value, str) else value
+
+def build_desired_state(normalized, current):
+    """Maps normalized sessions onto institute/program/week rows with stable IDs.
+
+    Args:
+        normalized (DataFrame): Output of normalize.normalize_camps.
+        current (dict): Table name -> rows keyed by primary key, from fetch_table.
+
+    Returns:
+        dict: Table name -> desired rows (loader-owned institutes/programs only) keyed by primary key.
+    """
+    institute_ids = {row['institute_nm']: key[0] for key, row in current['institutes'].items()
+                     if is_loader_owned(key[0], "I")}
+    program_ids = {(row['institute_id'], row['program_nm']): key[0] for key, row in current['programs'].items()
+                   if is_loader_owned(key[0], "C")}
+    next_institute_id = _next_id_factory([key[0] for key in current['institutes']], "I")
+    next_program_id = _next_id_factory([key[0] for key in current['programs']], "C")
+    # Organizations curated by hand keep their hand-entered programs and weeks only
+    manual_names = {row['institute_nm'] for key, row in current['institutes'].items()
+                    if not is_loader_owned(key[0], "I")}
+
+    sessions = normalized[['organization', 'camp_name', 'location', 'description', 'start_date',
+                           'min_age', 'max_age', 'price_per_week', 'price_per_day']].copy()
+    for column in ('organization', 'camp_name', 'location', 'description'):
+        sessions[column] = sessions[column].astype(str).str.strip()
+    sessions = sessions[(sessions['organization'] != "") & (sessions['camp_name'] != "")]
+    manual = sessions['organization'].isin(manual_names)
+    if manual.any():
+        skipped = sorted(sessions.loc[manual, 'organization'].unique())
+        logger.info(f"Skipping {int(manual.sum())} sessions of hand-curated institutes: {', '.join(skipped)}")
+        sessions = sessions[~manual]
+    sessions['price'] = sessions['price_per_week'].fillna(sessions['price_per_day'])
+    sessions['start_date'] = pd.to_datetime(sessions['start_date'])
+
+    institutes = {}
+    for organization, group in sessions.groupby('organization', sort=True, observed=True):
+        institute_id = institute_ids.get(organization) or next_institute_id()
+        institute_ids[organization] = institute_id
+        locations = group['location'][group['location'] != ""]
+        institutes[(institute_id,)] = {
+            'institute_id': institute_id,
+            'institute_nm': organization,
+            'institute_info': organization,
+            'address': locations.mode().iloc[0] if not locations.empty else None,
+        }
+
+    sessions['institute_id'] = sessions['organization'].map(institute_ids)
+    programs = {}
+    program_aggregates = sessions.groupby(['institute_id', 'camp_name'], sort=True, observed=True).agg(
+        program_info=('description', 'first'),
+        min_age=('min_age', 'min'),
+        max_age=('max_age', 'max'),
+        organization=('organization', 'first'),
+    )
+    for (institute_id, camp_name), aggregate in program_aggregates.iterrows():
+        program_id = program_ids.get((institute_id, camp_name)) or next_program_id()
+        program_ids[(institute_id, camp_name)] = program_id
+        programs[(program_id,)] = {
+            'program_id': program_id,
+            'institute_id': institute_id,
+            'program_nm': camp_name,
+            'program_info': aggregate['program_info'] or None,
+            'min_age': _clean(aggregate['min_age']),
+            'max_age': _clean(aggregate['max_age']),
+            'category': categorize(f"{camp_name} {aggregate['organization']}"),
+        }
+
+    sessions['program_id'] = [program_ids[key] for key in zip(sessions['institute_id'], sessions['camp_name'])]
+    sessions = sessions[sessions['start_date'].notna()]
+    sessions['week_of'] = sessions['start_date'].dt.strftime("%Y-%m-%d")
+    weeks = sessions.groupby(['program_id', 'week_of'], sort=True)['price'].min()
+    camp_details = {
+        (program_id, week_of): {'program_id': program_id, 'week_of': week_of, 'price': _clean(price)}
+        for (program_id, week_of), price in weeks.items()
+    }
+    return {'institutes': institutes, 'programs': programs, 'camp_details': camp_details}
+
+def diff_tables(current, desired):
+    """Inserts, updates and deletes that turn `current` into `desired` for the loader's rows.
+
+    Only loader-owned rows (IDs above LOADER_ID_START, see is_loader_owned) are in scope:
+    hand-entered institutes, programs and their weeks are never touched. Owned institutes,
+    programs and weeks that no longer appear in the scraped data are deleted, e.g. when a
+    source disappears from the corpus. Updates keep the hand-curated (unmanaged) columns.
+    """
+    scopes = {
+        'institutes': lambda key, row: is_loader_owned(key[0], "I"),
+        'programs': lambda key, row: is_loader_owned(key[0], "C"),
+        'camp_details': lambda key, row: is_loader_owned(key[0], "C"),
+    }
+
+    changes = {}
+    for table, (_, columns) in TABLES.items():
+        inserts, updates, deletes = [], [], []
+        for key, row in desired[table].items():
+            existing = current[table].get(key)
+            if existing is None:
+                inserts.append({column: row.get(column) for column in columns})
+            elif any(not _same_value(existing[column], row[column]) for column in MANAGED_COLUMNS[table]):
+                merged = dict(existing)
+                merged.update({column: row[column] for column in MANAGED_COLUMNS[table]})
+                updates.append(merged)
+        for key, row in current[table].items():
+            if key not in desired[table] and scopes[table](key, row):
+                deletes.append(key)
+        changes[table] = {'insert': inserts, 'update': updates, 'delete': deletes}
+    return changes
+
+def _same_value(old, new):
+    if old is None or new is None:
+        return old is None and new is None
+    if isinstance(old, (int, float)) or isinstance(new, (int, float)):
+        try:
+            return abs(float(old) - float(new)) < 0.005
+        except (TypeError, ValueError):
+            return False
+    return str(old) == str(new)
+
+def _insert_rows(conn, table, rows):
+    """Multi-row INSERT ... VALUES (...), (...) in batches of BATCH_SIZE."""
+    if not rows:
+        return
+    _, columns = TABLES[table]
+    placeholder = _placeholder(conn)
+    row_sql = "(" + ", ".join([placeholder] * len(columns)) + ")"
+    cursor = conn.cursor()
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        sql = f"INSERT INTO {SCHEMA}.{table} ({', '.join(columns)}) VALUES " + ", ".join([row_sql] * len(batch))
+        cursor.execute(sql, [row.get(column) for row in batch for column in columns])
+
+def _upsert_rows(conn, table, rows):
+    """Batched INSERT that updates the managed columns of rows whose primary key exists.
+
+    MySQL uses ON DUPLICATE KEY UPDATE with a row alias (8.0.19+) and SQLite ON CONFLICT
+    ... DO UPDATE, so changed rows are updated in place: no delete that a foreign key
+    would block or cascade.
+    """
+    if not rows:
+        return
+    key_columns, columns = TABLES[table]
+    placeholder = _placeholder(conn)
+    row_sql = "(" + ", ".join([placeholder] * len(columns)) + ")"
+    if isinstance(conn, sqlite3.Connection):
+        conflict_sql = (f" ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET "
+                        + ", ".join(f"{column} = excluded.{column}" for column in MANAGED_COLUMNS[table]))
+    else:
+        conflict_sql = (" AS new ON DUPLICATE KEY UPDATE "
+                        + ", ".join(f"{column} = new.{column}" for column in MANAGED_COLUMNS[table]))
+    cursor = conn.cursor()
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        sql = (f"INSERT INTO {SCHEMA}.{table} ({', '.join(columns)}) VALUES "
+               + ", ".join([row_sql] * len(batch)) + conflict_sql)
+        cursor.execute(sql, [row.get(column) for row in batch for column in columns])
+
+def _delete_keys(conn, table, keys):
+    """Batched DELETE ... WHERE (key columns) IN ((...), (...))."""
+    if not keys:
+        return
+    key_columns, _ = TABLES[table]
+    placeholder = _placeholder(conn)
+    key_sql = "(" + ", ".join([placeholder] * len(key_columns)) + ")"
+    cursor = conn.cursor()
+    for start in range(0, len(keys), BATCH_SIZE):
+        batch = keys[start:start + BATCH_SIZE]
+        sql = (f"DELETE FROM {SCHEMA}.{table} WHERE ({', '.join(key_columns)}) IN ("
+               + ", ".join([key_sql] * len(batch)) + ")")
+        cursor.execute(sql, [value for key in batch for value in key])
+
+def apply_changes(conn, changes):
+    """Applies a diff in one transaction: batched deletes, inserts and in-place upserts."""
+    try:
+        # Children first on the way out, parents first on the way in
+        for table in ('camp_details', 'programs', 'institutes'):
+            _delete_keys(conn, table, changes[table]['delete'])
+        for table in ('institutes', 'programs', 'camp_details'):
+            _insert_rows(conn, table, changes[table]['insert'])
+            _upsert_rows(conn, table, changes[table]['update'])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def load_camps(conn, normalized, dry_run=False):
+    """Diffs the normalized sessions against the database and applies the changes.
+
+    Returns:
+        dict: Table name -> {'insert': n, 'update': n, 'delete': n}.
+    """
+    started = time.perf_counter()
+    current = {table: fetch_table(conn, table) for table in TABLES}
+    desired = build_desired_state(normalized, current)
+    changes = diff_tables(current, desired)
+    counts = {table: {action: len(rows) for action, rows in actions.items()} for table, actions in changes.items()}
+    for table, table_counts in counts.items():
+        logger.info(f"{table}: {table_counts['insert']} inserts, {table_counts['update']} updates, "
+                    f"{table_counts['delete']} deletes")
+    if not dry_run:
+        apply_changes(conn, changes)
+    logger.info(f"{'Planned' if dry_run else 'Applied'} load in {time.perf_counter() - started:.2f}s")
+    return counts
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Load scraped camp sessions into the csm tables.")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory of scraped CSV/XLSX sources")
+    parser.add_argument("--normalized", help="Use an Arrow file written by normalize.py instead of --data-dir")
+    parser.add_argument("--sqlite", help="Load into this SQLite file (seeded from backend/manual_data) instead of MySQL")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the planned changes")
+    args = parser.parse_args(argv)
+
+    from .normalize import read_sources, normalize_camps, load_normalized
+    if args.normalized:
+        normalized = load_normalized(args.normalized).to_pandas()
+    else:
+        normalized = normalize_camps(read_sources(args.data_dir))
+
+    if args.sqlite:
+        is_new = not os.path.exists(args.sqlite)
+        conn = connect_sqlite(args.sqlite)
+        if is_new:
+            seed_from_manual_csvs(conn)
+    else:
+        conn = connect_mysql()
+    try:
+        load_camps(conn, normalized, dry_run=args.dry_run)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
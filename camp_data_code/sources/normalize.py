@@ -0,0 +1,329 @@
+import argparse
+import glob
+import logging
+import os
+import re
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_YEAR = 2025
+
+# Source column aliases -> unified raw column names
+COLUMN_ALIASES = {
+    'Contact Information': 'Contact',
+    'Day': 'Days',
+    'Time Start': 'Start Time',
+    'Time End': 'End Time',
+    'Age': 'Age Range',
+    'Grade': 'Grade Range',
+}
+
+RAW_COLUMNS = [
+    'Organization', 'Camp Name', 'Week', 'Start Date', 'End Date', 'Days',
+    'Start Time', 'End Time', 'Location', 'Age Range', 'Grade Range', 'Price',
+    'Description', 'Email', 'Contact'
+]
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
+# --- Date range patterns, tried in order; every pattern uses the groups m1 d1 y1 m2 d2 y2 ---
+_SEP = r"\s*(?:-|–|to|through)\s*"
+_NAMED_MONTH = r"[A-Za-z]{3,9}\.?"
+DATE_RANGE_PATTERNS = [
+    # 2025-05-26 00:00:00 - 2025-05-30 00:00:00 (Excel exports)
+    rf"(?P<y1>\d{{4}})-(?P<m1>\d{{2}})-(?P<d1>\d{{2}})(?:[ T][\d:]+)?{_SEP}(?P<y2>\d{{4}})-(?P<m2>\d{{2}})-(?P<d2>\d{{2}})",
+    # 06/02/25 - 06/06/25, 5/26/2025 - 5/30/2025, 6/2 – 6/6
+    rf"(?P<m1>\d{{1,2}})/(?P<d1>\d{{1,2}})(?:/(?P<y1>\d{{2,4}}))?{_SEP}(?P<m2>\d{{1,2}})/(?P<d2>\d{{1,2}})(?:/(?P<y2>\d{{2,4}}))?",
+    # Jun 2 to Jun 6, 2025; June 16 - June 20, 2025; May 26 - May 30
+    rf"(?P<m1>{_NAMED_MONTH}) (?P<d1>\d{{1,2}})(?:, (?P<y1>\d{{4}}))?{_SEP}(?P<m2>{_NAMED_MONTH}) (?P<d2>\d{{1,2}})(?:,? (?P<y2>\d{{4}}))?",
+    # JUN 2-6, 2025
+    rf"(?P<m1>{_NAMED_MONTH}) (?P<d1>\d{{1,2}})\s*[-–]\s*(?P<d2>\d{{1,2}})(?:,? (?P<y2>\d{{4}}))?",
+    # Friday, April 18, 2025 (a single day)
+    rf"(?P<m1>{_NAMED_MONTH}) (?P<d1>\d{{1,2}}),? (?P<y1>\d{{4}})",
+    # 2025-06-23 00:00:00 (a single day)
+    r"(?P<y1>\d{4})-(?P<m1>\d{2})-(?P<d1>\d{2})",
+]
+_DATE_GROUPS = ['m1', 'd1', 'y1', 'm2', 'd2', 'y2']
+
+# --- Price patterns (amounts may contain thousands separators) ---
+_AMOUNT = r"(\d[\d,]*(?:\.\d+)?)"
+PRICE_PATTERNS = {
+    'price_per_day': rf"\$?\s*{_AMOUNT}\s*(?:/\s*day|per day)",
+    'price_per_week': rf"\$?\s*{_AMOUNT}\s*(?:/\s*week|per week)",
+    'price_member': rf"\${_AMOUNT}[^|$]*?(?<!Non-)(?<!Non )\bMembers?\b",
+    'price_nonmember': rf"\${_AMOUNT}[^|$]*?Non[- ]?Members?\b",
+    'price_regular': rf"Regular:\s*\${_AMOUNT}",
+    'price_sale': rf"Sale:\s*\${_AMOUNT}",
+}
+_FIRST_AMOUNT = rf"\$?\s*{_AMOUNT}"
+
+# --- Ages and grades ---
+AGE_PATTERNS = [
+    # 5yr 0mo - 8yr 11mo
+    r"(?P<lo>\d{1,2})\s*yr\s*\d{1,2}\s*mo\s*[-–]\s*(?P<hi>\d{1,2})\s*yr",
+    # Age 5 - 8 years, 5-12, 6 - 10
+    r"(?P<lo>\d{1,2})\s*(?:yrs?|years?)?\s*(?:-|–|to)\s*(?P<hi>\d{1,2})",
+    # 0 & up, 12+
+    r"(?P<lo>\d{1,2})\s*(?:&\s*up|and up|\+)",
+]
+_GRADE_TOKEN = r"(?:Pre-?K|PK|K|\d{1,2})"
+GRADE_PATTERN = rf"\b(?P<lo>{_GRADE_TOKEN})(?:st|nd|rd|th)?\s*(?:-|–|to)\s*(?P<hi>{_GRADE_TOKEN})(?:st|nd|rd|th)?\b"
+GRADE_VALUES = {'PRE-K': -1, 'PREK': -1, 'PK': -1, 'K': 0}
+
+# --- Weekdays: bit i is set when the camp meets on weekday i (Monday = 0) ---
+WEEKDAY_TOKENS = [
+    r"mo|mon|monday",
+    r"tu|tue|tues|tuesday",
+    r"we|wed|wednesday",
+    r"th|thu|thur|thurs|thursday",
+    r"fr|fri|friday",
+    r"sa|sat|saturday",
+    r"su|sun|sunday",
+]
+_DAY_WORD = r"(?:mo|tu|we|th|fr|sa|su)[a-z]*|m|f"
+DAY_RANGE_PATTERN = rf"\b(?P<first>{_DAY_WORD})\s*(?:-|–|through|thru|to)\s*(?P<last>{_DAY_WORD})\b"
+# YMCA lists the meeting days after any "Camp Not in Service ..." note, e.g. "Tu,We,Th,Fr"
+DAY_LIST_PATTERN = r"((?:Mo|Tu|We|Th|Fr|Sa|Su)(?:,(?:Mo|Tu|We|Th|Fr|Sa|Su))+)"
+
+TIME_PATTERN = r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?(?::\d{2})?\s*(?P<meridiem>[ap])?\.?m?\.?"
+
+def read_sources(data_dir):
+    """Reads every CSV/XLSX in data_dir into one all-string frame with RAW_COLUMNS plus 'source'."""
+    frames = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.csv")) + glob.glob(os.path.join(data_dir, "*.xlsx"))):
+        try:
+            if path.endswith(".xlsx"):
+                frame = pd.read_excel(path, dtype=str, keep_default_na=False)
+            else:
+                frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8')
+        except Exception as e:
+            logger.error(f"Skipping {path}: {e}")
+            continue
+        frame = frame.rename(columns=COLUMN_ALIASES).reindex(columns=RAW_COLUMNS, fill_value="")
+        frame.insert(0, 'source', os.path.splitext(os.path.basename(path))[0])
+        frames.append(frame)
+        logger.info(f"Read {len(frame)} rows from {path}")
+    if not frames:
+        return pd.DataFrame(columns=['source'] + RAW_COLUMNS)
+    return pd.concat(frames, ignore_index=True).fillna("")
+
+def _extract_first_match(text, patterns, groups):
+    """For each row, the named groups of the first pattern that matches (column-at-a-time)."""
+    result = pd.DataFrame(index=text.index, columns=groups, dtype=object)
+    matched = pd.Series(False, index=text.index)
+    for pattern in patterns:
+        remaining = ~matched
+        if not remaining.any():
+            break
+        extracted = text[remaining].str.extract(pattern, flags=re.IGNORECASE)
+        hit = extracted.notna().any(axis=1)
+        hit_index = hit[hit].index
+        for group in extracted.columns:
+            result.loc[hit_index, group] = extracted.loc[hit_index, group]
+        matched.loc[hit_index] = True
+    return result
+
+def _to_number(series):
+    return pd.to_numeric(series.str.replace(",", "", regex=False), errors='coerce')
+
+def _month_number(series):
+    numeric = pd.to_numeric(series, errors='coerce')
+    named = series.str.lower().str[:3].map(MONTHS)
+    return numeric.fillna(named)
+
+def _year_number(series, default_year):
+    year = pd.to_numeric(series, errors='coerce')
+    return year.where(year.isna() | (year >= 100), year + 2000)
+
+def parse_date_ranges(text, default_year=DEFAULT_YEAR):
+    """Parses week/date-range strings into (start_date, end_date) datetime Series."""
+    parts = _extract_first_match(text, DATE_RANGE_PATTERNS, _DATE_GROUPS)
+    m1 = _month_number(parts['m1'])
+    m2 = _month_number(parts['m2']).fillna(m1)
+    d1 = pd.to_numeric(parts['d1'], errors='coerce')
+    d2 = pd.to_numeric(parts['d2'], errors='coerce').fillna(d1)
+    explicit_y1 = _year_number(parts['y1'], default_year)
+    explicit_y2 = _year_number(parts['y2'], default_year)
+    # A range that crosses New Year ("Dec 29 to Jan 2, 2026") starts in the year before its end
+    wraps = m1 > m2
+    y1 = explicit_y1.fillna(explicit_y2.where(~wraps, explicit_y2 - 1)).fillna(default_year)
+    y2 = explicit_y2.fillna(y1.where(~wraps, y1 + 1))
+    start = pd.to_datetime(pd.DataFrame({'year': y1, 'month': m1, 'day': d1}), errors='coerce')
+    end = pd.to_datetime(pd.DataFrame({'year': y2, 'month': m2, 'day': d2}), errors='coerce')
+    return start, end
+
+def parse_prices(text):
+    """Parses free-text prices into member/non-member/sale/per-day/per-week amounts."""
+    prices = pd.DataFrame(index=text.index)
+    for column, pattern in PRICE_PATTERNS.items():
+        prices[column] = _to_number(text.str.extract(pattern, flags=re.IGNORECASE)[0])
+    first_amount = _to_number(text.str.extract(_FIRST_AMOUNT)[0])
+    # A bare amount ("$385.00", "Regular: $379") is the price of the whole session week
+    prices['price_per_week'] = prices['price_per_week'].fillna(
+        prices['price_regular']).fillna(first_amount.where(prices['price_per_day'].isna()))
+    return prices.drop(columns=['price_regular']).astype('float32')
+
+def parse_age_bounds(text):
+    bounds = _extract_first_match(text, AGE_PATTERNS, ['lo', 'hi'])
+    return (pd.to_numeric(bounds['lo'], errors='coerce').astype('Int8'),
+            pd.to_numeric(bounds['hi'], errors='coerce').astype('Int8'))
+
+def _grade_number(series):
+    upper = series.str.upper()
+    return pd.to_numeric(upper, errors='coerce').fillna(upper.map(GRADE_VALUES)).astype('Int8')
+
+def parse_grade_bounds(text):
+    bounds = text.str.extract(GRADE_PATTERN, flags=re.IGNORECASE)
+    return _grade_number(bounds['lo']), _grade_number(bounds['hi'])
+
+def _weekday_index(tokens):
+    lowered = tokens.str.lower()
+    index = pd.Series(np.nan, index=tokens.index)
+    for day, alternatives in enumerate(WEEKDAY_TOKENS):
+        index = index.mask(lowered.str.fullmatch(rf"(?:{alternatives})s?", na=False), day)
+    index = index.mask(lowered == "m", 0).mask(lowered == "f", 4)
+    return index
+
+def parse_weekday_masks(text, start_date=None, end_date=None):
+    """Weekday bitmasks (Monday = bit 0) from day strings, falling back to the date span."""
+    mask = _weekday_masks_from_text(text)
+    if start_date is not None and end_date is not None:
+        mask = fill_weekdays_from_dates(mask, start_date, end_date)
+    return mask
+
+def _weekday_masks_from_text(text):
+    day_list = text.str.extract(DAY_LIST_PATTERN)[0]
+    text = day_list.fillna(text).str.lower()
+
+    # Ranges: "M - F", "Monday through Friday", "Mon – Thu"
+    ranges = text.str.extract(DAY_RANGE_PATTERN, flags=re.IGNORECASE)
+    first = _weekday_index(ranges['first'].fillna(""))
+    last = _weekday_index(ranges['last'].fillna(""))
+    valid = first.notna() & last.notna() & (last >= first)
+    first_bits = first.where(valid, 0).astype(np.int64).to_numpy()
+    last_bits = last.where(valid, -1).astype(np.int64).to_numpy()
+    range_mask = ((1 << (last_bits + 1)) - 1) ^ ((1 << first_bits) - 1)
+    mask = pd.Series(np.where(valid, range_mask, 0), index=text.index)
+
+    # Lists: "Mo Tu We Th", "Mon, and Tue", "Fridays"
+    list_mask = pd.Series(0, index=text.index)
+    for day, alternatives in enumerate(WEEKDAY_TOKENS):
+        list_mask |= text.str.contains(rf"\b(?:{alternatives})s?\b", regex=True, na=False).astype(int) * (1 << day)
+    return mask.where(valid, list_mask).astype('int8')
+
+def fill_weekdays_from_dates(mask, start_date, end_date):
+    """For "5-Day Camp" and blank day strings, every weekday between the first and last date."""
+    span_ok = (mask == 0) & start_date.notna() & end_date.notna() & ((end_date - start_date).dt.days.between(0, 6))
+    lo = start_date.dt.dayofweek.where(span_ok, 0).astype(np.int64).to_numpy()
+    hi = end_date.dt.dayofweek.where(span_ok, -1).astype(np.int64).to_numpy()
+    span_mask = ((1 << (hi + 1)) - 1) ^ ((1 << lo) - 1)
+    return mask.where(~span_ok | (hi < lo), span_mask).astype('int8')
+
+def parse_times(text):
+    """Minutes after midnight from "9:00 AM", "9:30am", "08:30:00", "1:00" (no meridiem < 7 means PM)."""
+    parts = text.str.extract(TIME_PATTERN, flags=re.IGNORECASE)
+    hour = pd.to_numeric(parts['hour'], errors='coerce')
+    minute = pd.to_numeric(parts['minute'], errors='coerce').fillna(0)
+    meridiem = parts['meridiem'].str.lower()
+    hour = hour.mask((meridiem == 'p') & (hour < 12), hour + 12)
+    hour = hour.mask((meridiem == 'a') & (hour == 12), 0)
+    hour = hour.mask(meridiem.isna() & (hour < 7), hour + 12)
+    minutes = hour * 60 + minute
+    return minutes.where(minutes.between(0, 24 * 60)).astype('Int16')
+
+def _parse_distinct(text, parser, *args):
+    """Runs a column parser once per distinct value and broadcasts the results back.
+
+    Scraped columns repeat heavily (every YMCA week shares one price string), so this
+    keeps the regex work proportional to the number of distinct strings, not rows.
+    """
+    codes, uniques = pd.factorize(text)
+    parsed = parser(pd.Series(uniques, dtype=object), *args)
+    expand = lambda values: values.take(codes).set_axis(text.index)
+    if isinstance(parsed, tuple):
+        return tuple(expand(values) for values in parsed)
+    return expand(parsed)
+
+def normalize_camps(raw, default_year=DEFAULT_YEAR):
+    """Turns the raw all-string frame from read_sources into one typed frame.
+
+    Every parser works a whole column at a time with pandas string methods, once per
+    distinct value; repeated text columns are stored dictionary-encoded.
+    """
+    strip = lambda column: raw[column].astype(str).str.strip()
+    start_text = strip('Start Date')
+    end_text = strip('End Date')
+    has_dates = (start_text != "") | (end_text != "")
+    # Two-column sources become "start - end" so both schemas share the range parser
+    week_text = strip('Week').where(~has_dates, start_text + " - " + end_text)
+    start_date, end_date = _parse_distinct(week_text, parse_date_ranges, default_year)
+    price_text = strip('Price')
+    prices = _parse_distinct(price_text, parse_prices)
+    min_age, max_age = _parse_distinct(strip('Age Range'), parse_age_bounds)
+    min_grade, max_grade = _parse_distinct(strip('Grade Range'), parse_grade_bounds)
+    days_mask = fill_weekdays_from_dates(_parse_distinct(strip('Days'), _weekday_masks_from_text),
+                                         start_date, end_date)
+
+    normalized = pd.DataFrame({
+        'source': raw['source'].astype('category'),
+        'organization': strip('Organization').astype('category'),
+        'camp_name': strip('Camp Name').astype('category'),
+        'location': strip('Location').astype('category'),
+        'start_date': start_date,
+        'end_date': end_date,
+        'days_mask': days_mask,
+        'start_minutes': _parse_distinct(strip('Start Time'), parse_times),
+        'end_minutes': _parse_distinct(strip('End Time'), parse_times),
+        'min_age': min_age,
+        'max_age': max_age,
+        'min_grade': min_grade,
+        'max_grade': max_grade,
+        'week_text': week_text.astype('category'),
+        'price_text': price_text.astype('category'),
+        'description': strip('Description').astype('category'),
+        'email': strip('Email').astype('category'),
+        'contact': strip('Contact').astype('category'),
+    })
+    for column in prices.columns:
+        normalized.insert(normalized.columns.get_loc('min_age'), column, prices[column])
+    return normalized
+
+def write_columnar(normalized, path):
+    """Writes an uncompressed Arrow IPC (Feather v2) file so loaders can memory-map it."""
+    table = pa.Table.from_pandas(normalized, preserve_index=False)
+    table = table.set_column(table.schema.get_field_index('start_date'), 'start_date',
+                             table['start_date'].cast(pa.date32()))
+    table = table.set_column(table.schema.get_field_index('end_date'), 'end_date',
+                             table['end_date'].cast(pa.date32()))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote {table.num_rows} normalized rows to {path}")
+    return table
+
+def load_normalized(path):
+    """Memory-maps a file written by write_columnar and returns it as a pyarrow Table."""
+    return feather.read_table(path, memory_map=True)
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    data_dir = os.path.join(base_dir, "camp_data_1.1")
+    parser = argparse.ArgumentParser(description="Normalize every scraped camp source into one columnar file.")
+    parser.add_argument("--data-dir", default=data_dir, help="Directory of scraped CSV/XLSX sources")
+    parser.add_argument("--out", default=os.path.join(data_dir, "normalized", "camps.arrow"),
+                        help="Arrow IPC file to write")
+    args = parser.parse_args(argv)
+
+    normalized = normalize_camps(read_sources(args.data_dir))
+    write_columnar(normalized, args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the duration histogram buckets; +Inf is implicit
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+PROMETHEUS_PREFIX = "camp_scrape"
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (name, label key) -> _Histogram
+        self.counters = {}    # (name, label key) -> float
+
+class ScrapeMetrics:
+    """Timing spans, histograms and counters for one or more scrape runs.
+
+    Every span is observed into the "<phase>" duration histogram, so per-card phases
+    (modal_open, modal_close, ...) and whole runs ("run") get count/sum/max and
+    buckets alike. Counters record events such as timeouts, fallbacks and retries.
+    Metrics are thread-safe; bind() returns a view that adds labels (e.g. the club)
+    to everything recorded through it while sharing the same storage.
+
+    Usage:
+        metrics = ScrapeMetrics()
+        club_metrics = metrics.bind(source="plano")
+        with club_metrics.span("page_load"):
+            driver.get(url)
+        club_metrics.increment("timeouts", wait="modal")
+        metrics.write("metrics.prom")
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS, labels=None, _store=None):
+        self.buckets = tuple(buckets)
+        self.labels = dict(labels or {})
+        self._store = _store or _Store()
+
+    def bind(self, **labels):
+        return ScrapeMetrics(self.buckets, {**self.labels, **labels}, self._store)
+
+    # --- Recording ---
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key({**self.labels, **labels}))
+        with self._store.lock:
+            histogram = self._store.histograms.get(key)
+            if histogram is None:
+                histogram = self._store.histograms[key] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, _label_key({**self.labels, **labels}))
+        with self._store.lock:
+            self._store.counters[key] = self._store.counters.get(key, 0) + amount
+
+    @contextmanager
+    def span(self, phase, **labels):
+        """Times the block into the `phase` histogram, failed or not."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started, **labels)
+
+    def sleep(self, seconds, reason):
+        """time.sleep, recorded as a "sleep" span so fixed pauses show up next to real work."""
+        with self.span("sleep", reason=reason):
+            time.sleep(seconds)
+
+    # --- Reading ---
+    def histogram(self, name, **labels):
+        """Observations of one histogram summed over all other labels: count, sum, max."""
+        wanted = set(_label_key({**self.labels, **labels}))
+        count = total = peak = 0
+        with self._store.lock:
+            for (metric, key), histogram in self._store.histograms.items():
+                if metric == name and wanted <= set(key):
+                    count += histogram.count
+                    total += histogram.sum
+                    peak = max(peak, histogram.max)
+        return {'count': count, 'sum': total, 'max': peak}
+
+    def counter(self, name, **labels):
+        wanted = set(_label_key({**self.labels, **labels}))
+        with self._store.lock:
+            return sum(value for (metric, key), value in self._store.counters.items()
+                       if metric == name and wanted <= set(key))
+
+    # --- Export ---
+    def to_dict(self):
+        with self._store.lock:
+            histograms = [
+                {'name': name, 'labels': dict(key), 'count': histogram.count, 'sum': round(histogram.sum, 6),
+                 'max': round(histogram.max, 6), 'p50': histogram.quantile(0.5), 'p95': histogram.quantile(0.95),
+                 'buckets': {str(bound): count for bound, count in zip(histogram.buckets + ("+Inf",),
+                                                                       histogram.counts)}}
+                for (name, key), histogram in sorted(self._store.histograms.items())
+            ]
+            counters = [{'name': name, 'labels': dict(key), 'value': value}
+                        for (name, key), value in sorted(self._store.counters.items())]
+        return {'histograms': histograms, 'counters': counters}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format: one <prefix>_<phase>_seconds histogram per phase
+        and one <prefix>_<name>_total counter per event."""
+        def labels_text(key, extra=()):
+            pairs = list(key) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._store.lock:
+            histograms = sorted(self._store.histograms.items())
+            counters = sorted(self._store.counters.items())
+            typed = set()
+            for (name, key), histogram in histograms:
+                metric = f"{PROMETHEUS_PREFIX}_{name}_seconds"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{labels_text(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_sum{labels_text(key)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{labels_text(key)} {histogram.count}")
+            for (name, key), value in counters:
+                metric = f"{PROMETHEUS_PREFIX}_{name}_total"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{labels_text(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes JSON (.json) or Prometheus text (anything else, e.g. .prom) atomically."""
+        body = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote scrape metrics to {path}")
+
+    def summary_lines(self, phases=None):
+        """One line per phase, slowest total first: count, total, mean and max seconds."""
+        with self._store.lock:
+            wanted = set(_label_key(self.labels))
+            names = phases or sorted({name for name, key in self._store.histograms if wanted <= set(key)})
+        rows = [(name, self.histogram(name)) for name in names]
+        rows.sort(key=lambda row: -row[1]['sum'])
+        return [f"{name:<15} {stats['count']:>6} x {stats['sum']:>8.2f}s total {stats['sum'] / stats['count']:>8.3f}s mean "
+                f"{stats['max']:>8.3f}s max" for name, stats in rows if stats['count']]
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Card-level fields that decide whether a card's modal needs to be opened again
+CARD_FINGERPRINT_FIELDS = ('camp_name', 'camp_category', 'week', 'price', 'location', 'availability')
+
+def card_fingerprint(card_fields):
+    """Content fingerprint of a card's card-level fields (see CARD_FINGERPRINT_FIELDS)."""
+    values = [card_fields.get(field, "") for field in CARD_FINGERPRINT_FIELDS]
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class CardStateStore:
+    """Persistent per-source cache of modal details, keyed by card fingerprint.
+
+    Unchanged cards reuse their cached Days/Start Time/End Time/Description; new or
+    changed cards miss the cache and get their modal opened. Call `finish()` after a
+    successful run to drop cards that disappeared and write the state back to disk.
+    """
+
+    def __init__(self, source, state_dir):
+        self.source = source
+        self.path = os.path.join(state_dir, f"{source}.json")
+        self._previous = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._previous = json.load(f).get('cards', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable scrape state {self.path}: {e}")
+        self._current = {}
+        self._reused = set()
+        self._refreshed = set()
+        logger.info(f"Loaded {len(self._previous)} cached cards for {source}")
+
+    def lookup(self, card_fields):
+        """Cached modal details for an unchanged card, or None if it must be (re)opened."""
+        fingerprint = card_fingerprint(card_fields)
+        details = self._current.get(fingerprint) or self._previous.get(fingerprint)
+        if details is None:
+            return None
+        self._current[fingerprint] = details
+        if fingerprint not in self._refreshed:
+            self._reused.add(fingerprint)
+        return dict(details)
+
+    def store(self, card_fields, details):
+        """Remembers freshly scraped modal details for a card."""
+        fingerprint = card_fingerprint(card_fields)
+        self._current[fingerprint] = dict(details)
+        self._refreshed.add(fingerprint)
+        self._reused.discard(fingerprint)
+
+    def counts(self):
+        dropped = len(set(self._previous) - set(self._current))
+        return {'reused': len(self._reused), 'refreshed': len(self._refreshed), 'dropped': dropped}
+
+    def finish(self):
+        """Drops cards not seen in this run, saves the state atomically and returns the counts."""
+        counts = self.counts()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': self.source, 'cards': self._current}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Scrape state for {self.source}: {counts['reused']} reused, "
+                    f"{counts['refreshed']} refreshed, {counts['dropped']} dropped")
+        return counts
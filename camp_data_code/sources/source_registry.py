@@ -0,0 +1,449 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlsplit
+from bs4 import BeautifulSoup
+from .camp_sink import REQUIRED_COLUMNS, OUTPUT_FORMATS, CampRowSink
+from .host_scheduler import HostScheduler, DEFAULT_MAX_CONCURRENCY, DEFAULT_PER_HOST, DEFAULT_MIN_INTERVAL
+from .web_scrape import (LIFETIME_CLUBS, LIFETIME_LIST_SELECTOR, LIFETIME_CARD_FIELDS, LIFETIME_MODAL,
+                         parse_card_snapshot, parse_modal_snapshot, build_camp_record, default_modal_details)
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODAL_INDEX_ATTRIBUTE = "data-modal-index"
+
+# --- Specs ---
+class SourceSpec:
+    """Declarative description of one camp listing site.
+
+    Field selectors are CSS (soupsieve, so ":-soup-contains('Meets:')" works) and
+    yield the element's whitespace-collapsed text; "selector@attr" yields an
+    attribute instead and "@attr" an attribute of the card itself. Missing
+    elements yield None.
+
+    Args:
+        name (str): Registry key; also the output file name.
+        organization (str): Organization column for every row.
+        start_urls (list): First listing page of each catalog.
+        list_selector (str): Selects one element per camp card on a listing page.
+        fields (dict): Card field -> selector, relative to the card.
+        detail (dict): Where the rest of a camp's fields live, or None if the card has everything:
+            {'strategy': 'page', 'link': selector of the detail URL, 'fields': {...}} fetches a detail
+            page per card; {'strategy': 'modal', 'trigger': selector, 'modal': selector, 'close': selector,
+            'fields': {...}} opens a dialog on the listing page.
+        pagination (dict): {'next': selector of the next page URL}, followed up to max_pages.
+        render (str): "html" fetches pages as-is; "browser" renders them in Chrome first
+            (for client-side rendered sites; modals are opened by clicking their trigger).
+        to_row (callable): (spec, card, details) -> REQUIRED_COLUMNS row. By default fields
+            are named after REQUIRED_COLUMNS and copied across.
+        options (dict): Site-specific values for to_row (e.g. a club's location name).
+    """
+
+    def __init__(self, name, organization, start_urls, list_selector, fields, detail=None, pagination=None,
+                 render="html", to_row=None, max_pages=20, options=None):
+        if render not in ("html", "browser"):
+            raise ValueError(f"Unknown render mode for {name}: {render}")
+        if detail is not None and detail.get('strategy') not in ("page", "modal"):
+            raise ValueError(f"Unknown detail strategy for {name}: {detail.get('strategy')}")
+        self.name = name
+        self.organization = organization
+        self.start_urls = list(start_urls)
+        self.list_selector = list_selector
+        self.fields = fields
+        self.detail = detail
+        self.pagination = pagination
+        self.render = render
+        self.to_row = to_row or default_row
+        self.max_pages = max_pages
+        self.options = options or {}
+
+    @property
+    def hosts(self):
+        return sorted({urlsplit(url).netloc for url in self.start_urls})
+
+def default_row(spec, card, details):
+    """Copies fields named after REQUIRED_COLUMNS; detail fields win over card fields."""
+    values = dict(card)
+    values.update({field: value for field, value in (details or {}).items() if value is not None})
+    row = {column: values.get(column) or "" for column in REQUIRED_COLUMNS}
+    row['Organization'] = row['Organization'] or spec.organization
+    return row
+
+SOURCES = {}
+
+def register(spec):
+    if spec.name in SOURCES:
+        raise ValueError(f"Source {spec.name} is already registered")
+    SOURCES[spec.name] = spec
+    return spec
+
+# --- Extraction ---
+def select_value(element, selector):
+    """Text (or attribute, for "selector@attr") of the first match under element, or None."""
+    selector, _, attribute = selector.partition("@")
+    target = element.select_one(selector) if selector else element
+    if target is None:
+        return None
+    if attribute:
+        value = target.get(attribute)
+        return " ".join(value) if isinstance(value, list) else value
+    return " ".join(target.get_text(" ").split())
+
+def extract_fields(element, fields):
+    return {field: select_value(element, selector) for field, selector in fields.items()}
+
+def find_modal(soup, card, index, detail, snapshot_blocks=None):
+    """The pre-rendered dialog for a card in static HTML.
+
+    Looked up first through the data-modal-index blocks appended to recorded browser
+    snapshots (snapshot_blocks: index -> block, to avoid searching the page once per
+    card), then through the trigger's data-target / data-bs-target / aria-controls /
+    "#id" href. The per-card block must win: on pages like Lifetime's every trigger
+    points at one shared dialog, which is still empty in the snapshot.
+    """
+    if snapshot_blocks is None:
+        container = soup.find(attrs={MODAL_INDEX_ATTRIBUTE: str(index)})
+    else:
+        container = snapshot_blocks.get(str(index))
+    trigger = card.select_one(detail['trigger']) if container is None and detail.get('trigger') else None
+    if trigger is not None:
+        for attribute in ("data-target", "data-bs-target", "aria-controls", "href"):
+            target = (trigger.get(attribute) or "").strip()
+            if target and target != "#":
+                container = soup.find(id=target.lstrip("#"))
+                if container is not None:
+                    break
+    if container is None:
+        return None
+    return container.select_one(detail['modal']) or container if detail.get('modal') else container
+
+# --- Fetching ---
+# Clicks the trigger of the card at arguments[2]; arguments[0] and [1] are the list and trigger selectors
+CLICK_TRIGGER_JS = """
+var card = document.querySelectorAll(arguments[0])[arguments[2]];
+var button = card ? card.querySelector(arguments[1]) : null;
+if (!button || button.disabled) { return false; }
+button.scrollIntoView(true);
+button.click();
+return true;
+"""
+
+# outerHTML of the dialog at arguments[0] once it is visible, else null
+VISIBLE_HTML_JS = """
+var el = document.querySelector(arguments[0]);
+var shown = !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+return shown ? el.outerHTML : null;
+"""
+
+CLOSE_DIALOG_JS = """
+var close = arguments[0] ? document.querySelector(arguments[0]) : null;
+if (close) { close.click(); return true; }
+document.body.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27, bubbles: true}));
+return false;
+"""
+
+class PageFetcher:
+    """Fetches listing and detail pages for the source scrapers, one scheduler slot per request.
+
+    Args:
+        scheduler (HostScheduler): Politeness limits; keyed by each URL's real host, even on replay.
+        session: A requests session (or fixture_server.RecordingSession). A pooled one is created if omitted.
+        base_url (str): Send every request to this origin instead, keeping path and query
+            (a FixtureServer replaying saved pages).
+        driver_pool (DriverPool): Browsers for specs with render="browser". Without one (or on
+            replay) those specs are fetched as static HTML, which suits recorded snapshots.
+        record_dir (str): Save every fetched page (browser snapshots included) as a fixture.
+    """
+
+    def __init__(self, scheduler, session=None, base_url=None, driver_pool=None, record_dir=None, timeout=30):
+        if session is None:
+            from .http_session import create_http_session
+            session = create_http_session(pool_size=scheduler.max_concurrency)
+        self.scheduler = scheduler
+        self.session = session
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.driver_pool = driver_pool
+        self.record_dir = record_dir
+        self.timeout = timeout
+
+    def _target(self, url):
+        if self.base_url is None:
+            return url
+        parts = urlsplit(url)
+        return self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def get(self, url):
+        """HTML of one page."""
+        with self.scheduler.slot(url):
+            response = self.session.get(self._target(url), headers={'Accept': 'text/html,*/*'},
+                                        timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def uses_browser(self, spec):
+        return spec.render == "browser" and self.driver_pool is not None and self.base_url is None
+
+    def render(self, url, spec, wait_seconds=30):
+        """HTML of a page rendered in a pooled browser, with each card's dialog appended when the
+        spec's details live in modals (as data-modal-index blocks, see find_modal)."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        driver = self.driver_pool.acquire()
+        broken = False
+        try:
+            with self.scheduler.slot(url):
+                driver.get(url)
+            WebDriverWait(driver, wait_seconds).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, spec.list_selector)))
+            html = driver.page_source
+            modals = []
+            detail = spec.detail or {}
+            if detail.get('strategy') == "modal":
+                count = len(driver.find_elements(By.CSS_SELECTOR, spec.list_selector))
+                for index in range(count):
+                    try:
+                        # Opening a dialog usually fetches its content from the same site
+                        with self.scheduler.slot(url):
+                            if not driver.execute_script(CLICK_TRIGGER_JS, spec.list_selector, detail['trigger'], index):
+                                continue
+                            modal_html = WebDriverWait(driver, 20).until(
+                                lambda d: d.execute_script(VISIBLE_HTML_JS, detail['modal']))
+                        modals.append(f'<div {MODAL_INDEX_ATTRIBUTE}="{index}" hidden>{modal_html}</div>')
+                        driver.execute_script(CLOSE_DIALOG_JS, detail.get('close'))
+                        WebDriverWait(driver, 10).until(
+                            lambda d: not d.execute_script(VISIBLE_HTML_JS, detail['modal']))
+                    except Exception as e:
+                        logger.warning(f"{spec.name}: could not read the dialog of card {index + 1}: {e}")
+            if modals:
+                html = html.replace("</body>", "".join(modals) + "</body>") if "</body>" in html else html + "".join(modals)
+            if self.record_dir:
+                from .fixture_server import save_fixture
+                save_fixture(self.record_dir, url, html.encode('utf-8'), content_type="text/html; charset=utf-8")
+            return html
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.driver_pool.release(driver, broken=broken)
+
+# --- Scraping ---
+def iter_source_rows(spec, fetcher):
+    """Scrape every catalog of one source, yielding rows as they are ready.
+
+    Listing pages are walked in order; detail pages are fetched concurrently, up to
+    the per-host limit of the scheduler, and each row is yielded (in card order) as
+    soon as its details arrive.
+
+    Yields:
+        dict: Camp rows in REQUIRED_COLUMNS order.
+    """
+    cards = []  # (fields, detail URL or dialog element)
+    detail = spec.detail or {}
+    for start_url in spec.start_urls:
+        url, pages = start_url, 0
+        seen = set()
+        while url and url not in seen and pages < spec.max_pages:
+            seen.add(url)
+            pages += 1
+            html = fetcher.render(url, spec) if fetcher.uses_browser(spec) else fetcher.get(url)
+            soup = BeautifulSoup(html, "html.parser")
+            page_cards = soup.select(spec.list_selector)
+            logger.info(f"{spec.name}: {len(page_cards)} cards on {url}")
+            snapshot_blocks = None
+            if detail.get('strategy') == "modal":
+                snapshot_blocks = {block[MODAL_INDEX_ATTRIBUTE]: block
+                                   for block in soup.find_all(attrs={MODAL_INDEX_ATTRIBUTE: True})}
+            for index, card in enumerate(page_cards):
+                fields = extract_fields(card, spec.fields)
+                fields['index'] = len(cards)
+                reference = None
+                if detail.get('strategy') == "page":
+                    link = select_value(card, detail['link'])
+                    reference = urljoin(url, link) if link else None
+                elif detail.get('strategy') == "modal":
+                    reference = find_modal(soup, card, index, detail, snapshot_blocks)
+                cards.append((fields, reference))
+            next_link = select_value(soup, spec.pagination['next']) if spec.pagination else None
+            url = urljoin(url, next_link) if next_link else None
+
+    def fetch_details(item):
+        fields, reference = item
+        if reference is None:
+            return None
+        try:
+            if detail['strategy'] == "page":
+                reference = BeautifulSoup(fetcher.get(reference), "html.parser")
+            return extract_fields(reference, detail['fields'])
+        except Exception as e:
+            logger.error(f"{spec.name}: error reading details for card {fields['index'] + 1}: {e}")
+            return None
+
+    host_limit = max(1, min(fetcher.scheduler.per_host, fetcher.scheduler.max_concurrency))
+    rows = 0
+    with ThreadPoolExecutor(max_workers=host_limit) as executor:
+        for (fields, _), details in zip(cards, executor.map(fetch_details, cards)):
+            try:
+                row = spec.to_row(spec, fields, details)
+            except Exception as e:
+                logger.error(f"{spec.name}: error processing card {fields['index'] + 1}: {e}")
+                continue
+            yield row
+            rows += 1
+    logger.info(f"{spec.name}: {rows} camp sessions")
+
+def scrape_source(spec, fetcher):
+    """iter_source_rows, collected into a list of camp rows."""
+    return list(iter_source_rows(spec, fetcher))
+
+def _scrape_task(spec, fetcher, output_dir, output_format):
+    """Per-source task for run_sources. Never raises; returns a summary entry."""
+    started = time.monotonic()
+    rows = 0
+    sink = CampRowSink(os.path.join(output_dir, f"{spec.name}.{output_format}")) if output_dir else None
+    try:
+        # Rows go straight to the output file; it replaces the previous one only if there are any
+        for row in iter_source_rows(spec, fetcher):
+            if sink is not None:
+                sink.write(row)
+            rows += 1
+        status = "ok" if rows else "empty"
+        error = ""
+    except Exception as e:
+        logger.error(f"Source {spec.name} failed: {e}")
+        status = "failed"
+        error = str(e)
+    except BaseException:
+        if sink is not None:
+            sink.abort()
+        raise
+    if sink is not None:
+        if sink.rows_written:
+            sink.close()
+        else:
+            sink.abort()
+    return {
+        'source': spec.name,
+        'status': status,
+        'rows': rows,
+        'seconds': round(time.monotonic() - started, 1),
+        'error': error,
+    }
+
+def run_sources(specs, fetcher, output_dir=SCRIPT_DIR, output_format="csv"):
+    """Scrape several sources at once; the run takes about as long as the slowest one.
+
+    Every source gets its own task, and every request waits only for its own host's
+    politeness limits and the scheduler's global cap.
+
+    Returns:
+        list: One summary entry per source (status, rows, seconds, error).
+    """
+    if output_format not in OUTPUT_FORMATS.values():
+        raise ValueError(f"Unknown output_format: {output_format}")
+    specs = list(specs)
+    logger.info(f"===== Starting scrape of {len(specs)} sources =====")
+    run_started = time.monotonic()
+    summary = []
+    with ThreadPoolExecutor(max_workers=max(1, len(specs))) as executor:
+        futures = [executor.submit(_scrape_task, spec, fetcher, output_dir, output_format) for spec in specs]
+        for future in as_completed(futures):
+            summary.append(future.result())
+
+    summary.sort(key=lambda entry: entry['source'])
+    total_seconds = time.monotonic() - run_started
+    failed = [entry['source'] for entry in summary if entry['status'] != "ok"]
+    logger.info("===== Source summary =====")
+    for entry in summary:
+        logger.info(f"{entry['source']:<30} {entry['status']:<7} {entry['rows']:>4} rows {entry['seconds']:>7.1f}s {entry['error']}")
+    logger.info(f"Finished {len(summary)} sources in {total_seconds:.1f}s "
+                f"(sources took {sum(entry['seconds'] for entry in summary):.1f}s in total); "
+                f"{len(failed)} without data: {', '.join(failed) or 'none'}")
+    return summary
+
+# --- Lifetime Fitness ---
+# The selector tables live in web_scrape.py and are shared with the Selenium scraper
+def lifetime_row(spec, card, details):
+    """Same cleaning as the Selenium scraper (parse_card_snapshot / parse_modal_snapshot)."""
+    card_fields = parse_card_snapshot(card, spec.options['location_name'])
+    if details is None or details.get('description') is None:
+        modal = default_modal_details(card_fields['camp_name'], card_fields['camp_category'])
+    else:
+        modal = parse_modal_snapshot(details, card_fields['camp_name'], card_fields['camp_category'])
+    return build_camp_record(spec.organization, card_fields, modal)
+
+def lifetime_spec(location_name, url):
+    return SourceSpec(
+        name=f"lifetime_camps_{location_name.lower().replace(' ', '_')}",
+        organization="Lifetime Fitness",
+        start_urls=[url],
+        list_selector=LIFETIME_LIST_SELECTOR,
+        fields=LIFETIME_CARD_FIELDS,
+        detail=LIFETIME_MODAL,
+        render="browser",
+        to_row=lifetime_row,
+        options={'location_name': location_name},
+    )
+
+for _location_name, _url in LIFETIME_CLUBS.items():
+    register(lifetime_spec(_location_name, _url))
+
+# --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Scrape registered camp sources concurrently with per-host limits.")
+    parser.add_argument("sources", nargs="*", help="Source names (default: all registered)")
+    parser.add_argument("--list", action="store_true", help="List registered sources and exit")
+    parser.add_argument("--fixtures", help="Replay saved pages from this fixtures directory")
+    parser.add_argument("--record", help="Save every fetched page into this fixtures directory")
+    parser.add_argument("--output-dir", default=SCRIPT_DIR)
+    parser.add_argument("--format", default="csv", choices=sorted(set(OUTPUT_FORMATS.values())))
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST)
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL)
+    parser.add_argument("--browsers", type=int, default=2, help="Chrome pool size for browser-rendered sources")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, spec in sorted(SOURCES.items()):
+            print(f"{name:<30} {spec.render:<8} {', '.join(spec.hosts)}")
+        raise SystemExit(0)
+    unknown = [name for name in args.sources if name not in SOURCES]
+    if unknown:
+        parser.error(f"Unknown sources: {', '.join(unknown)}")
+    specs = [SOURCES[name] for name in args.sources] or list(SOURCES.values())
+
+    scheduler = HostScheduler(args.max_concurrency, args.per_host, args.min_interval)
+    server = pool = session = None
+    if args.fixtures:
+        from .fixture_server import FixtureServer
+        server = FixtureServer(args.fixtures).start()
+    elif any(spec.render == "browser" for spec in specs):
+        from .driver_pool import DriverPool
+        pool = DriverPool(size=args.browsers)
+    if args.record:
+        from .fixture_server import RecordingSession
+        from .http_session import create_http_session
+        session = RecordingSession(create_http_session(pool_size=args.max_concurrency), args.record)
+    fetcher = PageFetcher(scheduler, session=session, base_url=server.base_url if server else None,
+                          driver_pool=pool, record_dir=args.record)
+    try:
+        summary = run_sources(specs, fetcher, args.output_dir, args.format)
+        for host, stats in scheduler.stats().items():
+            logger.info(f"{host:<30} {stats['requests']:>5} requests, {stats['waited']:>7.1f}s waiting for a slot")
+    finally:
+        if pool is not None:
+            pool.close()
+        if server is not None:
+            server.stop()
+        fetcher.session.close()
+    # Non-zero exit status when any source came back without data
+    return 1 if any(entry['status'] != "ok" for entry in summary) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,57 +1,414 @@
 import time
 import re
-import pandas as pd
 import logging
 import os
+import argparse
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
+from concurrent.futures import ThreadPoolExecutor, as_completed
+# Selenium is imported inside the browser functions, so the card/modal parsers load without it
+from .driver_pool import DriverPool, create_chrome_driver
+from .scrape_state import CardStateStore, card_fingerprint
+from .checkpoint import ScrapeCheckpoint
+from .camp_sink import REQUIRED_COLUMNS, OUTPUT_FORMATS, CampRowSink, save_rows
+from .scrape_metrics import ScrapeMetrics
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Define required columns for the final output
-REQUIRED_COLUMNS = [
-    'Organization', 'Camp Name', 'Week', 'Days', 
-    'Start Time', 'End Time', 'Location', 'Age Range', 
-    'Grade Range', 'Price', 'Description', 'Email', 'Contact'
-]
-
 # --- Define Base Path for Output Files ---
-try:
-    SCRIPT_DIR = os.path.dirname(os.path.abspath(sys.argv[0]))
-except IndexError:
-    SCRIPT_DIR = os.getcwd()
-    logger.warning(f"sys.argv[0] not available, using current working directory: {SCRIPT_DIR}")
-except Exception as e:
-    SCRIPT_DIR = os.getcwd()
-    logger.warning(f"Error getting script directory ({e}), using current working directory: {SCRIPT_DIR}")
+# Next to this module, wherever the scraper is launched from (script, -m or the CLI)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Function to save data to CSV
 def save_to_csv(camp_data_list, csv_filename):
-    """Saves all camp data to a single CSV file."""
+    """Saves all camp data to a single file (CSV, or JSON Lines/Parquet by extension) via an atomic streaming write."""
     if not camp_data_list:
         logger.warning(f"No data to save to {csv_filename}")
         return False
     
     try:
-        df = pd.DataFrame(camp_data_list, columns=REQUIRED_COLUMNS)
-        os.makedirs(os.path.dirname(csv_filename), exist_ok=True)
-        df.to_csv(csv_filename, index=False, encoding='utf-8')
-        logger.info(f"Successfully saved {len(camp_data_list)} records to {csv_filename}")
+        save_rows(camp_data_list, csv_filename)
         return True
     except Exception as e:
         logger.error(f"Failed to save data to {csv_filename}: {e}")
         return False
 
-def scrape_lifetime_camps(url, location_name="Frisco", max_retries=3, delay_between_retries=10):
+def _finish_output(sink, metrics):
+    """Moves a run's streamed rows into place, or keeps the previous file if there are none.
+    
+    Returns:
+        int: The number of rows written.
+    """
+    if sink is None or not sink.rows_written:
+        if sink is not None:
+            sink.abort()
+        logger.warning("No camp data was collected to save.")
+        return 0
+    with metrics.span("save"):
+        sink.close()
+    return sink.rows_written
+
+# --- Lifetime page selectors ---
+# The single description of the camps page: the Selenium readers below and the
+# registry's static Lifetime spec (source_registry.lifetime_spec) both use these.
+# A "selector@attr" value reads that attribute instead of the element's text.
+LIFETIME_LIST_SELECTOR = "[data-testid='campCard']"
+
+LIFETIME_CARD_FIELDS = {
+    'category': ".h6",
+    'name': ".h4",
+    'age_range': "p.small.font-weight-bold",
+    'date_start': "time.time-start",
+    'date_end': "time.time-end",
+    'date_label': "p.small.m-b-sm > span > time@aria-label",
+    'date_text': "p.small.m-b-sm > span > time",
+    'location': "[id^='campLocation-']",
+    'field_trip': "[data-testid='fieldTrip']",
+    'price_per_day': ".display-number-value",
+    'availability': "p.availability span",
+}
+
+# Card fields that only count when shown (static HTML cannot tell, so the spec reads them regardless)
+LIFETIME_DISPLAYED_ONLY = ('field_trip', 'availability')
+
+LIFETIME_MODAL = {
+    'strategy': "modal",
+    'trigger': "[data-testid='moreDetailsBtn']",
+    'modal': ".modal-body",
+    'close': ".modal-header .close",
+    'fields': {
+        'meets': "p:-soup-contains('Meets:')",
+        'meets_fallback': ".time-and-location p.small:nth-of-type(3)",
+        'start_time': ".time-and-location .time-start",
+        'end_time': ".time-and-location .time-end",
+        'description': ".description p",
+    },
+}
+
+# ":-soup-contains" is BeautifulSoup-only; in the browser the "Meets:" paragraph is found by its own text
+MEETS_TEXT = "Meets:"
+BROWSER_MODAL_FIELDS = {field: selector for field, selector in LIFETIME_MODAL['fields'].items() if field != 'meets'}
+
+# --- In-page snapshot scripts ---
+# Each script runs inside the browser and returns plain JSON, so reading every
+# field of every card (or of the open modal) costs a single WebDriver round trip.
+# Selectors are passed in as arguments (see the *_ARGS tuples).
+CARD_SNAPSHOT_JS = """
+var cards = document.querySelectorAll(arguments[0]);
+var fields = arguments[1];
+var displayedOnly = arguments[2];
+function text(el) { return el ? (el.innerText || el.textContent || '').trim() : null; }
+function shown(el) { return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)); }
+return Array.prototype.map.call(cards, function (card, index) {
+    var raw = {index: index};
+    Object.keys(fields).forEach(function (field) {
+        var parts = fields[field].split('@');
+        var el = card.querySelector(parts[0]);
+        if (displayedOnly.indexOf(field) !== -1 && !shown(el)) {
+            raw[field] = null;
+        } else if (parts.length > 1) {
+            raw[field] = el ? el.getAttribute(parts[1]) : null;
+        } else {
+            raw[field] = text(el);
+        }
+    });
+    return raw;
+});
+"""
+CARD_SNAPSHOT_ARGS = (LIFETIME_LIST_SELECTOR, LIFETIME_CARD_FIELDS, list(LIFETIME_DISPLAYED_ONLY))
+
+# Scrolls to and clicks the "More Details" button of the card at arguments[2].
+# Returns false when the card or its button is missing.
+CLICK_DETAILS_JS = """
+var card = document.querySelectorAll(arguments[0])[arguments[2]];
+var button = card ? card.querySelector(arguments[1]) : null;
+if (!button || button.disabled) { return false; }
+button.scrollIntoView(true);
+button.click();
+return true;
+"""
+CLICK_DETAILS_ARGS = (LIFETIME_LIST_SELECTOR, LIFETIME_MODAL['trigger'])
+
+# Returns null until the modal is visible and its description has rendered,
+# so it doubles as the WebDriverWait condition.
+MODAL_SNAPSHOT_JS = """
+var modal = document.querySelector(arguments[0]);
+var fields = arguments[1];
+function text(el) { return el ? (el.innerText || el.textContent || '').trim() : null; }
+function shown(el) { return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)); }
+if (!shown(modal) || !modal.querySelector(fields.description)) { return null; }
+var raw = {meets: null};
+var paragraphs = modal.querySelectorAll("p");
+for (var i = 0; i < paragraphs.length; i++) {
+    var own = Array.prototype.filter.call(paragraphs[i].childNodes, function (node) {
+        return node.nodeType === Node.TEXT_NODE;
+    }).map(function (node) { return node.textContent; }).join('');
+    if (own.indexOf(arguments[2]) !== -1) { raw.meets = text(paragraphs[i]); break; }
+}
+Object.keys(fields).forEach(function (field) { raw[field] = text(modal.querySelector(fields[field])); });
+return raw;
+"""
+MODAL_SNAPSHOT_ARGS = (LIFETIME_MODAL['modal'], BROWSER_MODAL_FIELDS, MEETS_TEXT)
+
+def parse_card_snapshot(raw, location_name):
+    """Turns the raw fields of one camp card into cleaned card-level values.
+    
+    Args:
+        raw (dict): Card fields as returned by CARD_SNAPSHOT_JS (missing elements are None).
+        location_name (str): The name of the location (e.g., "Frisco").
+    
+    Returns:
+        dict: camp_name, camp_category, age_range, week, location, field_trip, price and availability.
+    
+    Raises:
+        ValueError: If the card has no name, category or age range.
+    """
+    camp_category = raw.get('category')
+    camp_name = raw.get('name')
+    age_range = raw.get('age_range')
+    if camp_category is None or camp_name is None or age_range is None:
+        raise ValueError(f"Card {raw.get('index')} is missing its name, category or age range")
+    
+    # Extract date(s)/week
+    if raw.get('date_start') is not None and raw.get('date_end') is not None:
+        week = f"{raw['date_start']} to {raw['date_end']}"
+    elif raw.get('date_label') is not None or raw.get('date_text') is not None:
+        # Use aria-label for the full date text, falling back to the text content
+        week = raw.get('date_label') or (raw.get('date_text') or "").replace('\\n', ' ')
+    else:
+        logger.warning(f"Could not find date element for camp {camp_name}")
+        week = "Date not found"
+    
+    if raw.get('location') is not None:
+        location = raw['location'].replace("Frisco", "Lifetime Fitness " + location_name)
+    else:
+        logger.error(f"Could not find location element for camp {camp_name}")
+        location = "Location not found"
+    
+    field_trip = raw.get('field_trip') or ""
+    # Clean up the prefix if present
+    if field_trip.startswith("Friday Field Trip:"):
+        field_trip = field_trip.replace("Friday Field Trip:", "").strip()
+    
+    # Extract price information
+    price = "N/A"
+    price_per_day = raw.get('price_per_day')
+    if price_per_day is not None:
+        price = f"${price_per_day} per day"
+        # Calculate weekly price (assuming 5 days, might need adjustment for shorter weeks)
+        try:
+            weekly_price = float(price_per_day) * 5
+            price = f"${price_per_day}/day (${weekly_price:.2f}/week)"
+        except ValueError:
+            logger.warning(f"Could not convert price '{price_per_day}' to float for weekly calculation.")
+    else:
+        logger.warning(f"Could not find price element for camp {camp_name}")
+    
+    return {
+        'camp_name': camp_name,
+        'camp_category': camp_category,
+        'age_range': age_range,
+        'week': week,
+        'location': location,
+        'field_trip': field_trip,
+        'price': price,
+        'availability': raw.get('availability') or "",
+    }
+
+def default_modal_details(camp_name, camp_category):
+    """Details used when the modal cannot be opened or read."""
+    return {
+        'days': "Not specified",
+        'start_time': "Not specified",
+        'end_time': "Not specified",
+        'description': f"Camp: {camp_name} ({camp_category}). Check website for full details.",
+    }
+
+def parse_modal_snapshot(raw, camp_name, camp_category):
+    """Turns the raw fields of an open details modal into days, times and description.
+    
+    Args:
+        raw (dict): Modal fields as returned by MODAL_SNAPSHOT_JS (missing elements are None).
+        camp_name (str): Camp name, used for logging and the fallback description.
+        camp_category (str): Camp category, used for the fallback description.
+    """
+    # Get detailed schedule (days)
+    if raw.get('meets') is not None:
+        days = raw['meets'].replace("Meets:", "").strip()
+    elif raw.get('meets_fallback') is not None:
+        days_info = raw['meets_fallback']
+        if "Meets:" in days_info: # Check if the fallback still contains the keyword
+            days = days_info.replace("Meets:", "").strip()
+        else:
+            logger.warning(f"Fallback 'days' selector did not contain 'Meets:' for {camp_name}. Text: {days_info}")
+            days = "Check website"
+    else:
+        logger.warning(f"Could not find days schedule in modal for {camp_name}. Using default.")
+        days = "Monday-Friday" # Assume default if not found
+    
+    start_time = raw.get('start_time')
+    if start_time is None:
+        logger.warning(f"Could not find start time in modal for {camp_name}")
+        start_time = ""
+    
+    end_time = raw.get('end_time')
+    if end_time is None:
+        logger.warning(f"Could not find end time in modal for {camp_name}")
+        end_time = ""
+    
+    description = raw.get('description')
+    if description is None:
+        logger.warning(f"Could not find description paragraph in modal for {camp_name}. Using default.")
+        description = f"Camp: {camp_name} ({camp_category})." # Basic description if modal one fails
+    
+    return {'days': days, 'start_time': start_time, 'end_time': end_time, 'description': description}
+
+def build_camp_record(organization, card_fields, details):
+    """Combines card fields and modal details into one REQUIRED_COLUMNS row."""
+    description = details['description']
+    # Append field trip info (from card) to description if available AND not empty
+    if card_fields['field_trip']:
+        description += f"\\n\\nFriday Field Trip: {card_fields['field_trip']}"
+    
+    return {
+        'Organization': organization,
+        'Camp Name': f"{card_fields['camp_name']} ({card_fields['camp_category']})",
+        'Week': card_fields['week'],
+        'Days': details['days'],
+        'Start Time': details['start_time'],
+        'End Time': details['end_time'],
+        'Location': card_fields['location'],
+        'Age Range': card_fields['age_range'],
+        'Grade Range': "",  # Not provided
+        'Price': card_fields['price'],
+        'Description': description,
+        'Email': "",  # Not provided
+        'Contact': ""  # Not provided
+    }
+
+def _element_text(parent, by, selector, displayed_only=False):
+    """Text of the first matching element, or None if it is missing (or hidden when displayed_only)."""
+    from selenium.common.exceptions import NoSuchElementException
+    try:
+        elem = parent.find_element(by, selector)
+    except NoSuchElementException:
+        return None
+    if displayed_only and not elem.is_displayed():
+        return None
+    return elem.text.strip()
+
+def read_card_elements(card, index):
+    """Reads one card field-by-field with WebDriver calls, in the CARD_SNAPSHOT_JS shape."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+    raw = {'index': index}
+    for field, selector in LIFETIME_CARD_FIELDS.items():
+        selector, _, attribute = selector.partition('@')
+        if not attribute:
+            raw[field] = _element_text(card, By.CSS_SELECTOR, selector,
+                                       displayed_only=field in LIFETIME_DISPLAYED_ONLY)
+            continue
+        try:
+            raw[field] = card.find_element(By.CSS_SELECTOR, selector).get_attribute(attribute)
+        except NoSuchElementException:
+            raw[field] = None
+    return raw
+
+def read_modal_elements(modal):
+    """Reads the open modal field-by-field with WebDriver calls, in the MODAL_SNAPSHOT_JS shape."""
+    from selenium.webdriver.common.by import By
+    raw = {'meets': _element_text(modal, By.XPATH, f".//p[contains(text(), '{MEETS_TEXT}')]")}
+    for field, selector in BROWSER_MODAL_FIELDS.items():
+        raw[field] = _element_text(modal, By.CSS_SELECTOR, selector)
+    return raw
+
+def open_details_modal(driver, card, index, extraction_mode, metrics=None):
+    """Clicks a card's "More Details" button and returns the raw modal fields.
+    
+    Raises:
+        TimeoutException: If the button, modal or description never becomes ready.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    metrics = metrics or ScrapeMetrics()
+    if extraction_mode == "snapshot":
+        with metrics.span("modal_click"):
+            clicked = driver.execute_script(CLICK_DETAILS_JS, *CLICK_DETAILS_ARGS, index)
+        if not clicked:
+            raise TimeoutException(f"No clickable details button on card {index + 1}")
+        # Wait for modal to appear and be ready; the condition itself returns the snapshot
+        with metrics.span("wait", condition="modal_ready"):
+            WebDriverWait(driver, 20).until(lambda d: d.execute_script(MODAL_SNAPSHOT_JS, *MODAL_SNAPSHOT_ARGS))
+        metrics.sleep(0.5, "modal_settle") # Small pause for content loading within modal
+        with metrics.span("modal_read"):
+            return driver.execute_script(MODAL_SNAPSHOT_JS, *MODAL_SNAPSHOT_ARGS) or {}
+    
+    with metrics.span("wait", condition="details_button"):
+        more_details_btn = WebDriverWait(card, 5).until(
+             EC.element_to_be_clickable((By.CSS_SELECTOR, LIFETIME_MODAL['trigger']))
+        )
+    with metrics.span("modal_click"):
+        # Scroll into view if necessary, sometimes helps with clicks
+        driver.execute_script("arguments[0].scrollIntoView(true);", more_details_btn)
+        metrics.sleep(0.2, "after_scroll") # Brief pause after scroll
+        driver.execute_script("arguments[0].click();", more_details_btn) # Use JS click for reliability
+    
+    # Wait for modal to appear and be ready (wait for description text)
+    with metrics.span("wait", condition="modal_ready"):
+        modal = WebDriverWait(driver, 15).until(
+            EC.visibility_of_element_located((By.CSS_SELECTOR, LIFETIME_MODAL['modal']))
+        )
+        # Wait specifically for description text to ensure content is loaded
+        WebDriverWait(modal, 5).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, LIFETIME_MODAL['fields']['description']))
+        )
+    metrics.sleep(0.5, "modal_settle") # Small pause for content loading within modal
+    with metrics.span("modal_read"):
+        return read_modal_elements(modal)
+
+def close_details_modal(driver, camp_name, metrics=None):
+    """Closes the details modal, falling back to the ESC key."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    metrics = metrics or ScrapeMetrics()
+    try:
+        with metrics.span("wait", condition="close_button"):
+            close_btn = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, LIFETIME_MODAL['close']))
+            )
+        # Use JavaScript click as regular click might be intercepted
+        driver.execute_script("arguments[0].click();", close_btn)
+        # Wait for modal to disappear
+        with metrics.span("wait", condition="modal_closed"):
+            WebDriverWait(driver, 10).until(
+                EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal-backdrop.fade.in")) # More specific selector for modal backdrop
+            )
+        metrics.sleep(0.5, "after_close") # Small pause after closing
+    except Exception as close_err:
+         logger.warning(f"Could not close modal cleanly for {camp_name}: {close_err}. Attempting to proceed.")
+         if isinstance(close_err, TimeoutException):
+             metrics.increment("timeouts", wait="modal_close")
+         metrics.increment("fallbacks", kind="esc_close")
+         # Try sending ESC key as a fallback
+         try:
+             from selenium.webdriver.common.keys import Keys
+             driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+             with metrics.span("wait", condition="modal_closed_esc"):
+                 WebDriverWait(driver, 5).until( # Wait a bit after ESC
+                    EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal-backdrop.fade.in"))
+                 )
+             metrics.sleep(0.5, "after_esc") # Pause after ESC
+         except Exception as esc_err:
+             metrics.increment("errors", kind="esc_close")
+             logger.error(f"Failed to close modal with ESC key: {esc_err}")
+
+def scrape_lifetime_camps(url, location_name="Frisco", max_retries=3, delay_between_retries=10,
+                          extraction_mode="snapshot", driver_pool=None, incremental=True, state_dir=None,
+                          resumable=True, resume=False, run_id=None, output_format="csv", metrics=None,
+                          output_dir=None):
     """Scrape Lifetime Fitness summer camp data.
     
     Args:
@@ -59,287 +416,314 @@ def scrape_lifetime_camps(url, location_name="Frisco", max_retries=3, delay_betw
         location_name (str): The name of the location (e.g., "Frisco").
         max_retries (int): Maximum number of attempts if initial load fails.
         delay_between_retries (int): Seconds to wait between retry attempts.
+        extraction_mode (str): "snapshot" reads all cards (and each modal) with one in-page
+            script call; "element" reads every field with its own WebDriver call.
+        driver_pool (DriverPool): Borrow browsers from this pool instead of starting
+            (and quitting) a new Chrome for every attempt.
+        incremental (bool): Reuse cached modal details for cards whose card-level fields
+            are unchanged since the last run (see scrape_state.py).
+        state_dir (str): Where the per-source state lives. Defaults to .scrape_state next to the script.
+        resumable (bool): Commit each scraped card to an append-only checkpoint so retries
+            resume from the first unprocessed card (see checkpoint.py). The checkpoint is removed
+            once the run completes.
+        resume (bool): Continue the newest unfinished checkpoint run of this club (e.g. after the
+            process was killed) instead of starting a new one.
+        run_id (str): Checkpoint run to resume. Defaults to a new run for this invocation.
+        output_format (str): "csv", "jsonl" or "parquet".
+        metrics (ScrapeMetrics): Record phase timings and timeout/fallback/retry counters here,
+            labelled with the club (see scrape_metrics.py).
+        output_dir (str): Where the output file goes. Defaults to the script directory.
+    
+    Rows are streamed to the output file as each card is read (see camp_sink.py); the file
+    replaces the previous one when the run ends, as long as at least one row was collected.
+    
+    Returns:
+        int: The number of camp rows written.
     """
+    if extraction_mode not in ("snapshot", "element"):
+        raise ValueError(f"Unknown extraction_mode: {extraction_mode}")
+    if output_format not in OUTPUT_FORMATS.values():
+        raise ValueError(f"Unknown output_format: {output_format}")
+    
     logger.info(f"===== Starting scrape for Lifetime Fitness Summer Camps at {location_name} (URL: {url}) =====")
     
     # Set up the output filename
-    csv_filename = os.path.join(SCRIPT_DIR, f'lifetime_camps_{location_name.lower().replace(" ", "_")}.csv')
+    source_slug = location_name.lower().replace(" ", "_")
+    csv_filename = os.path.join(output_dir or SCRIPT_DIR, f'lifetime_camps_{source_slug}.{output_format}')
+    metrics = (metrics or ScrapeMetrics()).bind(source=source_slug)
+    run_started = time.perf_counter()
     
     driver = None
-    camp_data_list = []
+    sink = None
     organization = "Lifetime Fitness"
+    scrape_completed = False
+    state_dir = state_dir or os.path.join(SCRIPT_DIR, '.scrape_state')
+    state_store = None
+    if incremental:
+        state_store = CardStateStore(f"lifetime_{source_slug}", state_dir)
     
-    for attempt in range(max_retries + 1):
-        if attempt > 0:
-            logger.info(f"Retry attempt {attempt} of {max_retries}")
-            time.sleep(delay_between_retries)
+    try:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        checkpoint = None
+        if resumable:
+            checkpoint_dir = os.path.join(state_dir, 'checkpoints')
+            if resume and run_id is None:
+                run_id = ScrapeCheckpoint.latest_run(f"lifetime_{source_slug}", checkpoint_dir)
+            checkpoint = ScrapeCheckpoint(f"lifetime_{source_slug}", checkpoint_dir, run_id)
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                logger.info(f"Retry attempt {attempt} of {max_retries}")
+                metrics.increment("retries")
+                metrics.sleep(delay_between_retries, "retry_delay")
         
-        try:
-            logger.info("Setting up Chrome driver...")
-            chrome_options = Options()
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-            
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+            driver_broken = False
+            try:
+                with metrics.span("driver_start", pooled=driver_pool is not None):
+                    if driver_pool is not None:
+                        logger.info("Borrowing Chrome driver from pool...")
+                        driver = driver_pool.acquire()
+                    else:
+                        logger.info("Setting up Chrome driver...")
+                        driver = create_chrome_driver()
             
-            logger.info(f"Navigating to {url}")
-            driver.get(url)
+                logger.info(f"Navigating to {url}")
+                with metrics.span("page_load"):
+                    driver.get(url)
             
-            # Wait for page to load and camp cards to appear
-            WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='campCard']"))
-            )
+                # Wait for page to load and camp cards to appear
+                try:
+                    with metrics.span("wait", condition="cards"):
+                        WebDriverWait(driver, 30).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, LIFETIME_LIST_SELECTOR))
+                        )
+                except TimeoutException:
+                    metrics.increment("timeouts", wait="cards")
+                    raise
             
-            # Find all camp cards
-            camp_cards = driver.find_elements(By.CSS_SELECTOR, "[data-testid='campCard']")
-            logger.info(f"Found {len(camp_cards)} camp cards")
+                # Find all camp cards
+                with metrics.span("card_list"):
+                    if extraction_mode == "snapshot":
+                        camp_cards = driver.execute_script(CARD_SNAPSHOT_JS, *CARD_SNAPSHOT_ARGS)
+                    else:
+                        camp_cards = driver.find_elements(By.CSS_SELECTOR, LIFETIME_LIST_SELECTOR)
+                logger.info(f"Found {len(camp_cards)} camp cards")
+                occurrences = {}
+                # Each attempt writes the cards of the page it loaded, from the first one
+                if sink is not None:
+                    sink.abort()
+                sink = CampRowSink(csv_filename, output_format)
             
-            for index, card in enumerate(camp_cards):
-                try:
-                    logger.info(f"Processing camp card {index+1} of {len(camp_cards)}")
-                    
-                    # Extract basic camp info from card
-                    camp_category = card.find_element(By.CSS_SELECTOR, ".h6").text.strip()
-                    camp_name = card.find_element(By.CSS_SELECTOR, ".h4").text.strip()
-                    logger.info(f"Processing camp: {camp_name} ({camp_category})")
-                    
-                    # Extract age range
-                    age_range = card.find_element(By.CSS_SELECTOR, "p.small.font-weight-bold").text.strip()
-                    
-                    # Extract date(s)/week
-                    week = ""
+                for index, card in enumerate(camp_cards):
+                    card_started = time.perf_counter()
                     try:
-                        # Check if it's a date range (has time-start and time-end)
-                        start_date_elem = card.find_element(By.CSS_SELECTOR, "time.time-start")
-                        end_date_elem = card.find_element(By.CSS_SELECTOR, "time.time-end")
-                        # Extract the user-visible text part (e.g., "Jun 2")
-                        start_date_text = start_date_elem.text.strip()
-                        # Extract the full date string (e.g., "Jun 6, 2025")
-                        end_date_text = end_date_elem.text.strip()
-                        week = f"{start_date_text} to {end_date_text}"
-                    except NoSuchElementException:
-                        # If not a range, assume single date
-                        try:
-                            date_elem = card.find_element(By.CSS_SELECTOR, "p.small.m-b-sm > span > time")
-                            week = date_elem.get_attribute('aria-label') # Use aria-label for the full date text
-                            if not week: # Fallback to text content if aria-label is empty
-                                week = date_elem.text.strip().replace('\\n', ' ')
-                        except NoSuchElementException:
-                             logger.warning(f"Could not find date element for camp {camp_name}")
-                             week = "Date not found"
+                        logger.info(f"Processing camp card {index+1} of {len(camp_cards)}")
                     
-                    # Extract location using CSS attribute selector
-                    try:
-                        location_elem = card.find_element(By.CSS_SELECTOR, "[id^='campLocation-']")
-                        location = location_elem.text.strip().replace("Frisco", "Lifetime Fitness " + location_name)
-                    except NoSuchElementException:
-                        logger.error(f"Could not find location element for camp {camp_name}")
-                        location = "Location not found"
-                        # Optionally, decide if you want to skip this card or continue with missing data
-                        # continue
+                        # Extract basic camp info from card
+                        with metrics.span("card_read"):
+                            raw_card = card if extraction_mode == "snapshot" else read_card_elements(card, index)
+                            card_fields = parse_card_snapshot(raw_card, location_name)
+                        camp_name = card_fields['camp_name']
+                        camp_category = card_fields['camp_category']
+                        logger.info(f"Processing camp: {camp_name} ({camp_category})")
                     
-                    # Check if field trip info exists ON THE CARD
-                    field_trip_card_text = ""
-                    try:
-                        field_trip_elem = card.find_element(By.CSS_SELECTOR, "[data-testid='fieldTrip']")
-                        if field_trip_elem.is_displayed():
-                            field_trip_card_text = field_trip_elem.text.strip()
-                            # Clean up the prefix if present
-                            if field_trip_card_text.startswith("Friday Field Trip:"):
-                                field_trip_card_text = field_trip_card_text.replace("Friday Field Trip:", "").strip()
-                    except NoSuchElementException:
-                        pass # Field trip element is optional
-                    
-                    # Extract price information
-                    price_per_day = "N/A"
-                    price = "N/A"
-                    try:
-                        price_per_day = card.find_element(By.CSS_SELECTOR, ".display-number-value").text.strip()
-                        price = f"${price_per_day} per day"
-                        # Calculate weekly price (assuming 5 days, might need adjustment for shorter weeks)
-                        try:
-                            weekly_price = float(price_per_day) * 5
-                            price = f"${price_per_day}/day (${weekly_price:.2f}/week)"
-                        except ValueError:
-                             logger.warning(f"Could not convert price '{price_per_day}' to float for weekly calculation.")
-                             # Keep the daily price format if conversion fails
-                    except NoSuchElementException:
-                        logger.warning(f"Could not find price element for camp {camp_name}")
+                        # Cards committed by an earlier attempt (or a resumed run) are not scraped again.
+                        # Keys follow the card content, not its position, so a changed page never
+                        # picks up another card's row.
+                        fingerprint = card_fingerprint(card_fields)
+                        occurrences[fingerprint] = occurrences.get(fingerprint, 0) + 1
+                        key = f"{fingerprint}:{occurrences[fingerprint]}"
+                        done = checkpoint.get(key) if checkpoint is not None else None
+                        if done is not None:
+                            logger.info(f"Skipping checkpointed camp {camp_name}")
+                            metrics.increment("cards", status="checkpointed")
+                            if state_store is not None and done['details'] and state_store.lookup(card_fields) is None:
+                                state_store.store(card_fields, done['details'])
+                            sink.write(done['record'])
+                            continue
                     
-                    # Check availability
-                    availability = ""
-                    try:
-                        availability_elem = card.find_element(By.CSS_SELECTOR, "p.availability span")
-                        if availability_elem.is_displayed():
-                            availability = availability_elem.text.strip()
-                    except NoSuchElementException:
-                        pass # Availability is optional
-                    
-                    # --- Click "More Details" to get full description and times ---
-                    days = "Not specified"
-                    start_time = "Not specified"
-                    end_time = "Not specified"
-                    description = f"Camp: {camp_name} ({camp_category}). Check website for full details." # Default description
-                    
-                    try:
-                        more_details_btn = WebDriverWait(card, 5).until(
-                             EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='moreDetailsBtn']"))
-                        )
-                        # Scroll into view if necessary, sometimes helps with clicks
-                        driver.execute_script("arguments[0].scrollIntoView(true);", more_details_btn)
-                        time.sleep(0.2) # Brief pause after scroll
-                        driver.execute_script("arguments[0].click();", more_details_btn) # Use JS click for reliability
-
-                        # Wait for modal to appear and be ready (wait for description text)
-                        modal = WebDriverWait(driver, 15).until(
-                            EC.visibility_of_element_located((By.CSS_SELECTOR, ".modal-body"))
-                        )
-                        # Wait specifically for description text to ensure content is loaded
-                        WebDriverWait(modal, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, ".description p"))
-                        )
-                        time.sleep(0.5) # Small pause for content loading within modal
-                        
-                        # Get detailed schedule (days)
-                        try:
-                            # Try the specific structure first based on the example
-                            days_info = modal.find_element(By.XPATH, ".//p[contains(text(), 'Meets:')]").text.strip() # Search within modal
-                            days = days_info.replace("Meets:", "").strip()
-                        except NoSuchElementException:
+                        # Unchanged cards reuse the details cached from an earlier run
+                        details = state_store.lookup(card_fields) if state_store is not None else None
+                        cacheable_details = details
+                        if details is not None:
+                            logger.info(f"Reusing cached details for unchanged camp {camp_name}")
+                            metrics.increment("cards", status="cached")
+                        else:
+                            # --- Click "More Details" to get full description and times ---
+                            details = default_modal_details(camp_name, camp_category)
                             try:
-                                # Fallback selector if the specific text isn't found
-                                days_info = modal.find_element(By.CSS_SELECTOR, ".time-and-location p.small:nth-of-type(3)").text.strip()
-                                if "Meets:" in days_info: # Check if the fallback still contains the keyword
-                                     days = days_info.replace("Meets:", "").strip()
-                                else:
-                                     logger.warning(f"Fallback 'days' selector did not contain 'Meets:' for {camp_name}. Text: {days_info}")
-                                     days = "Check website" # Or use days_info directly if appropriate
-                            except NoSuchElementException:
-                                logger.warning(f"Could not find days schedule in modal for {camp_name}. Using default.")
-                                days = "Monday-Friday" # Assume default if not found
-
-                        # Get times (Start/End) using more specific selectors from modal
-                        try:
-                            start_time_elem = modal.find_element(By.CSS_SELECTOR, ".time-and-location .time-start")
-                            start_time = start_time_elem.text.strip()
-                        except NoSuchElementException:
-                            logger.warning(f"Could not find start time in modal for {camp_name}")
-                            start_time = ""
-
-                        try:
-                            end_time_elem = modal.find_element(By.CSS_SELECTOR, ".time-and-location .time-end")
-                            end_time = end_time_elem.text.strip()
-                        except NoSuchElementException:
-                            logger.warning(f"Could not find end time in modal for {camp_name}")
-                            end_time = ""
-
-                        # Get full description from modal
-                        try:
-                            description_elem = modal.find_element(By.CSS_SELECTOR, ".description p")
-                            description = description_elem.text.strip()
-                        except NoSuchElementException:
-                            logger.warning(f"Could not find description paragraph in modal for {camp_name}. Using default.")
-                            description = f"Camp: {camp_name} ({camp_category})." # Basic description if modal one fails
-                        
-                        # Append field trip info (from card) to description if available AND not empty
-                        if field_trip_card_text:
-                             description += f"\\n\\nFriday Field Trip: {field_trip_card_text}"
-
-                        # Close the modal
-                        try:
-                            close_btn = WebDriverWait(driver, 5).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, ".modal-header .close"))
-                            )
-                            # Use JavaScript click as regular click might be intercepted
-                            driver.execute_script("arguments[0].click();", close_btn)
-                            # Wait for modal to disappear
-                            WebDriverWait(driver, 10).until(
-                                EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal-backdrop.fade.in")) # More specific selector for modal backdrop
-                            )
-                            time.sleep(0.5) # Small pause after closing
-                        except Exception as close_err:
-                             logger.warning(f"Could not close modal cleanly for {camp_name}: {close_err}. Attempting to proceed.")
-                             # Try sending ESC key as a fallback
-                             try:
-                                 from selenium.webdriver.common.keys import Keys
-                                 driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                                 WebDriverWait(driver, 5).until( # Wait a bit after ESC
-                                    EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal-backdrop.fade.in"))
-                                 )
-                                 time.sleep(0.5) # Pause after ESC
-                             except Exception as esc_err:
-                                 logger.error(f"Failed to close modal with ESC key: {esc_err}")
-
-                    except TimeoutException:
-                         logger.warning(f"Timed out waiting for modal details for {camp_name}. Using card data only.")
-                         # Use default description and times set earlier
-                         # Append field trip info if available from card
-                         if field_trip_card_text:
-                            description += f"\\n\\nFriday Field Trip: {field_trip_card_text}"
-                    except Exception as modal_err:
-                         logger.error(f"Error opening or processing modal for {camp_name}: {modal_err}")
-                         # Use default description and times set earlier
-                         # Append field trip info if available from card
-                         if field_trip_card_text:
-                             description += f"\\n\\nFriday Field Trip: {field_trip_card_text}"
-
-                    # Create data entry
-                    camp_data = {
-                        'Organization': organization,
-                        'Camp Name': f"{camp_name} ({camp_category})",
-                        'Week': week,
-                        'Days': days,
-                        'Start Time': start_time,
-                        'End Time': end_time,
-                        'Location': location,
-                        'Age Range': age_range,
-                        'Grade Range': "",  # Not provided
-                        'Price': price,
-                        'Description': description,
-                        'Email': "",  # Not provided
-                        'Contact': ""  # Not provided
-                    }
+                                with metrics.span("modal_open"):
+                                    raw_modal = open_details_modal(driver, card, index, extraction_mode, metrics)
+                                details = parse_modal_snapshot(raw_modal, camp_name, camp_category)
+                                cacheable_details = details
+                                if state_store is not None:
+                                    state_store.store(card_fields, details)
+                                with metrics.span("modal_close"):
+                                    close_details_modal(driver, camp_name, metrics)
+                                metrics.increment("cards", status="scraped")
+                            except TimeoutException:
+                                 logger.warning(f"Timed out waiting for modal details for {camp_name}. Using card data only.")
+                                 metrics.increment("timeouts", wait="modal")
+                                 metrics.increment("fallbacks", kind="card_only")
+                            except Exception as modal_err:
+                                 logger.error(f"Error opening or processing modal for {camp_name}: {modal_err}")
+                                 metrics.increment("fallbacks", kind="card_only")
                     
-                    camp_data_list.append(camp_data)
-                    logger.info(f"Added {camp_name} to data list")
+                        # Create data entry
+                        camp_data = build_camp_record(organization, card_fields, details)
+                        if checkpoint is not None:
+                            checkpoint.append(key, camp_data, cacheable_details)
+                        sink.write(camp_data)
+                        logger.info(f"Added {camp_name} to {csv_filename}")
+                        metrics.observe("card", time.perf_counter() - card_started)
                     
-                except Exception as e:
-                    logger.error(f"Error processing camp card {index+1}: {e}")
-                    continue
+                    except Exception as e:
+                        logger.error(f"Error processing camp card {index+1}: {e}")
+                        metrics.increment("cards", status="failed")
+                        continue
             
-            # If we've processed all cards successfully, break the retry loop
-            logger.info(f"Successfully processed {len(camp_data_list)} camp sessions")
-            break
+                # If we've processed all cards successfully, break the retry loop
+                scrape_completed = True
+                logger.info(f"Successfully processed {sink.rows_written} camp sessions")
+                break
             
-        except Exception as e:
-            logger.error(f"An error occurred during attempt {attempt + 1}: {e}")
-            if attempt == max_retries:
-                logger.error("Maximum retries reached. Scraping failed.")
-            else:
-                logger.info(f"Waiting {delay_between_retries} seconds before next retry...")
+            except Exception as e:
+                driver_broken = True
+                metrics.increment("errors", kind="attempt")
+                logger.error(f"An error occurred during attempt {attempt + 1}: {e}")
+                if attempt == max_retries:
+                    logger.error("Maximum retries reached. Scraping failed.")
+                else:
+                    logger.info(f"Waiting {delay_between_retries} seconds before next retry...")
         
-        finally:
-            if driver:
-                logger.info("Closing Chrome driver.")
-                driver.quit()
-                driver = None
-    
-    # Save all collected data to CSV
-    if camp_data_list:
-        save_to_csv(camp_data_list, csv_filename)
-    else:
-        logger.warning("No camp data was collected to save.")
+            finally:
+                if driver and driver_pool is not None:
+                    driver_pool.release(driver, broken=driver_broken)
+                    driver = None
+                elif driver:
+                    logger.info("Closing Chrome driver.")
+                    driver.quit()
+                    driver = None
+    except BaseException:
+        # Interrupted: leave the previous output in place (a checkpointed run can be resumed)
+        if sink is not None:
+            sink.abort()
+        raise
     
+    if checkpoint is not None:
+        if scrape_completed:
+            checkpoint.finish()
+        else:
+            logger.warning(f"Run {checkpoint.run_id} did not complete; continue it with --resume")
+    
+    # Only a complete run may prune cards from the incremental state
+    if scrape_completed and state_store is not None:
+        state_store.finish()
+    
+    rows_written = _finish_output(sink, metrics)
+    metrics.observe("run", time.perf_counter() - run_started)
+    metrics.increment("rows", rows_written)
     logger.info(f"===== Finished scrape for Lifetime Fitness at {location_name}. Check {csv_filename} =====")
-    return camp_data_list
+    return rows_written
+
+# Lifetime Fitness clubs in the Dallas-Fort Worth area, keyed by location name
+LIFETIME_CLUBS = {
+    "Plano": "https://my.lifetime.life/clubs/tx/plano/camps.html",
+    "Frisco": "https://my.lifetime.life/clubs/tx/frisco/camps.html",
+    "Allen": "https://my.lifetime.life/clubs/tx/allen/camps.html",
+    "Colleyville": "https://my.lifetime.life/clubs/tx/colleyville/camps.html",
+    "Flower Mound": "https://my.lifetime.life/clubs/tx/flower-mound/camps.html",
+    "Fort Worth": "https://my.lifetime.life/clubs/tx/fort-worth/camps.html",
+    "Southlake": "https://my.lifetime.life/clubs/tx/southlake/camps.html",
+}
+
+def scrape_lifetime_club(location_name, url, driver_pool, **scrape_kwargs):
+    """Per-club task for the club work queue. Never raises; returns a summary entry."""
+    started = time.monotonic()
+    try:
+        rows = scrape_lifetime_camps(url, location_name=location_name, driver_pool=driver_pool, **scrape_kwargs)
+        status = "ok" if rows else "empty"
+        error = ""
+    except Exception as e:
+        logger.error(f"Club task for {location_name} failed: {e}")
+        rows = 0
+        status = "failed"
+        error = str(e)
+    return {
+        'club': location_name,
+        'status': status,
+        'rows': rows,
+        'seconds': round(time.monotonic() - started, 1),
+        'error': error,
+    }
+
+def scrape_lifetime_clubs(clubs=None, pool_size=3, max_pages_per_driver=20, headless=True, **scrape_kwargs):
+    """Scrape several Lifetime clubs concurrently using a shared driver pool.
+    
+    Args:
+        clubs (dict): Location name -> camps page URL. Defaults to LIFETIME_CLUBS.
+        pool_size (int): Number of browsers (and club tasks) running at once.
+        max_pages_per_driver (int): Recycle a browser after this many club pages.
+        headless (bool): Run the pooled browsers headless.
+        **scrape_kwargs: Passed through to scrape_lifetime_camps.
+    
+    Returns:
+        list: One summary entry per club (status, rows, seconds, error).
+    """
+    clubs = clubs or LIFETIME_CLUBS
+    logger.info(f"===== Starting Lifetime scrape of {len(clubs)} clubs with {pool_size} browsers =====")
+    run_started = time.monotonic()
+    summary = []
+    
+    with DriverPool(size=pool_size, max_pages_per_driver=max_pages_per_driver, headless=headless) as pool:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures = [
+                executor.submit(scrape_lifetime_club, location_name, url, pool, **scrape_kwargs)
+                for location_name, url in clubs.items()
+            ]
+            for future in as_completed(futures):
+                summary.append(future.result())
+        pool_stats = dict(pool.stats)
+    
+    summary.sort(key=lambda entry: entry['club'])
+    total_seconds = time.monotonic() - run_started
+    failed = [entry['club'] for entry in summary if entry['status'] != "ok"]
+    logger.info("===== Lifetime club summary =====")
+    for entry in summary:
+        logger.info(f"{entry['club']:<15} {entry['status']:<7} {entry['rows']:>4} rows {entry['seconds']:>7.1f}s {entry['error']}")
+    logger.info(f"Drivers started: {pool_stats['started']}, recycled: {pool_stats['recycled']}, crashed: {pool_stats['crashed']}")
+    logger.info(f"Finished {len(summary)} clubs in {total_seconds:.1f}s; {len(failed)} without data: {', '.join(failed) or 'none'}")
+    return summary
 
 # --- Main Execution Block ---
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Scrape Lifetime Fitness camps for every DFW club (or the ones named).")
+    parser.add_argument("clubs", nargs="*", metavar="club", help=f"Club names (default: all of {', '.join(LIFETIME_CLUBS)})")
+    parser.add_argument("--pool-size", type=int, default=3, help="Browsers (and clubs) running at once")
+    parser.add_argument("--format", default="csv", choices=sorted(set(OUTPUT_FORMATS.values())))
+    parser.add_argument("--full", action="store_true", help="Open every modal instead of reusing unchanged cards")
+    parser.add_argument("--resume", action="store_true", help="Continue each club's last unfinished run")
+    parser.add_argument("--metrics-dir", default=os.path.join(SCRIPT_DIR, '.scrape_state'),
+                        help="Where metrics.json and metrics.prom are written")
+    args = parser.parse_args(argv)
+
+    unknown = [club for club in args.clubs if club not in LIFETIME_CLUBS]
+    if unknown:
+        parser.error(f"Unknown clubs: {', '.join(unknown)}")
+    clubs = {club: LIFETIME_CLUBS[club] for club in args.clubs} or LIFETIME_CLUBS
+    # Refresh every DFW Lifetime Fitness club
+    metrics = ScrapeMetrics()
+    summary = scrape_lifetime_clubs(clubs, pool_size=args.pool_size, output_format=args.format,
+                                    incremental=not args.full, resume=args.resume, metrics=metrics)
+    for line in metrics.summary_lines():
+        logger.info(line)
+    metrics.write(os.path.join(args.metrics_dir, 'metrics.json'))
+    metrics.write(os.path.join(args.metrics_dir, 'metrics.prom'))
+    # Non-zero exit status when any club came back without data
+    return 1 if any(entry['status'] != "ok" for entry in summary) else 0
+
 if __name__ == "__main__":
-    # URL for the Lifetime Fitness Plano summer camps page
-    lifetime_url = "https://my.lifetime.life/clubs/tx/plano/camps.html"
-    
-    # Run the scraper
-    scrape_lifetime_camps(lifetime_url, location_name="Plano")
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import csv
+import json
+import os
+
+import pytest
+
+from sources.camp_sink import REQUIRED_COLUMNS, CampRowSink, save_rows
+
+def rows(*names):
+    return [{'Organization': "Lifetime Plano", 'Camp Name': name, 'Price': "$57/day"} for name in names]
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def test_exception_mid_write_leaves_the_old_file_intact(tmp_path):
+    path = str(tmp_path / "lifetime_camps_plano.csv")
+    assert save_rows(rows("Soccer Stars", "Swim School"), path) == 2
+
+    with pytest.raises(RuntimeError):
+        with CampRowSink(path) as sink:
+            sink.write(rows("Art Lab")[0])
+            raise RuntimeError("scrape failed halfway")
+
+    assert [row['Camp Name'] for row in read_csv(path)] == ["Soccer Stars", "Swim School"]
+    assert os.listdir(tmp_path) == ["lifetime_camps_plano.csv"]  # No temp file left behind
+
+def test_rows_only_appear_on_close(tmp_path):
+    path = str(tmp_path / "lifetime_camps_plano.jsonl")
+    sink = CampRowSink(path)
+    sink.write_rows(rows("Soccer Stars"))
+    assert not os.path.exists(path)
+    sink.close()
+    with open(path, encoding='utf-8') as f:
+        record = json.loads(f.readline())
+    assert list(record) == REQUIRED_COLUMNS
+    assert (record['Camp Name'], record['Email']) == ("Soccer Stars", "")
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from sources.camp_snapshot import VIEW_COLUMNS, VIEW_SQL, CampSnapshot
+from sources.load_camps import SCHEMA, connect_sqlite, load_camps, seed_from_manual_csvs
+
+# Each case: snapshot filters and the WHERE clause the API would run on vw_camps for them
+CASES = [
+    ({}, "1=1"),
+    ({'max_price': 400}, "price <= 400"),
+    ({'min_age': 6, 'max_age': 9}, "min_age <= 9 AND max_age >= 6"),
+    ({'min_age': 13}, "max_age >= 13"),
+    ({'interests': ["Arts", "Technology"]}, "category IN ('Arts', 'Technology')"),
+    ({'week_from': "2025-06-09", 'week_to': "2025-06-30"}, "week_of BETWEEN '2025-06-09' AND '2025-06-30'"),
+    ({'featured': True, 'max_price': 700}, "featured = 1 AND price <= 700"),
+    ({'featured': False, 'min_age': 7, 'max_age': 7, 'interests': ["Technology"]},
+     "featured = 0 AND min_age <= 7 AND max_age >= 7 AND category = 'Technology'"),
+]
+
+@pytest.fixture(scope="module")
+def conn():
+    conn = connect_sqlite(":memory:")
+    seed_from_manual_csvs(conn)
+    # Loader-owned programs have no category, featured flag or rating, as after a real load
+    load_camps(conn, pd.DataFrame([{
+        'organization': "Code Ninjas", 'camp_name': name, 'location': "Code Ninjas Plano",
+        'description': name, 'start_date': pd.Timestamp(week), 'min_age': 7, 'max_age': 14,
+        'price_per_week': price, 'price_per_day': None,
+    } for name, week, price in [("Minecraft Modding", "2025-06-09", 300.0), ("Robotics", "2025-06-16", 350.0)]]))
+    yield conn
+    conn.close()
+
+def view_rows(conn, where):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT * FROM ({VIEW_SQL.format(schema=SCHEMA)}) WHERE {where}")
+    return [dict(zip(VIEW_COLUMNS, values)) for values in cursor.fetchall()]
+
+def key(row):
+    return (row['program_id'], row['week_of'])
+
+@pytest.mark.parametrize("filters,where", CASES)
+def test_query_matches_the_view(conn, filters, where, tmp_path):
+    snapshot = CampSnapshot.from_connection(conn, schema=SCHEMA)
+    expected = sorted(view_rows(conn, where), key=key)
+    assert len(expected) == snapshot.count(**filters)
+    assert sorted(snapshot.query(**filters), key=key) == expected
+    # The saved copy answers the same way from its stored indexes
+    path = str(tmp_path / "camps_snapshot.arrow")
+    snapshot.save(path)
+    assert sorted(CampSnapshot.load(path).query(**filters), key=key) == expected
+
+def test_rows_come_cheapest_first(conn):
+    prices = [row['price'] for row in CampSnapshot.from_connection(conn, schema=SCHEMA).query()]
+    assert prices == sorted(prices)
@@ -0,0 +1,27 @@
+from sources.checkpoint import ScrapeCheckpoint
+
+def row(name):
+    return {'Camp Name': name, 'Days': "Mon - Fri"}
+
+def test_resume_skips_a_truncated_last_line_and_keeps_appending(tmp_path):
+    checkpoint = ScrapeCheckpoint("lifetime_plano", str(tmp_path), run_id="run1")
+    checkpoint.append("a:0", row("Soccer Stars"))
+    checkpoint.append("b:0", row("Swim School"))
+    # Simulate a crash halfway through writing the second entry
+    with open(checkpoint.path, 'rb+') as f:
+        data = f.read()
+        f.truncate(len(data) - 12)
+
+    run_id = ScrapeCheckpoint.latest_run("lifetime_plano", str(tmp_path))
+    assert run_id == "run1"
+    resumed = ScrapeCheckpoint("lifetime_plano", str(tmp_path), run_id=run_id)
+    assert len(resumed) == 1
+    assert resumed.get("a:0")['record'] == row("Soccer Stars")
+    assert resumed.get("b:0") is None
+
+    resumed.append("b:0", row("Swim School"))
+    again = ScrapeCheckpoint("lifetime_plano", str(tmp_path), run_id="run1")
+    assert [again.get(key)['record']['Camp Name'] for key in ("a:0", "b:0")] == ["Soccer Stars", "Swim School"]
+
+    again.finish()
+    assert ScrapeCheckpoint.latest_run("lifetime_plano", str(tmp_path)) is None
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from sources.dedupe import dedupe_camps
+
+def records(*rows):
+    """A normalize_camps-shaped frame from (source, organization, camp_name, location) tuples, all in one week."""
+    return pd.DataFrame([{
+        'source': source, 'organization': organization, 'camp_name': camp_name, 'location': location,
+        'start_date': pd.Timestamp("2025-06-02"), 'end_date': pd.Timestamp("2025-06-06"),
+        'start_minutes': 540, 'min_age': 7, 'max_age': 11,
+    } for source, organization, camp_name, location in rows])
+
+def test_near_duplicate_programs_merge_across_sources():
+    frame = records(
+        ("lifetime", "iCode Plano", "Minecraft Modding Camp", "1000 Main St"),
+        ("flyers", "iCode mckinney", "Minecraft Modeling Camp", "1000 Main St."),
+        ("flyers", "iCode", "Robotics Camp", "1000 Main St"),
+        ("lifetime", "iCode", "Half Day AM Robotics", "1000 Main St"),
+        ("lifetime", "iCode", "Half Day PM Robotics", "1000 Main St"),
+    )
+    records_out, programs, sessions, stats = dedupe_camps(frame)
+
+    program = records_out['program_id']
+    assert program[0] == program[1]  # One typo apart, same organization once city names are dropped
+    assert program[1] != program[2]
+    assert program[3] != program[4]  # AM and PM sessions are different programs
+    assert stats['programs'] == 4
+    merged = sessions.set_index('session_id').loc[records_out['session_id'][0]]
+    assert merged['records'] == 2
+    assert merged['sources'] == "flyers; lifetime"
+    assert merged['merged_from'] == "lifetime:0; flyers:0"
+    assert stats['duplicate_records'] == 1
+
+def test_same_name_at_different_organizations_stays_apart():
+    frame = records(("lifetime", "YMCA", "Summer Day Camp", "A"), ("flyers", "Camp Gladiator", "Summer Day Camp", "A"))
+    records_out, programs, sessions, stats = dedupe_camps(frame)
+    assert records_out['program_id'].nunique() == 2
+    assert stats['duplicate_records'] == 0
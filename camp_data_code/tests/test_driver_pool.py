@@ -0,0 +1,66 @@
+import queue
+import threading
+
+import pytest
+
+from sources import driver_pool
+from sources.driver_pool import DriverPool
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser is gone")
+        return 1
+
+    def quit(self):
+        self.alive = False
+
+@pytest.fixture(autouse=True)
+def fake_chrome(monkeypatch):
+    monkeypatch.setattr(driver_pool, "create_chrome_driver", lambda driver_path, headless: FakeDriver())
+
+def acquire_in_thread(pool):
+    acquired = queue.Queue()
+    thread = threading.Thread(target=lambda: acquired.put(pool.acquire()), daemon=True)
+    thread.start()
+    return acquired
+
+def test_waiter_gets_a_replacement_when_a_driver_crashes():
+    pool = DriverPool(size=1, driver_path="chromedriver", acquire_timeout=30)
+    first = pool.acquire()
+    acquired = acquire_in_thread(pool)
+    pool.release(first, broken=True)
+    replacement = acquired.get(timeout=5)
+    assert replacement is not first and replacement.alive
+    assert pool.stats == {'started': 2, 'recycled': 0, 'crashed': 1}
+
+def test_waiter_gets_the_released_driver():
+    pool = DriverPool(size=1, driver_path="chromedriver", acquire_timeout=30)
+    first = pool.acquire()
+    acquired = acquire_in_thread(pool)
+    pool.release(first)
+    assert acquired.get(timeout=5) is first
+
+def test_unhealthy_idle_driver_is_replaced_and_close_wakes_waiters():
+    pool = DriverPool(size=1, driver_path="chromedriver", acquire_timeout=30)
+    first = pool.acquire()
+    pool.release(first)
+    first.alive = False
+    second = pool.acquire()
+    assert second is not first and pool.stats['crashed'] == 1
+
+    errors = queue.Queue()
+    thread = threading.Thread(target=lambda: errors.put(pytest.raises(RuntimeError, pool.acquire)), daemon=True)
+    thread.start()
+    pool.close()
+    thread.join(timeout=5)
+    assert not thread.is_alive() and not errors.empty()
+
+def test_acquire_times_out_when_every_driver_is_busy():
+    pool = DriverPool(size=1, driver_path="chromedriver", acquire_timeout=0.1)
+    pool.acquire()
+    with pytest.raises(queue.Empty):
+        pool.acquire()
@@ -0,0 +1,81 @@
+import base64
+import json
+import os
+
+import requests
+
+from sources import driver_pool, web_scrape
+from sources.fixture_server import TRAFFIC_FILENAME, FixtureServer, record_page_traffic, xhr_responses
+
+PAGE_URL = "https://my.lifetime.life/clubs/tx/plano/camps.html"
+LISTING_URL = "https://api.example.test/camps?club=plano"
+DETAIL_URL = "https://api.example.test/camps/{index}"
+
+def log_entry(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+def exchange(request_id, url, resource_type="XHR", method="GET"):
+    return [
+        log_entry("Network.requestWillBeSent", requestId=request_id, type=resource_type,
+                  request={'url': url, 'method': method}),
+        log_entry("Network.responseReceived", requestId=request_id, type=resource_type,
+                  response={'url': url, 'status': 200, 'mimeType': "application/json"}),
+    ]
+
+class FakeDriver:
+    """Chrome with a performance log: the listing on load, one detail request per opened dialog."""
+
+    def __init__(self):
+        self.log = (exchange("doc", PAGE_URL, resource_type="Document") + exchange("list", LISTING_URL)
+                    + exchange("beacon", "https://metrics.example.test/collect", method="POST"))
+        self.bodies = {'list': {'body': json.dumps({'camps': [1, 2]}), 'base64Encoded': False}}
+        self.page_source = "<html><body><div data-testid='campCard'></div></body></html>"
+
+    def get(self, url):
+        pass
+
+    def find_element(self, *args):
+        return object()
+
+    def execute_script(self, script, *args):
+        return [{'name': "Camp A"}, {'name': "Camp B"}]
+
+    def open_dialog(self, index):
+        request_id = f"detail{index}"
+        self.log += exchange(request_id, DETAIL_URL.format(index=index), resource_type="Fetch")
+        self.bodies[request_id] = {'body': base64.b64encode(b'{"id": %d}' % index).decode(), 'base64Encoded': True}
+
+    def get_log(self, kind):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        return self.bodies[params['requestId']]
+
+    def quit(self):
+        pass
+
+def test_xhr_responses_keep_only_xhr_and_fetch():
+    entries = exchange("doc", PAGE_URL, resource_type="Document") + exchange("list", LISTING_URL)
+    assert xhr_responses(entries) == [{'request_id': "list", 'method': "GET", 'url': LISTING_URL,
+                                       'status': 200, 'content_type': "application/json"}]
+
+def test_recorder_saves_the_page_and_its_own_requests(tmp_path, monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(driver_pool, "create_chrome_driver", lambda *args, **kwargs: driver)
+    monkeypatch.setattr(web_scrape, "open_details_modal", lambda driver, card, index, mode: driver.open_dialog(index))
+    monkeypatch.setattr(web_scrape, "close_details_modal", lambda driver, name: None)
+    fixtures_dir = str(tmp_path / "fixtures")
+
+    recorded = record_page_traffic(PAGE_URL, fixtures_dir)
+    assert [(entry['method'], entry['url']) for entry in recorded] == [
+        ("GET", LISTING_URL), ("POST", "https://metrics.example.test/collect"),
+        ("GET", DETAIL_URL.format(index=0)), ("GET", DETAIL_URL.format(index=1))]
+    assert recorded[1]['fixture'] is None  # Only GETs can be replayed
+    with open(os.path.join(fixtures_dir, TRAFFIC_FILENAME), encoding='utf-8') as f:
+        assert json.load(f) == recorded
+
+    with FixtureServer(fixtures_dir) as server:
+        assert "campCard" in requests.get(server.base_url + "/clubs/tx/plano/camps.html").text
+        assert requests.get(server.base_url + "/camps?club=plano").json() == {'camps': [1, 2]}
+        assert requests.get(server.base_url + "/camps/1").json() == {'id': 1}
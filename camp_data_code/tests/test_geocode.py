@@ -0,0 +1,33 @@
+from sources.geocode import GeocodeCache, Geocoder, PlaceGazetteer, SpatialIndex, ZipGazetteer, normalize_address
+
+def test_cached_misses_are_retried_with_new_gazetteers(tmp_path):
+    path = str(tmp_path / "geocode_cache.sqlite")
+    zips = ZipGazetteer({'75034': (33.1, -96.8)})
+    places = PlaceGazetteer({'FRISCO': (33.15, -96.82)})
+    assert Geocoder([zips], GeocodeCache(path)).geocode("Lifetime Fitness, Frisco") is None
+    assert Geocoder([zips, places], GeocodeCache(path)).geocode("Lifetime Fitness, Frisco") == (33.15, -96.82, 'city')
+
+def test_nearest_with_k_zero_is_empty():
+    index = SpatialIndex([33.0, 33.1], [-96.8, -96.7])
+    ids, miles = index.nearest(33.0, -96.8, k=0)
+    assert len(ids) == 0 and len(miles) == 0
+    assert index.nearest(33.0, -96.8, k=5)[0].tolist() == [0, 1]
+
+PLACES = {'AUSTIN': (30.30, -97.75), 'WEST': (31.80, -97.09), 'DALLAS': (32.79, -96.77),
+          'FRISCO': (33.15, -96.82), 'FORT WORTH': (32.78, -97.35)}
+
+def test_place_fallback_never_guesses_from_free_text():
+    places = PlaceGazetteer(PLACES)
+    assert places.locate(normalize_address("Austin Elementary")) is None
+    assert places.locate(normalize_address("iCode West Frisco")) is None
+    assert places.locate(normalize_address("Dallas Zoo")) is None
+
+def test_place_fallback_reads_explicit_cities_in_the_service_area():
+    places = PlaceGazetteer(PLACES)
+    assert places.locate(normalize_address("Lifetime Fitness, Frisco")) == PLACES['FRISCO']
+    assert places.locate(normalize_address("Dallas Zoo, Dallas, TX")) == PLACES['DALLAS']
+    assert places.locate(normalize_address("6500 Preston Rd Fort Worth, TX")) == PLACES['FORT WORTH']
+    assert places.locate(normalize_address("Frisco")) == PLACES['FRISCO']
+    # Austin is outside the DFW service area, however explicitly it is named
+    assert places.locate(normalize_address("Camp Mabry, Austin, TX")) is None
+    assert places.locate(normalize_address("Main St, Frisco, OK")) is None
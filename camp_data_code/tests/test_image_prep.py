@@ -0,0 +1,34 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+from sources.image_prep import ImagePreprocessor
+
+def schedule_page(path, rows=30):
+    """A tall page of identical session blocks, like a weekly schedule table."""
+    image = Image.new("RGB", (400, rows * 80), "white")
+    draw = ImageDraw.Draw(image)
+    for row in range(rows):
+        top = row * 80
+        draw.rectangle((10, top + 10, 390, top + 70), outline="black", width=2)
+        draw.rectangle((20, top + 20, 180, top + 35), fill="black")
+        draw.rectangle((20, top + 45, 300, top + 55), fill="gray")
+    image.save(path)
+
+def test_tiles_of_one_repeating_page_are_all_kept(tmp_path):
+    page = str(tmp_path / "schedule.png")
+    schedule_page(page)
+    prepared, report = ImagePreprocessor(str(tmp_path / "cache")).prepare([page])
+    assert report['tiles'] > 1
+    assert report['duplicates_dropped'] == 0
+    assert len(prepared) == report['tiles']
+
+def test_tiles_repeated_in_another_image_are_dropped(tmp_path):
+    first, second = str(tmp_path / "page1.png"), str(tmp_path / "page2.png")
+    schedule_page(first)
+    schedule_page(second)
+    single, single_report = ImagePreprocessor(str(tmp_path / "cache")).prepare([first])
+    prepared, report = ImagePreprocessor(str(tmp_path / "cache")).prepare([first, second])
+    assert prepared == single
+    assert report['duplicates_dropped'] == single_report['tiles']
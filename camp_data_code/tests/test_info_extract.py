@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from sources.info_extract import RateLimitError, ResponseCache, StubBackend, extract_flyers
+
+def write_image(path, content=b"flyer"):
+    path.write_bytes(content)
+    return str(path)
+
+def by_name(results):
+    return {result['name']: result for result in results}
+
+def test_cache_miss_then_hit(tmp_path):
+    image = write_image(tmp_path / "flyer.png")
+    cache = ResponseCache(str(tmp_path / "cache"))
+    backend = StubBackend()
+
+    first = list(extract_flyers([("flyer", [image])], backend, cache))
+    second = list(extract_flyers([("renamed", [image])], backend, cache))
+    assert first[0]['cached'] is False and first[0]['error'] is None
+    assert second[0]['cached'] is True
+    assert second[0]['csv'] == first[0]['csv']
+    assert backend.calls == 1
+
+    write_image(tmp_path / "flyer.png", b"edited flyer")
+    third = list(extract_flyers([("flyer", [image])], backend, cache))
+    assert third[0]['cached'] is False
+    assert backend.calls == 2
+
+def test_rate_limit_backoff_retries_then_succeeds(tmp_path):
+    image = write_image(tmp_path / "flyer.png")
+    backend = StubBackend(rate_limit_failures=2)
+    results = list(extract_flyers([("flyer", [image])], backend, base_delay=0.01, max_retries=5))
+    assert results[0]['error'] is None
+    assert backend.calls == 3
+
+def test_rate_limit_gives_up_after_max_retries(tmp_path):
+    image = write_image(tmp_path / "flyer.png")
+    backend = StubBackend(rate_limit_failures=10)
+    results = list(extract_flyers([("flyer", [image])], backend, base_delay=0.01, max_retries=2))
+    assert results[0]['csv'] is None
+    assert "rate limit" in results[0]['error']
+    assert backend.calls == 3
+
+def test_rate_limit_pauses_every_worker(tmp_path):
+    images = [write_image(tmp_path / f"flyer{index}.png", bytes([index])) for index in range(4)]
+    calls = []
+
+    class RateLimitedOnce(StubBackend):
+        def generate(self, image_paths, prompt):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise RateLimitError("slow down", retry_after=0.3)
+            return super().generate(image_paths, prompt)
+
+    started = time.monotonic()
+    jobs = [(f"flyer{index}", [path]) for index, path in enumerate(images)]
+    results = list(extract_flyers(jobs, RateLimitedOnce(latency=0.05), max_workers=1, base_delay=0.01))
+    assert all(result['error'] is None for result in results)
+    # Calls after the rate limit wait for the shared cooldown
+    assert all(call - started >= 0.3 for call in calls[1:])
+
+def test_results_stream_in_completion_order(tmp_path):
+    slow = write_image(tmp_path / "slow.png", b"slow")
+    fast = write_image(tmp_path / "fast.png", b"fast")
+
+    def respond(image_paths):
+        if image_paths[0] == slow:
+            time.sleep(0.3)
+        return "Organization,Camp Name\nOrg,Camp\n"
+
+    results = extract_flyers([("slow", [slow]), ("fast", [fast])], StubBackend(response=respond), max_workers=2)
+    assert next(results)['name'] == "fast"
+    assert next(results)['name'] == "slow"
+
+def test_unreadable_image_fails_only_its_flyer(tmp_path):
+    pytest.importorskip("PIL")
+    from PIL import Image
+    from sources.image_prep import ImagePreprocessor
+    good = str(tmp_path / "good.png")
+    with Image.new("RGB", (200, 100), "white") as image:
+        image.paste((0, 0, 0), (20, 20, 180, 80))
+        image.save(good)
+    corrupt = write_image(tmp_path / "corrupt.png", b"\x89PNG\r\n\x1a\n not really a png")
+    missing = str(tmp_path / "missing.png")
+
+    jobs = [("good", [good]), ("corrupt", [corrupt]), ("missing", [missing])]
+    results = by_name(extract_flyers(jobs, StubBackend(), ResponseCache(str(tmp_path / "cache")),
+                                     preprocessor=ImagePreprocessor(str(tmp_path / "prep"))))
+    assert results['good']['error'] is None
+    assert results['corrupt']['csv'] is None and results['corrupt']['error']
+    assert results['missing']['csv'] is None and results['missing']['error']
+
+def test_blank_flyer_is_reported_not_sent(tmp_path):
+    pytest.importorskip("PIL")
+    from PIL import Image
+    from sources.image_prep import ImagePreprocessor
+    blank = str(tmp_path / "blank.png")
+    Image.new("RGB", (300, 400), "white").save(blank)
+    backend = StubBackend()
+    results = list(extract_flyers([("blank", [blank])], backend,
+                                  preprocessor=ImagePreprocessor(str(tmp_path / "prep"))))
+    assert results[0]['csv'] is None
+    assert "blank" in results[0]['error']
+    assert backend.calls == 0
@@ -0,0 +1,149 @@
+import csv
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+from sources.load_camps import (MANUAL_DATA_DIR, SCHEMA, TABLES, build_desired_state, connect_sqlite, diff_tables,
+                                fetch_table, is_loader_owned, load_camps, seed_from_manual_csvs)
+
+def sessions(*rows):
+    """A normalize_camps-shaped frame from (organization, camp_name, start_date, price_per_week) tuples."""
+    return pd.DataFrame([{
+        'organization': organization, 'camp_name': camp_name, 'location': f"{organization} campus",
+        'description': f"{camp_name} at {organization}", 'start_date': pd.Timestamp(start_date),
+        'min_age': 6, 'max_age': 12, 'price_per_week': price, 'price_per_day': None,
+    } for organization, camp_name, start_date, price in rows])
+
+CORPUS = [
+    ("Code Ninjas", "Minecraft Modding", "2025-06-02", 300.0),
+    ("Code Ninjas", "Minecraft Modding", "2025-06-09", 300.0),
+    ("Code Ninjas", "Robotics", "2025-06-02", 350.0),
+    ("YMCA", "Summer Day Camp", "2025-06-02", 200.0),
+]
+
+def manual_rows(table):
+    with open(os.path.join(MANUAL_DATA_DIR, f"{table}.csv"), encoding='utf-8', errors='replace', newline='') as f:
+        return list(csv.DictReader(f))
+
+def snapshot(conn):
+    return {table: fetch_table(conn, table) for table in TABLES}
+
+def manual_state(conn):
+    state = snapshot(conn)
+    return {
+        'institutes': {key: row for key, row in state['institutes'].items() if not is_loader_owned(key[0], "I")},
+        'programs': {key: row for key, row in state['programs'].items() if not is_loader_owned(key[0], "C")},
+        'camp_details': {key: row for key, row in state['camp_details'].items() if not is_loader_owned(key[0], "C")},
+    }
+
+@pytest.fixture
+def conn():
+    conn = connect_sqlite(":memory:")
+    seed_from_manual_csvs(conn)
+    yield conn
+    conn.close()
+
+def test_seed_matches_manual_csvs(conn):
+    for table in TABLES:
+        assert len(fetch_table(conn, table)) == len(manual_rows(table))
+    assert not any(is_loader_owned(key[0], "I") for key in fetch_table(conn, 'institutes'))
+
+def test_first_load_inserts_owned_rows(conn):
+    counts = load_camps(conn, sessions(*CORPUS))
+    assert counts['institutes'] == {'insert': 2, 'update': 0, 'delete': 0}
+    assert counts['programs'] == {'insert': 3, 'update': 0, 'delete': 0}
+    assert counts['camp_details'] == {'insert': 4, 'update': 0, 'delete': 0}
+    institutes = fetch_table(conn, 'institutes')
+    owned = {row['institute_nm']: key[0] for key, row in institutes.items() if is_loader_owned(key[0], "I")}
+    assert set(owned) == {"Code Ninjas", "YMCA"}
+    programs = fetch_table(conn, 'programs')
+    assert {row['program_nm'] for key, row in programs.items() if row['institute_id'] == owned["Code Ninjas"]} == \
+        {"Minecraft Modding", "Robotics"}
+
+def test_second_load_is_a_no_op(conn):
+    load_camps(conn, sessions(*CORPUS))
+    before = snapshot(conn)
+    counts = load_camps(conn, sessions(*CORPUS))
+    assert all(action == 0 for table_counts in counts.values() for action in table_counts.values())
+    assert snapshot(conn) == before
+
+def test_update_and_delete_diffs(conn):
+    load_camps(conn, sessions(*CORPUS))
+    programs = fetch_table(conn, 'programs')
+    robotics = next(key[0] for key, row in programs.items() if row['program_nm'] == "Robotics")
+    modding = next(key[0] for key, row in programs.items() if row['program_nm'] == "Minecraft Modding")
+    # Hand-curated column on a loader-owned program survives updates
+    conn.execute(f"UPDATE {SCHEMA}.programs SET rating = 4.5 WHERE program_id = ?", (modding,))
+    conn.commit()
+
+    changed = [
+        ("Code Ninjas", "Minecraft Modding", "2025-06-02", 325.0),  # price change
+        ("YMCA", "Summer Day Camp", "2025-06-02", 200.0),
+    ]  # Robotics and the 06-09 Modding week are gone
+    counts = load_camps(conn, sessions(*changed))
+    assert counts['programs'] == {'insert': 0, 'update': 0, 'delete': 1}
+    assert counts['camp_details'] == {'insert': 0, 'update': 1, 'delete': 2}
+
+    programs = fetch_table(conn, 'programs')
+    assert (robotics,) not in programs
+    assert programs[(modding,)]['rating'] == 4.5
+    weeks = fetch_table(conn, 'camp_details')
+    assert weeks[(modding, "2025-06-02")]['price'] == 325.0
+    assert (modding, "2025-06-09") not in weeks
+
+def test_ids_are_stable_across_loads(conn):
+    load_camps(conn, sessions(*CORPUS))
+    ids = {key: row for key, row in fetch_table(conn, 'programs').items()}
+    load_camps(conn, sessions(("Abrakadoodle", "Cartooning", "2025-06-16", 250.0), *CORPUS))
+    programs = fetch_table(conn, 'programs')
+    for key, row in ids.items():
+        assert programs[key]['program_nm'] == row['program_nm']
+    new_ids = [key[0] for key, row in programs.items() if row['program_nm'] == "Cartooning"]
+    assert len(new_ids) == 1 and is_loader_owned(new_ids[0], "C")
+    assert new_ids[0] > max(key[0] for key in ids)
+
+def test_manual_institutes_are_never_touched(conn):
+    manual = manual_state(conn)
+    manual_name = next(iter(manual['institutes'].values()))['institute_nm']
+    load_camps(conn, sessions((manual_name, "New Scraped Camp", "2025-06-02", 999.0), *CORPUS))
+    assert manual_state(conn) == manual
+    assert not any(row['program_nm'] == "New Scraped Camp" for row in fetch_table(conn, 'programs').values())
+
+def test_disappeared_source_is_deleted(conn):
+    manual = manual_state(conn)
+    load_camps(conn, sessions(*CORPUS))
+    counts = load_camps(conn, sessions(*[row for row in CORPUS if row[0] != "YMCA"]))
+    assert counts['institutes']['delete'] == 1
+    assert counts['programs']['delete'] == 1
+    assert counts['camp_details']['delete'] == 1
+    assert not any(row['institute_nm'] == "YMCA" for row in fetch_table(conn, 'institutes').values())
+    assert manual_state(conn) == manual
+
+class DateCursor:
+    """SQLite cursor that returns ISO date text as datetime.date, the way pymysql reads a DATE column."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=()):
+        self.rows = self.conn.execute(sql, params).fetchall()
+
+    def fetchall(self):
+        as_date = lambda value: (datetime.date.fromisoformat(value)
+                                 if isinstance(value, str) and len(value) == 10 and value[4] == "-" else value)
+        return [tuple(map(as_date, row)) for row in self.rows]
+
+class DateConnection:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self):
+        return DateCursor(self.conn)
+
+def test_mysql_date_keys_diff_as_no_op(conn):
+    load_camps(conn, sessions(*CORPUS))
+    current = {table: fetch_table(DateConnection(conn), table) for table in TABLES}
+    changes = diff_tables(current, build_desired_state(sessions(*CORPUS), current))
+    assert all(not rows for actions in changes.values() for rows in actions.values())
@@ -0,0 +1,50 @@
+import pandas as pd
+from sources.normalize import (parse_age_bounds, parse_date_ranges, parse_grade_bounds, parse_prices, parse_times,
+                               parse_weekday_masks)
+
+def _text(*values):
+    return pd.Series(list(values), dtype=object)
+
+def test_date_ranges_in_every_source_format():
+    start, end = parse_date_ranges(_text("2025-05-26 00:00:00 - 2025-05-30 00:00:00", "06/02/25 - 06/06/25",
+                                         "Jun 2 to Jun 6, 2025", "JUN 2-6, 2025", "May 26 - May 30",
+                                         "Friday, April 18, 2025", "no dates"))
+    assert start.dt.strftime("%Y-%m-%d").tolist()[:6] == [
+        "2025-05-26", "2025-06-02", "2025-06-02", "2025-06-02", "2025-05-26", "2025-04-18"]
+    assert end.dt.strftime("%Y-%m-%d").tolist()[:6] == [
+        "2025-05-30", "2025-06-06", "2025-06-06", "2025-06-06", "2025-05-30", "2025-04-18"]
+    assert pd.isna(start[6]) and pd.isna(end[6])
+
+def test_date_range_across_new_year():
+    start, end = parse_date_ranges(_text("Dec 29 to Jan 2, 2026", "Dec 29, 2025 - Jan 2", "12/29 - 1/2"))
+    assert start.dt.strftime("%Y-%m-%d").tolist() == ["2025-12-29", "2025-12-29", "2025-12-29"]
+    assert end.dt.strftime("%Y-%m-%d").tolist() == ["2026-01-02", "2026-01-02", "2026-01-02"]
+
+def test_prices():
+    prices = parse_prices(_text("$57/day ($285.00/week)",
+                                "$185.00 per week for YMCA Members | $215.00 for Non-Members",
+                                "Regular: $379, Sale: $359", "$1,250.00"))
+    assert prices['price_per_day'].tolist()[0] == 57
+    assert prices['price_per_week'].tolist() == [285, 185, 379, 1250]
+    assert prices['price_member'].tolist()[1] == 185
+    assert prices['price_nonmember'].tolist()[1] == 215
+    assert prices['price_sale'].tolist()[2] == 359
+
+def test_age_and_grade_bounds():
+    lo, hi = parse_age_bounds(_text("Age 5 - 8 years", "5yr 0mo - 8yr 11mo", "3-14", "12+", ""))
+    assert lo.tolist()[:4] == [5, 5, 3, 12] and hi.tolist()[:3] == [8, 8, 14]
+    assert pd.isna(hi[3]) and pd.isna(lo[4])
+    lo, hi = parse_grade_bounds(_text("K - 5th", "Pre-K to 2nd", "6-8"))
+    assert lo.tolist() == [0, -1, 6] and hi.tolist() == [5, 2, 8]
+
+def test_weekday_masks():
+    masks = parse_weekday_masks(_text("Mo,Tu,We,Th,Fr", "M - F", "Monday through Thursday", "Fridays", ""))
+    assert masks.tolist() == [0b11111, 0b11111, 0b01111, 0b10000, 0]
+    # A blank day string falls back to the weekdays the dates span
+    start, end = parse_date_ranges(_text("Jun 2 to Jun 4, 2025"))
+    assert parse_weekday_masks(_text(""), start, end).tolist() == [0b00111]
+
+def test_times():
+    minutes = parse_times(_text("9:00 AM", "9:30am", "08:30:00", "1:00", "12:00 PM", "12:15 am", ""))
+    assert minutes.tolist()[:6] == [540, 570, 510, 780, 720, 15]
+    assert pd.isna(minutes[6])
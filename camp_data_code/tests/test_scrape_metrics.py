@@ -0,0 +1,37 @@
+from sources.scrape_metrics import ScrapeMetrics
+
+def test_prometheus_export():
+    metrics = ScrapeMetrics(buckets=(0.1, 1.0))
+    plano = metrics.bind(source="plano")
+    plano.observe("modal_open", 0.05)
+    plano.observe("modal_open", 0.5)
+    metrics.bind(source='frisco "north"').observe("modal_open", 3.0)
+    plano.increment("timeouts", wait="modal")
+    plano.increment("timeouts", wait="modal")
+
+    assert metrics.to_prometheus() == "\n".join([
+        '# TYPE camp_scrape_modal_open_seconds histogram',
+        'camp_scrape_modal_open_seconds_bucket{source="frisco \\"north\\"",le="0.1"} 0',
+        'camp_scrape_modal_open_seconds_bucket{source="frisco \\"north\\"",le="1.0"} 0',
+        'camp_scrape_modal_open_seconds_bucket{source="frisco \\"north\\"",le="+Inf"} 1',
+        'camp_scrape_modal_open_seconds_sum{source="frisco \\"north\\""} 3.000000',
+        'camp_scrape_modal_open_seconds_count{source="frisco \\"north\\""} 1',
+        'camp_scrape_modal_open_seconds_bucket{source="plano",le="0.1"} 1',
+        'camp_scrape_modal_open_seconds_bucket{source="plano",le="1.0"} 2',
+        'camp_scrape_modal_open_seconds_bucket{source="plano",le="+Inf"} 2',
+        'camp_scrape_modal_open_seconds_sum{source="plano"} 0.550000',
+        'camp_scrape_modal_open_seconds_count{source="plano"} 2',
+        '# TYPE camp_scrape_timeouts_total counter',
+        'camp_scrape_timeouts_total{source="plano",wait="modal"} 2',
+    ]) + "\n"
+
+def test_bound_views_read_their_own_labels(tmp_path):
+    metrics = ScrapeMetrics()
+    metrics.bind(source="plano").observe("run", 2.0)
+    metrics.bind(source="frisco").observe("run", 4.0)
+    assert metrics.histogram("run") == {'count': 2, 'sum': 6.0, 'max': 4.0}
+    assert metrics.bind(source="frisco").histogram("run") == {'count': 1, 'sum': 4.0, 'max': 4.0}
+
+    path = tmp_path / "metrics.prom"
+    metrics.write(str(path))
+    assert path.read_text(encoding='utf-8') == metrics.to_prometheus()
@@ -0,0 +1,32 @@
+from sources.scrape_state import CardStateStore
+
+def card(name, price="$57/day ($285.00/week)"):
+    return {'camp_name': name, 'camp_category': "Sports", 'week': "Jun 2 to Jun 6", 'price': price,
+            'location': "Lifetime Fitness Plano", 'availability': ""}
+
+def details(description):
+    return {'days': "Mon - Fri", 'start_time': "9:00 AM", 'end_time': "3:00 PM", 'description': description}
+
+def test_unchanged_cards_reuse_changed_cards_refresh_and_missing_cards_drop(tmp_path):
+    first = CardStateStore("lifetime_plano", str(tmp_path))
+    for name in ("Soccer Stars", "Swim School", "Art Lab"):
+        assert first.lookup(card(name)) is None
+        first.store(card(name), details(f"All about {name}."))
+    assert first.finish() == {'reused': 0, 'refreshed': 3, 'dropped': 0}
+
+    second = CardStateStore("lifetime_plano", str(tmp_path))
+    assert second.lookup(card("Soccer Stars")) == details("All about Soccer Stars.")
+    # A price change is a different card: its modal has to be opened again
+    assert second.lookup(card("Swim School", price="$60/day ($300.00/week)")) is None
+    second.store(card("Swim School", price="$60/day ($300.00/week)"), details("Swim School, new price."))
+    assert second.finish() == {'reused': 1, 'refreshed': 1, 'dropped': 2}
+
+    third = CardStateStore("lifetime_plano", str(tmp_path))
+    assert third.lookup(card("Art Lab")) is None
+    assert third.lookup(card("Swim School")) is None
+    assert third.lookup(card("Swim School", price="$60/day ($300.00/week)")) == details("Swim School, new price.")
+
+def test_unreadable_state_starts_empty(tmp_path):
+    (tmp_path / "lifetime_plano.json").write_text("{not json", encoding='utf-8')
+    store = CardStateStore("lifetime_plano", str(tmp_path))
+    assert store.lookup(card("Soccer Stars")) is None
@@ -0,0 +1,48 @@
+from bs4 import BeautifulSoup
+
+from sources.host_scheduler import HostScheduler
+from sources.source_registry import LIFETIME_MODAL, find_modal, lifetime_spec, scrape_source
+
+CARD = ('<div data-testid="campCard"><p class="h6">Sports</p><p class="h4">{name}</p>'
+        '<p class="small font-weight-bold">Ages 5-9</p>'
+        '<p class="small"><time class="time-start">Jun 2</time> - <time class="time-end">Jun 6</time></p>'
+        '<p id="campLocation-{index}">Frisco</p><span class="display-number-value">57</span>'
+        '<button data-testid="moreDetailsBtn" data-target="#campModal">More Details</button></div>')
+
+# Every card's button targets this one dialog, which is empty until a card is clicked
+SHARED_MODAL = '<div id="campModal" class="modal"><div class="modal-header"></div><div class="modal-body"></div></div>'
+
+SNAPSHOT_BLOCK = ('<div data-modal-index="{index}" hidden><div class="modal-body">'
+                  '<div class="time-and-location"><p class="small">Meets: Mon - Fri</p>'
+                  '<p class="small"><time class="time-start">9:00 AM</time> - <time class="time-end">3:00 PM</time></p>'
+                  '</div><div class="description"><p>{description}</p></div></div></div>')
+
+def lifetime_page(names, snapshot=True):
+    cards = "".join(CARD.format(name=name, index=index) for index, name in enumerate(names))
+    blocks = "".join(SNAPSHOT_BLOCK.format(index=index, description=f"All about {name}.")
+                     for index, name in enumerate(names)) if snapshot else ""
+    return f"<html><body>{cards}{SHARED_MODAL}{blocks}</body></html>"
+
+class StaticFetcher:
+    def __init__(self, html):
+        self.html = html
+        self.scheduler = HostScheduler(max_concurrency=2, per_host=2, min_interval=0)
+
+    def uses_browser(self, spec):
+        return False
+
+    def get(self, url):
+        return self.html
+
+def test_snapshot_block_wins_over_a_shared_modal_id():
+    spec = lifetime_spec("Frisco", "https://my.lifetime.life/clubs/tx/frisco/camps.html")
+    rows = scrape_source(spec, StaticFetcher(lifetime_page(["Soccer Stars", "Swim School"])))
+    assert [row['Camp Name'] for row in rows] == ["Soccer Stars (Sports)", "Swim School (Sports)"]
+    assert [row['Description'] for row in rows] == ["All about Soccer Stars.", "All about Swim School."]
+    assert all(row['Days'] == "Mon - Fri" for row in rows)
+
+def test_trigger_target_is_the_fallback_without_snapshot_blocks():
+    soup = BeautifulSoup(lifetime_page(["Soccer Stars"], snapshot=False), "html.parser")
+    card = soup.select_one("[data-testid='campCard']")
+    modal = find_modal(soup, card, 0, LIFETIME_MODAL)
+    assert modal is not None and modal.find_parent(id="campModal") is not None
@@ -0,0 +1,39 @@
+from sources.camp_sink import REQUIRED_COLUMNS
+from sources.web_scrape import build_camp_record, default_modal_details, parse_card_snapshot, parse_modal_snapshot
+
+# One card and its open modal, as CARD_SNAPSHOT_JS / MODAL_SNAPSHOT_JS return them
+CARD = {
+    'index': 0, 'category': "Sports", 'name': "Soccer Stars", 'age_range': "Ages 5-9",
+    'date_start': "Jun 2", 'date_end': "Jun 6", 'date_label': None, 'date_text': None,
+    'location': "Frisco", 'field_trip': "Friday Field Trip: Zoo", 'price_per_day': "57", 'availability': None,
+}
+MODAL = {
+    'meets': "Meets: Mon - Fri", 'meets_fallback': None,
+    'start_time': "9:00 AM", 'end_time': "3:00 PM", 'description': "Drills and scrimmages.",
+}
+
+def test_card_and_modal_snapshots_build_one_row():
+    card_fields = parse_card_snapshot(CARD, "Plano")
+    details = parse_modal_snapshot(MODAL, card_fields['camp_name'], card_fields['camp_category'])
+    row = build_camp_record("Lifetime Plano", card_fields, details)
+
+    assert list(row) == REQUIRED_COLUMNS
+    assert row['Camp Name'] == "Soccer Stars (Sports)"
+    assert row['Week'] == "Jun 2 to Jun 6"
+    assert row['Location'] == "Lifetime Fitness Plano"
+    assert row['Price'] == "$57/day ($285.00/week)"
+    assert (row['Days'], row['Start Time'], row['End Time']) == ("Mon - Fri", "9:00 AM", "3:00 PM")
+    assert row['Description'].startswith("Drills and scrimmages.")
+    assert row['Description'].endswith("Friday Field Trip: Zoo")
+
+def test_missing_modal_fields_fall_back():
+    card_fields = parse_card_snapshot(dict(CARD, field_trip=None, date_start=None, date_label="June 2 - 6"), "Plano")
+    details = parse_modal_snapshot({'meets': None, 'meets_fallback': None, 'start_time': None,
+                                    'end_time': None, 'description': None}, "Soccer Stars", "Sports")
+    row = build_camp_record("Lifetime Plano", card_fields, details)
+    assert row['Week'] == "June 2 - 6"
+    assert (row['Days'], row['Start Time'], row['End Time']) == ("Monday-Friday", "", "")
+    assert row['Description'] == "Camp: Soccer Stars (Sports)."
+
+    row = build_camp_record("Lifetime Plano", card_fields, default_modal_details("Soccer Stars", "Sports"))
+    assert row['Days'] == "Not specified"